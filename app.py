@@ -1,30 +1,48 @@
+import time
+_startup_started_at = time.perf_counter()
+
 import os
 import asyncio
 import json
-from flask import Flask, request, jsonify
+import threading
+from flask import Flask, Response, request, jsonify
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 
 # Import all services
 from models.llm_agent import LocalGuideAgent
 from models.language_detector import QuickLanguageDetector
 from models.mood_analyzer import MoodAnalyzer
+from models.conversation_memory import ConversationMemory
+from models.knowledge_index import KnowledgeIndex
+from models.intent_router import Intent, IntentRouter, is_story_request
 from utils.location_extractor import LocationExtractor
 from services.whatsapp_service import WhatsAppService, TwilioTester
-from services.speech_service import SpeechService
-from services.tts_service import TTSService
 from services.cache_service import CacheService
+from services.content_store import ContentStore
+from services.message_queue import MessageQueue, QueueFullError
+from services.warmup import WarmupManager
+from utils.language_registry import get_language_registry
+from utils.metrics import metrics
+from utils.tracing import run_blocking, trace, span
+from utils.logger import get_logger
 from config import Config
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
+logger = get_logger(__name__)
+
+FIRST_SEGMENT_LATENCY = metrics.histogram(
+    "first_segment_seconds", "Time from starting the LLM call to delivering the first streamed segment"
+)
+
 
 class VoiceFirstConversationBot:
     def __init__(self):
-        # Load language data first
-        self.language_data = self._load_language_data()
-        self.supported_languages = list(self.language_data.get('supported_languages', {}).keys())
+        # Shared language registry (languages.json is parsed once per process)
+        self.registry = get_language_registry()
+        self.supported_languages = list(self.registry.codes)
 
         # Initialize all services
         self.llm_agent = LocalGuideAgent()
@@ -32,24 +50,65 @@ class VoiceFirstConversationBot:
         self.mood_analyzer = MoodAnalyzer()
         self.location_extractor = LocationExtractor()
         self.whatsapp_service = WhatsAppService()
-        self.speech_service = SpeechService()
-        self.tts_service = TTSService()
         self.cache_service = CacheService()
+        self.memory = ConversationMemory(self.cache_service, self.llm_agent)
+        # Stories written ahead of time by jobs.pregenerate_stories
+        self.content_store = ContentStore() if Config.CONTENT_STORE_ENABLED else None
+        # Short factual questions answered from data/ without an LLM call
+        self.knowledge = KnowledgeIndex() if Config.KNOWLEDGE_FAST_PATH_ENABLED else None
+
+        # Voice stacks (whisper/torch, gTTS) are built on first use - see speech_service/tts_service
+        self._speech_service = None
+        self._tts_service = None
+        self._voice_lock = threading.Lock()
 
         # Load response templates
         self.response_templates = self._load_response_templates()
-
-        print(f"✅ VoiceFirstConversationBot initialized with {len(self.supported_languages)} languages")
-        print(f"🎯 Supported languages: {', '.join(self.supported_languages)}")
-
-    def _load_language_data(self) -> Dict:
-        """Load language data from languages.json."""
-        try:
-            with open('data/languages.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"❌ Failed to load languages.json: {e}")
-            return {'supported_languages': {'en': {'name': 'English'}}}
+        # Greetings, thanks and the like are answered before the NLP pipeline runs
+        self.intent_router = IntentRouter(self.response_templates) if Config.INTENT_ROUTER_ENABLED else None
+
+        logger.info("✅ VoiceFirstConversationBot initialized with %d languages", len(self.supported_languages))
+        logger.info("🎯 Supported languages: %s", ', '.join(self.supported_languages))
+
+    @property
+    def speech_service(self):
+        """Speech-to-text service, constructed on the first voice message."""
+        if self._speech_service is None:
+            with self._voice_lock:
+                if self._speech_service is None:
+                    from services.speech_service import SpeechService
+                    self._speech_service = SpeechService()
+        return self._speech_service
+
+    @property
+    def tts_service(self):
+        """Text-to-speech service, constructed on the first voice reply."""
+        if self._tts_service is None:
+            with self._voice_lock:
+                if self._tts_service is None:
+                    from services.tts_service import TTSService
+                    self._tts_service = TTSService()
+        return self._tts_service
+
+    def warm_up_voice(self):
+        """Load and exercise Whisper and import gTTS ahead of the first voice note."""
+        self.speech_service.warm_up()
+        self.tts_service.load_engine()
+
+    def warm_up_text(self):
+        """Run sample phrases through the per-message NLP path.
+
+        Fills the regex cache for the detector and gazetteer patterns, loads
+        langdetect's profiles and imports TextBlob before real traffic does.
+        """
+        phrases = ["Hello, what should I see in Delhi?", "Mujhe Jaipur ke baare mein batao"]
+        for record in self.registry:
+            phrases.extend(record.sample_phrases.values())
+
+        for phrase in phrases:
+            language, _ = self.language_detector.detect_language(phrase)
+            self.mood_analyzer.analyze_mood(phrase, language)
+            self.location_extractor.extract_location(phrase)
 
     def _load_response_templates(self) -> Dict:
         """Load response templates from data/responses/ folder."""
@@ -61,83 +120,222 @@ class VoiceFirstConversationBot:
                 if os.path.exists(template_file):
                     with open(template_file, 'r', encoding='utf-8') as f:
                         templates[lang_code] = json.load(f)
-                        print(f"✅ Loaded {lang_code} response templates")
+                        logger.debug("✅ Loaded %s response templates", lang_code)
             except Exception as e:
-                print(f"⚠️ Failed to load {lang_code} templates: {e}")
+                logger.warning("⚠️ Failed to load %s templates: %s", lang_code, e)
 
         return templates
 
-    async def process_message(self, user_id: str, message_body: str, media_url: Optional[str] = None) -> Dict[str, Any]:
-        """Process user message - ALWAYS generative, voice-first when appropriate."""
-
-        print(f"🎯 Processing message for {user_id}: '{message_body[:50]}...'")
-
-        # Handle voice input first
-        if media_url:
-            print("🎤 Voice message detected - processing with STT")
-            text_from_voice = await self._process_voice_message(media_url, {"user_id": user_id})
-            if text_from_voice:
-                message_body = text_from_voice
-                print(f"🎤 STT Result: {message_body}")
-
-        # Build comprehensive user context
-        user_context = await self._build_user_context(user_id, message_body)
-        print(f"🔍 User context: {user_context}")
-
-        # Get conversation history
-        conversation_history = self.cache_service.get_conversation(user_id)
-
-        # **ALWAYS CALL LLM - NO FALLBACKS**
-        llm_response = await self.llm_agent.get_response(
-            user_message=message_body,
-            conversation_history=conversation_history,
-            user_context=user_context
-        )
+    async def process_message(self, user_id: str, message_body: str, media_url: Optional[str] = None,
+                              on_segment: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """Process user message - ALWAYS generative, voice-first when appropriate.
+
+        With ``on_segment`` the reply is streamed: each sentence segment (and its
+        audio in voice mode) is handed over as soon as it's ready.
+        """
+
+        with trace("process_message") as request_trace:
+            logger.info("🎯 Processing message (%d chars, voice=%s)", len(message_body), bool(media_url))
+            logger.debug("🎯 Message from %s: '%.50s'", user_id, message_body)
+
+            # Handle voice input first
+            if media_url:
+                logger.debug("🎤 Voice message detected - processing with STT")
+                text_from_voice = await self._process_voice_message(media_url, {"user_id": user_id})
+                if text_from_voice:
+                    message_body = text_from_voice
+                    logger.debug("🎤 STT Result: %s", message_body)
+
+            if self.intent_router is not None:
+                with span("route_intent"):
+                    intent = self.intent_router.classify(message_body)
+                if intent is not None:
+                    response_data = await self._reply_to_trivial(user_id, message_body, intent, on_segment)
+                    if response_data is not None:
+                        response_data["timings"] = request_trace.timings()
+                        return response_data
+
+            # Build comprehensive user context
+            user_context = await self._build_user_context(user_id, message_body)
+            logger.debug(
+                "🔍 User context: lang=%s location=%s mood=%s turn=%s",
+                user_context['detected_language'], user_context['current_location'],
+                user_context['mood'], user_context['conversation_turns']
+            )
+
+            # Get conversation history
+            with span("load_history"):
+                conversation_history = await run_blocking(self._load_history, user_id)
+
+            # Determine if this should be voice-only response
+            wants_voice = self._should_respond_with_voice(message_body, user_context)
+
+            # Popular place/language pairs have stories (and narration) ready,
+            # and plain facts ("best time to visit Munnar") are in data/
+            prepared = None
+            prepared_from = None
+            if is_story_request(message_body):
+                if self.content_store is not None:
+                    with span("content_store"):
+                        prepared = self.content_store.find(
+                            message_body, user_context['detected_language'], user_context.get('current_location')
+                        )
+                    if prepared is not None:
+                        prepared_from = "content_store"
+            elif self.knowledge is not None:
+                with span("knowledge"):
+                    fact = self.knowledge.answer(message_body, user_context['detected_language'])
+                if fact:
+                    prepared = {"text": fact, "audio": None}
+                    prepared_from = "knowledge"
+
+            if prepared is not None:
+                llm_response = prepared["text"]
+                if on_segment is not None:
+                    audio_path = None
+                    if wants_voice:
+                        audio_path = prepared["audio"] or await self._generate_voice_response(llm_response, user_context)
+                    await on_segment(llm_response, audio_path)
+                    segment_count = 1
+            else:
+                # **ALWAYS CALL LLM - NO FALLBACKS**
+                with span("llm"):
+                    if on_segment is not None:
+                        llm_response, segment_count = await self._stream_reply(
+                            message_body, conversation_history, user_context, wants_voice, on_segment
+                        )
+                    else:
+                        llm_response = await self.llm_agent.get_response(
+                            user_message=message_body,
+                            conversation_history=conversation_history,
+                            user_context=user_context
+                        )
+
+            response_data = {
+                "input": message_body,
+                "response": llm_response,
+                "timestamp": datetime.now().isoformat(),
+                "user_context": user_context,
+                "voice_response": wants_voice,
+                "language_info": self._get_language_response_info(user_context.get('detected_language', 'en'))
+            }
+
+            if prepared is not None:
+                response_data["answered_from"] = prepared_from
+
+            if on_segment is not None:
+                response_data["streamed_segments"] = segment_count
+
+            # Generate voice response if requested (streamed replies were voiced per segment)
+            elif wants_voice:
+                audio_path = prepared["audio"] if prepared is not None else None
+                if not audio_path:
+                    logger.debug("🔊 Generating voice response")
+                    with span("tts"):
+                        audio_path = await self._generate_voice_response(llm_response, user_context)
+                if audio_path:
+                    response_data["audio_url"] = audio_path
+
+            # Update conversation history and cache
+            with span("save_history"):
+                await run_blocking(self._save_turn, user_id, message_body, llm_response, user_context)
+            self.memory.schedule_compaction(user_id)
+
+            response_data["timings"] = request_trace.timings()
+            return response_data
+
+    async def _reply_to_trivial(self, user_id: str, message_body: str, intent: Intent,
+                                on_segment: Optional[Callable[[str, Optional[str]], Awaitable[None]]]) -> Optional[Dict[str, Any]]:
+        """Canned reply to a greeting, thanks, "ok" or emoji; None if it should take the full pipeline."""
+        with span("load_context"):
+            cached_context, history = await run_blocking(
+                lambda: (self.cache_service.get_user_context(user_id), self.cache_service.get_conversation(user_id))
+            )
+
+        # "ok" or 👍 after the bot asked something is an answer - the LLM follows up
+        if intent.name in ('acknowledgement', 'emoji') and history and history[-1].get('role') == 'assistant' \
+                and '?' in (history[-1].get('content') or '')[-80:]:
+            return None
 
-        # Determine if this should be voice-only response
-        wants_voice = self._should_respond_with_voice(message_body, user_context)
+        language = intent.language or cached_context.get('detected_language', 'en')
+        reply = self.intent_router.reply(intent, language, returning=bool(history))
+        logger.debug("⚡ Trivial %s message, skipping the pipeline", intent.name)
 
         response_data = {
             "input": message_body,
-            "response": llm_response,
+            "response": reply,
             "timestamp": datetime.now().isoformat(),
-            "user_context": user_context,
-            "voice_response": wants_voice,
-            "language_info": self._get_language_response_info(user_context.get('detected_language', 'en'))
+            "user_context": dict(cached_context, detected_language=language),
+            "voice_response": False,
+            "language_info": self._get_language_response_info(language),
+            "intent": intent.name
         }
+        if on_segment is not None:
+            await on_segment(reply, None)
+            response_data["streamed_segments"] = 1
+
+        with span("save_history"):
+            await run_blocking(self._save_turn, user_id, message_body, reply)
+        return response_data
 
-        # Generate voice response if requested
-        if wants_voice:
-            print("🔊 Generating voice response")
-            audio_path = await self._generate_voice_response(llm_response, user_context)
-            if audio_path:
-                response_data["audio_url"] = audio_path
+    def _load_history(self, user_id: str) -> List[Dict[str, Any]]:
+        """Prompt history for ``user_id`` - blocking (Redis), run it off the event loop."""
+        return self.memory.prompt_history(user_id, self.cache_service.get_conversation(user_id))
 
-        # Update conversation history and cache
+    def _save_turn(self, user_id: str, message_body: str, reply: str, user_context: Optional[Dict] = None):
+        """Append the exchange to the history (and store the context) - blocking (Redis)."""
         self.cache_service.update_conversation(user_id, "user", message_body)
-        self.cache_service.update_conversation(user_id, "assistant", llm_response)
-        self.cache_service.cache_user_context(user_id, user_context)
+        self.cache_service.update_conversation(user_id, "assistant", reply)
+        if user_context is not None:
+            self.cache_service.cache_user_context(user_id, user_context)
+
+    async def _stream_reply(self, message_body: str, conversation_history: List[Dict], user_context: Dict,
+                            wants_voice: bool, on_segment: Callable[[str, Optional[str]], Awaitable[None]]) -> Tuple[str, int]:
+        """Stream the LLM reply into ``on_segment``; returns the full text and segment count.
+
+        Delivery runs as its own task so TTS and Twilio round-trips never stall
+        the token stream, while segments still go out strictly in order.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        started_at = time.perf_counter()
+
+        async def deliver():
+            first = True
+            while True:
+                segment = await pending.get()
+                if segment is None:
+                    return
+                audio_path = None
+                if wants_voice:
+                    with span("tts"):
+                        audio_path = await self._generate_voice_response(segment, user_context)
+                await on_segment(segment, audio_path)
+                if first:
+                    FIRST_SEGMENT_LATENCY.observe(time.perf_counter() - started_at)
+                    first = False
+
+        delivery = asyncio.create_task(deliver())
+        segments = []
+        try:
+            async for segment in self.llm_agent.stream_response(message_body, conversation_history, user_context):
+                segments.append(segment)
+                pending.put_nowait(segment)
+        finally:
+            pending.put_nowait(None)
+            await delivery
 
-        return response_data
+        return " ".join(segments), len(segments)
 
     async def _build_user_context(self, user_id: str, message: str) -> Dict[str, Any]:
         """Build comprehensive user context for LLM."""
 
-        cached_context = self.cache_service.get_user_context(user_id)
-        detected_language, confidence = self.language_detector.detect_language(message)
-        print(f"🌐 Language detection: {detected_language} (confidence: {confidence:.2f})")
-
-        lang_support = self.validate_language_support(detected_language)
-        if not lang_support['supported']:
-            print(f"⚠️ Language {detected_language} not fully supported, falling back to English")
-            detected_language = 'en'
-
-        mood_analysis = self.mood_analyzer.analyze_mood(message, detected_language)
-        print(f"😊 Mood analysis: {mood_analysis}")
+        with span("load_context"):
+            cached_context = await run_blocking(self.cache_service.get_user_context, user_id)
 
-        location = self.location_extractor.extract_location(message)
-        if location:
-            print(f"📍 Location extracted: {location}")
+        # Detection, mood and location are CPU-bound - one trip to the executor for all three
+        detected_language, confidence, lang_support, mood_analysis, location = await run_blocking(
+            self._analyze_message, message
+        )
 
         wants_voice = self._should_respond_with_voice(message, cached_context)
 
@@ -156,15 +354,38 @@ class VoiceFirstConversationBot:
             "cultural_context": self._get_cultural_context(detected_language, location)
         }
 
+    def _analyze_message(self, message: str) -> Tuple[str, float, Dict, Dict, Optional[str]]:
+        """Language (with its support record), mood and location of ``message``."""
+        with span("detect_language"):
+            detected_language, confidence = self.language_detector.detect_language(message)
+        logger.debug("🌐 Language detection: %s (confidence: %.2f)", detected_language, confidence)
+
+        lang_support = self.validate_language_support(detected_language)
+        if not lang_support['supported']:
+            logger.warning("⚠️ Language %s not fully supported, falling back to English", detected_language)
+            detected_language = 'en'
+
+        with span("analyze_mood"):
+            mood_analysis = self.mood_analyzer.analyze_mood(message, detected_language)
+        logger.debug("😊 Mood analysis: %s", mood_analysis)
+
+        with span("extract_location"):
+            location = self.location_extractor.extract_location(message)
+        if location:
+            logger.debug("📍 Location extracted: %s", location)
+
+        return detected_language, confidence, lang_support, mood_analysis, location
+
     def _get_cultural_context(self, language: str, location: Optional[str]) -> Dict:
-        lang_info = self.language_data.get('supported_languages', {}).get(language, {})
+        # Language was validated in _analyze_message; English covers anything else
+        record = self.registry.get(language) or self.registry.get('en')
 
         context = {
-            'language_name': lang_info.get('name', 'English'),
-            'native_name': lang_info.get('native_name', 'English'),
-            'script': lang_info.get('script', 'Latin'),
-            'region': lang_info.get('region', 'International'),
-            'cultural_usage': lang_info.get('cultural_context', {})
+            'language_name': record.name,
+            'native_name': record.native_name,
+            'script': record.script,
+            'region': record.region,
+            'cultural_usage': dict(record.cultural_usage)
         }
 
         if location:
@@ -184,29 +405,35 @@ class VoiceFirstConversationBot:
         return location_contexts.get(location, {'heritage': 'Diverse', 'specialties': ['culture', 'history']})
 
     def validate_language_support(self, lang_code: str) -> Dict:
-        lang_info = self.language_data.get('supported_languages', {}).get(lang_code, {})
+        record = self.registry.get(lang_code)
+        if record is None:
+            return {'supported': False, 'voice_available': False, 'name': 'Unknown',
+                    'native_name': 'Unknown', 'script': 'Unknown'}
 
         return {
-            'supported': bool(lang_info),
-            'voice_available': lang_info.get('tts_supported', False) and lang_info.get('stt_supported', False),
-            'name': lang_info.get('name', 'Unknown'),
-            'native_name': lang_info.get('native_name', 'Unknown'),
-            'script': lang_info.get('script', 'Unknown')
+            'supported': True,
+            'voice_available': record.voice_available,
+            'name': record.name,
+            'native_name': record.native_name,
+            'script': record.script
         }
 
     def _get_language_response_info(self, lang_code: str) -> Dict:
-        lang_info = self.language_data.get('supported_languages', {}).get(lang_code, {})
+        record = self.registry.get(lang_code) or self.registry.get('en')
 
         return {
             'code': lang_code,
-            'name': lang_info.get('name', 'English'),
-            'native_name': lang_info.get('native_name', 'English'),
-            'script': lang_info.get('script', 'Latin'),
-            'voice_supported': lang_info.get('tts_supported', False),
-            'greeting': self.language_detector.get_greeting(lang_code, 'casual')
+            'name': record.name,
+            'native_name': record.native_name,
+            'script': record.script,
+            'voice_supported': record.tts_supported,
+            'greeting': self.registry.greeting(lang_code, 'casual')
         }
 
     def _should_respond_with_voice(self, message: str, context: Dict) -> bool:
+        if not Config.VOICE_RESPONSES_ENABLED:
+            return False
+
         voice_triggers = [
             "tell me a story", "story about", "कहानी सुनाओ", "গল্প বলুন",
             "கதை சொல்லுங்கள்", "కథ చెప్పండి", "കഥ പറയൂ", "voice", "audio",
@@ -217,111 +444,246 @@ class VoiceFirstConversationBot:
         return any(trigger in message_lower for trigger in voice_triggers)
 
     async def _process_voice_message(self, media_url: str, context: dict) -> Optional[str]:
+        if not Config.VOICE_RESPONSES_ENABLED:
+            logger.info("🔇 Voice disabled, ignoring voice message")
+            return None
+
         try:
-            audio_data = await self.whatsapp_service.download_media(media_url)
+            with span("media_download"):
+                audio_data = await self.whatsapp_service.download_media(media_url)
             if not audio_data:
                 return None
 
             detected_lang = context.get("detected_language", "en")
-            transcribed_text = await self.speech_service.transcribe_audio(audio_data, detected_lang)
+            with span("stt"):
+                transcribed_text = await self.speech_service.transcribe_audio(audio_data, detected_lang)
 
             return transcribed_text
         except Exception as e:
-            print(f"❌ Voice processing error: {e}")
+            logger.error("❌ Voice processing error: %s", e)
             return None
 
     async def _generate_voice_response(self, text_response: str, user_context: Dict) -> Optional[str]:
         try:
             language = user_context.get("detected_language", "en")
             if not self.tts_service._is_tts_supported(language):
-                print(f"⚠️ TTS not supported for {language}, using English")
+                logger.warning("⚠️ TTS not supported for %s, using English", language)
                 language = "en"
 
             audio_path = await self.tts_service.text_to_speech(text_response, language)
             return audio_path
         except Exception as e:
-            print(f"❌ TTS generation error: {e}")
+            logger.error("❌ TTS generation error: %s", e)
             return None
 
 
 bot = VoiceFirstConversationBot()
+message_queue = MessageQueue(
+    num_workers=Config.WORKER_POOL_SIZE,
+    max_size=Config.WORKER_QUEUE_MAX_SIZE
+)
+metrics.gauge("queue_depth", "Messages waiting for a worker", message_queue.depth)
+metrics.gauge("queue_in_flight", "Messages currently being processed", lambda: message_queue.in_flight)
+metrics.gauge("response_cache_entries", "Questions held in the response cache", lambda: len(bot.llm_agent.response_cache))
+
+# Warm-up runs in the background; /health/ready reports 503 until it finishes,
+# and for good if a voice node couldn't load Whisper
+warmup = WarmupManager()
+warm_voice = Config.VOICE_RESPONSES_ENABLED and Config.PRELOAD_VOICE
+if Config.WARMUP_ENABLED:
+    warmup.add_step("nlp", bot.warm_up_text)
+    # Pooled connections belong to the loop that opened them - prime them on the workers' loop
+    warmup.add_step("llm_connections", lambda: message_queue.submit(bot.llm_agent.warm_up).result(timeout=30))
+    if warm_voice:
+        warmup.add_step("voice", bot.warm_up_voice, required=True)
+metrics.gauge("ready", "1 once warm-up has finished", lambda: int(warmup.ready))
+
+STARTUP_SECONDS = time.perf_counter() - _startup_started_at
+metrics.gauge("startup_seconds", "Time to import and initialize the app", lambda: STARTUP_SECONDS)
+logger.info("🚀 Startup completed in %.0fms (voice %s)", STARTUP_SECONDS * 1000,
+            "warming up" if warm_voice and Config.WARMUP_ENABLED else
+            ("on demand" if Config.VOICE_RESPONSES_ENABLED else "disabled"))
+
+
+def start_background_tasks(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """Start the worker pool (on ``loop`` if given, else its own thread) and the warm-up."""
+    message_queue.start(loop)
+    warmup.start()
+
+
+# Under asgi.py both start from the ASGI lifespan, on the server's loop
+if Config.SERVING_MODE != 'asgi':
+    start_background_tasks()
+
+
+async def handle_incoming_message(from_number: str, message_body: str, media_url: Optional[str] = None,
+                                  message_sid: Optional[str] = None):
+    """Background job: generate the reply for an inbound WhatsApp message and deliver it."""
+    with trace("webhook", request_id=message_sid) as request_trace:
+        if not message_body and not media_url:
+            cached_context = await run_blocking(bot.cache_service.get_user_context, from_number)
+            preferred_lang = cached_context.get('detected_language', 'en')
+            greeting = bot.language_detector.get_greeting(preferred_lang, 'casual')
+            with span("twilio_send"):
+                await bot.whatsapp_service.send_message(f"whatsapp:{from_number}", greeting)
+            return None
 
+        async def send_segment(segment: str, audio_path: Optional[str]):
+            with span("twilio_send"):
+                if audio_path:
+                    await bot.whatsapp_service.send_audio_message(f"whatsapp:{from_number}", audio_path)
+                else:
+                    await bot.whatsapp_service.send_message(f"whatsapp:{from_number}", segment)
 
-@app.route('/webhook', methods=['POST'])
-async def whatsapp_webhook():
+        response_data = await bot.process_message(
+            from_number, message_body or "", media_url,
+            on_segment=send_segment if Config.LLM_STREAMING else None
+        )
+
+        if not Config.LLM_STREAMING:
+            with span("twilio_send"):
+                if response_data.get("voice_response") and response_data.get("audio_url"):
+                    await bot.whatsapp_service.send_audio_message(f"whatsapp:{from_number}", response_data["audio_url"])
+                else:
+                    await bot.whatsapp_service.send_message(f"whatsapp:{from_number}", response_data["response"])
+
+        response_data["timings"] = request_trace.timings()
+        _report_slow_request(request_trace)
+
+        # Webhook duplicates are only acknowledged, so the claim is all that's stored for message_sid
+        return response_data
+
+
+async def handle_test_message(user_id: str, message: str):
+    """Background job for the /test endpoint."""
+    with trace("test") as request_trace:
+        response_data = await bot.process_message(user_id, message)
+        _report_slow_request(request_trace)
+        return response_data
+
+
+def _report_slow_request(request_trace):
+    """Log the stage breakdown of requests slower than SLOW_REQUEST_THRESHOLD_MS."""
+    timings = request_trace.timings()
+    if timings["total_ms"] >= Config.SLOW_REQUEST_THRESHOLD_MS:
+        breakdown = ", ".join(f"{stage}={ms}ms" for stage, ms in timings["stages"].items())
+        logger.warning("🐢 Slow request %s: %sms (%s)", timings['request_id'], timings['total_ms'], breakdown)
+
+
+# Route logic shared by the Flask app below and the ASGI app in asgi.py.
+# Each returns (body, status) so either framework can wrap it.
+
+def accept_webhook(form) -> Tuple[str, int]:
+    """Validate, deduplicate and enqueue an inbound Twilio webhook."""
     try:
-        from_number = request.form.get('From', '').replace('whatsapp:', '')
-        message_body = request.form.get('Body', '')
-        media_url = request.form.get('MediaUrl0')  # Voice message URL
+        from_number = form.get('From', '').replace('whatsapp:', '')
+        message_body = form.get('Body', '')
+        media_url = form.get('MediaUrl0')  # Voice message URL
+        message_sid = form.get('MessageSid')
 
         if not from_number:
             return "OK", 200
 
-        if not message_body and not media_url:
-            cached_context = bot.cache_service.get_user_context(from_number)
-            preferred_lang = cached_context.get('detected_language', 'en')
-            greeting = bot.language_detector.get_greeting(preferred_lang, 'casual')
-            await bot.whatsapp_service.send_message(f"whatsapp:{from_number}", greeting)
+        # Twilio redelivers slow webhooks - only the first delivery gets processed
+        if not bot.cache_service.claim_message(message_sid):
+            logger.info("🔁 Duplicate webhook for %s, skipping", message_sid)
             return "OK", 200
 
-        response_data = await bot.process_message(from_number, message_body or "", media_url)
-
-        if response_data.get("voice_response") and response_data.get("audio_url"):
-            await bot.whatsapp_service.send_audio_message(f"whatsapp:{from_number}", response_data["audio_url"])
-        else:
-            await bot.whatsapp_service.send_message(f"whatsapp:{from_number}", response_data["response"])
+        # Acknowledge immediately - the reply is generated and sent by the worker pool
+        # Per-user ordering keeps conversation history and context updates consistent
+        try:
+            message_queue.submit(
+                handle_incoming_message, from_number, message_body, media_url, message_sid,
+                key=from_number
+            )
+        except QueueFullError:
+            # Let Twilio's retry through once we have capacity again
+            bot.cache_service.release_message(message_sid)
+            raise
 
         return "OK", 200
 
+    except QueueFullError as e:
+        logger.warning("⚠️ Webhook rejected: %s", e)
+        return "Busy", 503
     except Exception as e:
-        print(f"❌ Webhook error: {e}")
+        logger.exception("❌ Webhook error: %s", e)
         return "Error", 500
 
 
-@app.route('/test', methods=['POST'])
-async def test_endpoint():
+async def run_test_message(data: Optional[Dict]) -> Tuple[Dict[str, Any], int]:
+    """Process a /test request through the worker pool and wait for the reply."""
     try:
-        data = request.get_json()
+        data = data or {}
         user_id = data.get('user_id')
         message = data.get('message')
+        message_id = data.get('message_id')
 
         if not user_id or not message:
-            return jsonify({"error": "Missing user_id or message"}), 400
+            return {"error": "Missing user_id or message"}, 400
 
-        response_data = await bot.process_message(user_id, message)
-        return jsonify(response_data)
+        if message_id and not await run_blocking(bot.cache_service.claim_message, message_id):
+            stored_response = await run_blocking(bot.cache_service.get_message_response, message_id)
+            if stored_response:
+                return {**stored_response, "duplicate": True}, 200
+            return {"duplicate": True, "status": "processing"}, 202
+
+        try:
+            future = message_queue.submit(handle_test_message, user_id, message, key=user_id)
+            response_data = await asyncio.wrap_future(future)
+        except Exception:
+            if message_id:
+                await run_blocking(bot.cache_service.release_message, message_id)
+            raise
 
+        if message_id:
+            await run_blocking(bot.cache_service.cache_message_response, message_id, response_data)
+
+        return response_data, 200
+
+    except QueueFullError as e:
+        return {"error": str(e)}, 503
     except Exception as e:
-        print(f"❌ Test endpoint error: {e}")
-        return jsonify({"error": str(e)}), 500
+        logger.exception("❌ Test endpoint error: %s", e)
+        return {"error": str(e)}, 500
 
 
-@app.route('/languages', methods=['GET'])
-def get_supported_languages():
-    return jsonify({
+def languages_info() -> Dict[str, Any]:
+    return {
         "supported_languages": bot.supported_languages,
-        "language_details": bot.language_data.get('supported_languages', {}),
+        "language_details": {code: dict(info) for code, info in bot.registry.languages.items()},
         "total_count": len(bot.supported_languages),
-        "voice_enabled": [lang for lang in bot.supported_languages if bot.validate_language_support(lang)['voice_available']]
-    })
+        "voice_enabled": list(bot.registry.voice_codes)
+    }
 
 
-@app.route('/health')
-def health_check():
-    return jsonify({
+def health_info() -> Dict[str, Any]:
+    return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "llm_provider": bot.llm_agent.working_provider,
-        "voice_enabled": True,
+        "llm_providers": bot.llm_agent.provider_status(),
+        "voice_enabled": Config.VOICE_RESPONSES_ENABLED,
+        "startup_ms": round(STARTUP_SECONDS * 1000, 1),
         "total_languages": len(bot.supported_languages),
         "supported_languages": bot.supported_languages,
         "services": {
-            "llm_agent": bool(bot.llm_agent.working_provider),
+            "llm_agent": any(breaker.available for breaker in bot.llm_agent.breakers.values()),
             "language_detector": True,
             "tts_service": len(bot.tts_service.get_supported_languages()),
             "redis": bool(bot.cache_service.redis_client),
-            "whisper": True
+            "whisper": bool(bot._speech_service and bot._speech_service.whisper_model)
         },
+        "message_queue": message_queue.stats(),
+        "llm_hedging": Config.LLM_HEDGING_ENABLED,
+        "llm_rate_limits": bot.llm_agent.rate_limiter.stats(),
+        "model_routing": bot.llm_agent.model_router.stats(),
+        "prompts": bot.llm_agent.prompts.stats(),
+        "response_cache": bot.llm_agent.response_cache.stats(),
+        "conversation_memory": bot.memory.stats(),
+        "llm_usage": bot.llm_agent.usage.stats(),
+        "content_store": bot.content_store.stats() if bot.content_store else None,
+        "knowledge_index": bot.knowledge.stats() if bot.knowledge else None,
+        "warmup": warmup.stats(),
         "features": {
             "voice_first_storytelling": True,
             "dynamic_llm_responses": True,
@@ -332,33 +694,98 @@ def health_check():
             "cultural_context_awareness": True,
             "proxy_bypass": True
         }
-    })
+    }
 
 
-@app.route('/test-twilio-setup', methods=['GET'])
-async def test_twilio_setup():
+def liveness_info() -> Dict[str, Any]:
+    """The process is up and serving; says nothing about warm-up."""
+    return {"status": "alive", "uptime_s": round(time.perf_counter() - _startup_started_at, 1)}
+
+
+def readiness_info() -> Tuple[Dict[str, Any], int]:
+    """200 once warm-up has finished and, on voice nodes, Whisper has loaded; else 503."""
+    if warmup.ready:
+        status = "ready"
+    else:
+        status = "unavailable" if warmup.finished else "warming_up"
+    body = {
+        "status": status,
+        "voice_ready": bool(bot._speech_service and bot._speech_service.whisper_model),
+        "warmup": warmup.stats()
+    }
+    return body, 200 if warmup.ready else 503
+
+
+async def twilio_setup_results() -> Dict[str, Any]:
     tester = TwilioTester(bot.whatsapp_service)
-    results = await tester.test_connection()
-    return jsonify(results)
+    return await tester.test_connection()
 
 
-@app.route('/send-test-message/<phone>', methods=['GET'])
-async def send_test_message(phone):
+async def send_test_whatsapp(phone: str) -> Dict[str, str]:
     tester = TwilioTester(bot.whatsapp_service)
     success = await tester.send_test_message(f"+{phone}")
 
     if success:
-        return jsonify({"status": "success", "message": f"Test message sent to +{phone}"})
+        return {"status": "success", "message": f"Test message sent to +{phone}"}
     else:
-        return jsonify({"status": "failed", "message": "Failed to send test message"})
+        return {"status": "failed", "message": "Failed to send test message"}
+
+
+@app.route('/webhook', methods=['POST'])
+def whatsapp_webhook():
+    return accept_webhook(request.form)
+
+
+@app.route('/test', methods=['POST'])
+async def test_endpoint():
+    body, status = await run_test_message(request.get_json(silent=True))
+    return jsonify(body), status
+
+
+@app.route('/languages', methods=['GET'])
+def get_supported_languages():
+    return jsonify(languages_info())
+
+
+@app.route('/health')
+def health_check():
+    return jsonify(health_info())
+
+
+@app.route('/health/live')
+def liveness_check():
+    return jsonify(liveness_info())
+
+
+@app.route('/health/ready')
+def readiness_check():
+    body, status = readiness_info()
+    return jsonify(body), status
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    if request.args.get('format') == 'json':
+        return jsonify(metrics.snapshot())
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/test-twilio-setup', methods=['GET'])
+async def test_twilio_setup():
+    return jsonify(await twilio_setup_results())
+
+
+@app.route('/send-test-message/<phone>', methods=['GET'])
+async def send_test_message(phone):
+    return jsonify(await send_test_whatsapp(phone))
 
 
 if __name__ == '__main__':
     try:
         Config.validate_config()
-        print("✅ Configuration validated successfully")
+        logger.info("✅ Configuration validated successfully")
     except ValueError as e:
-        print(f"❌ Configuration error: {e}")
+        logger.error("❌ Configuration error: %s", e)
         exit(1)
 
     app.run(debug=True, host='0.0.0.0', port=5000)
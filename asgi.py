@@ -0,0 +1,116 @@
+"""ASGI entry point: the same routes as app.py served on one long-lived event loop.
+
+Flask runs each async view on a fresh event loop in a worker thread, so
+in-flight LLM and Twilio calls cost a thread each. Here every request, the
+message queue workers and all outbound calls share the server's loop.
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import concurrent.futures
+import os
+from contextlib import asynccontextmanager
+
+# Worker pool and warm-up wait for the server's loop (see lifespan) instead of starting on import
+os.environ.setdefault('SERVING_MODE', 'asgi')
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app import (
+    accept_webhook, run_test_message, languages_info, health_info, liveness_info, readiness_info,
+    twilio_setup_results, send_test_whatsapp, start_background_tasks, bot, logger
+)
+from utils.metrics import metrics
+from config import Config
+
+
+async def whatsapp_webhook(request):
+    form = await request.form()
+    # Dedup claim talks to Redis synchronously - keep it off the event loop
+    loop = asyncio.get_running_loop()
+    body, status = await loop.run_in_executor(None, accept_webhook, form)
+    return PlainTextResponse(body, status_code=status)
+
+
+async def test_endpoint(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    body, status = await run_test_message(data)
+    return JSONResponse(body, status_code=status)
+
+
+async def get_supported_languages(request):
+    return JSONResponse(languages_info())
+
+
+async def health_check(request):
+    return JSONResponse(health_info())
+
+
+async def liveness_check(request):
+    return JSONResponse(liveness_info())
+
+
+async def readiness_check(request):
+    body, status = readiness_info()
+    return JSONResponse(body, status_code=status)
+
+
+async def metrics_endpoint(request):
+    if request.query_params.get('format') == 'json':
+        return JSONResponse(metrics.snapshot())
+    return PlainTextResponse(metrics.render_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+async def test_twilio_setup(request):
+    return JSONResponse(await twilio_setup_results())
+
+
+async def send_test_message(request):
+    return JSONResponse(await send_test_whatsapp(request.path_params['phone']))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    loop = asyncio.get_running_loop()
+    # Twilio, gTTS and Whisper are blocking and run in the default executor
+    loop.set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(max_workers=Config.ASGI_BLOCKING_THREADS, thread_name_prefix="blocking")
+    )
+    start_background_tasks(loop)
+    logger.info("✅ ASGI app serving on a shared event loop")
+    yield
+    await bot.llm_agent.http_clients.aclose()
+
+
+asgi_app = Starlette(
+    routes=[
+        Route('/webhook', whatsapp_webhook, methods=['POST']),
+        Route('/test', test_endpoint, methods=['POST']),
+        Route('/languages', get_supported_languages, methods=['GET']),
+        Route('/health', health_check),
+        Route('/health/live', liveness_check),
+        Route('/health/ready', readiness_check),
+        Route('/metrics', metrics_endpoint),
+        Route('/test-twilio-setup', test_twilio_setup, methods=['GET']),
+        Route('/send-test-message/{phone}', send_test_message, methods=['GET'])
+    ],
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    try:
+        Config.validate_config()
+        logger.info("✅ Configuration validated successfully")
+    except ValueError as e:
+        logger.error("❌ Configuration error: %s", e)
+        exit(1)
+
+    uvicorn.run(asgi_app, host='0.0.0.0', port=5000)
@@ -0,0 +1,196 @@
+"""Micro-benchmarks for the per-message NLP hot paths.
+
+Measures throughput and per-call latency of language detection, mood
+analysis, location extraction, TTS text cleaning and prompt building over
+a corpus covering every supported language (script and romanized) at
+three message lengths. Results are JSON so runs can be diffed between
+commits:
+
+    python -m benchmarks.bench_hot_paths --json-out bench_before.json
+    python -m benchmarks.bench_hot_paths --compare bench_before.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .corpus import REPO_ROOT, build_corpus, sample_history
+
+# Components read data/ relative to the working directory
+os.chdir(REPO_ROOT)
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'gsk_benchmark')  # LocalGuideAgent refuses to start without a key
+
+
+def _summarize(samples_ns: List[int]) -> Dict[str, float]:
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+    total = sum(ordered)
+    return {
+        "calls": count,
+        "ops_per_sec": round(count / (total / 1e9), 1) if total else 0.0,
+        "mean_us": round(total / count / 1000, 2),
+        "p50_us": round(ordered[int((count - 1) * 0.50)] / 1000, 2),
+        "p95_us": round(ordered[int((count - 1) * 0.95)] / 1000, 2),
+        "p99_us": round(ordered[int((count - 1) * 0.99)] / 1000, 2)
+    }
+
+
+def _time_calls(func: Callable[[], Any], min_time: float, min_calls: int) -> List[int]:
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_calls or time.perf_counter() < deadline:
+        started_at = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - started_at)
+    return samples
+
+
+def build_targets() -> Dict[str, Callable[[Dict[str, str]], Callable[[], Any]]]:
+    """Map benchmark name -> factory producing a zero-arg call for one corpus entry."""
+    from models.language_detector import QuickLanguageDetector
+    from models.mood_analyzer import MoodAnalyzer
+    from models.llm_agent import LocalGuideAgent
+    from utils.location_extractor import LocationExtractor
+    from services.tts_service import TTSService
+
+    detector = QuickLanguageDetector()
+    mood_analyzer = MoodAnalyzer()
+    location_extractor = LocationExtractor()
+    tts_service = TTSService()
+    llm_agent = LocalGuideAgent()
+
+    def prompt_call(entry):
+        user_context = {
+            'detected_language': entry['language'],
+            'current_location': 'Delhi',
+            'mood': 'curious',
+            'conversation_turns': 4,
+            'wants_voice_response': entry['length'] == 'long'
+        }
+        history = sample_history(entry['language'])
+        return lambda: llm_agent._build_conversation_messages(entry['text'], user_context, history)
+
+    return {
+        "detect_language": lambda entry: lambda: detector.detect_language(entry['text']),
+        "analyze_mood": lambda entry: lambda: mood_analyzer.analyze_mood(entry['text'], entry['language']),
+        "extract_location": lambda entry: lambda: location_extractor.extract_location(entry['text']),
+        "clean_text_for_tts": lambda entry: lambda: tts_service._clean_text_for_tts(entry['text'], entry['language']),
+        "build_conversation_messages": prompt_call
+    }
+
+
+def run_benchmarks(min_time: float, min_calls: int, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    corpus = build_corpus()
+    targets = build_targets()
+    results = {}
+
+    for name, factory in targets.items():
+        if only and name not in only:
+            continue
+
+        all_samples: List[int] = []
+        groups: Dict[str, List[int]] = {}
+
+        for entry in corpus:
+            call = factory(entry)
+            call()  # Warm caches (regex compilation, langdetect profiles)
+            samples = _time_calls(call, min_time, min_calls)
+            all_samples.extend(samples)
+            for group in (f"length:{entry['length']}", f"form:{entry['form']}", f"lang:{entry['language']}"):
+                groups.setdefault(group, []).extend(samples)
+
+        results[name] = {
+            "all": _summarize(all_samples),
+            "groups": {group: _summarize(samples) for group, samples in sorted(groups.items())}
+        }
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus_size": len(corpus),
+            "min_time_per_case_s": min_time
+        },
+        "results": results
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print per-benchmark mean latency deltas; return names that regressed past ``threshold``."""
+    regressions = []
+    print(f"\n📈 Comparing against {baseline['meta'].get('commit')} (threshold {threshold:.0%})")
+
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"  {name:<30} (new)")
+            continue
+
+        before = base["all"]["mean_us"]
+        after = result["all"]["mean_us"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ❌ REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✅ faster"
+        print(f"  {name:<30} {before:>10.2f}us -> {after:>10.2f}us ({change:+.1%}){flag}")
+
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n⏱️  Hot-path benchmarks @ {report['meta'].get('commit')} ({report['meta']['corpus_size']} corpus entries)")
+    print("=" * 84)
+    print(f"  {'benchmark':<30} {'ops/s':>12} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for name, result in report["results"].items():
+        stats = result["all"]
+        print(f"  {name:<30} {stats['ops_per_sec']:>12} {stats['mean_us']:>8}us {stats['p50_us']:>8}us "
+              f"{stats['p95_us']:>8}us {stats['p99_us']:>8}us")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark per-message NLP hot paths")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds to run each corpus entry")
+    parser.add_argument("--min-calls", type=int, default=20, help="Minimum calls per corpus entry")
+    parser.add_argument("--only", nargs="*", help="Run only these benchmarks")
+    parser.add_argument("--json-out", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed mean latency regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.min_time, args.min_calls, args.only)
+    print_report(report)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark corpus: every language in data/languages.json, native script and
+romanized, at three message lengths."""
+import json
+import os
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# How people type these languages in Latin script on WhatsApp
+ROMANIZED_PHRASES = {
+    'hi': ["Lal kile ke baare mein batao", "Jaipur mein kya dekhna chahiye", "Mujhe Taj Mahal ki kahani sunao"],
+    'bn': ["Lal kella somporke bolun", "Kolkata te ki dekhbo", "Amake ekta golpo bolun"],
+    'ta': ["Sivappu kottai pathi sollunga", "Chennai la enna paakalam", "Oru kadhai sollunga"],
+    'te': ["Erra kota gurinchi cheppandi", "Hyderabad lo emi chudali", "Oka katha cheppandi"],
+    'ml': ["Chuvanna kottaye kurichu parayu", "Munnar il enthu kaanam", "Oru katha parayu"],
+    'kn': ["Kempu kote bagge heli", "Bengaluru alli enu nodabeku", "Ondu kathe heli"],
+    'gu': ["Lal killa vishe kaho", "Ahmedabad ma shu jovu", "Mane varta kaho"],
+    'mr': ["Lal killyabaddal sanga", "Mumbai madhe kay baghayche", "Mala goshta sanga"],
+    'pa': ["Laal qile baare dasso", "Amritsar vich ki vekhna", "Mainu kahani sunao"],
+    'or': ["Lal durga bisayare kuhantu", "Puri re kana dekhibi", "Gote kahani kuhantu"],
+    'as': ["Ronga durgor bishoye kook", "Guwahati t ki sabo", "Ekta kahini kook"],
+    'ur': ["Lal qila ke baare mein batayein", "Lucknow mein kya dekhein", "Mujhe kahani sunayein"],
+    'en': ["Tell me about the Red Fort", "What should I see in Jaipur", "Tell me a story about Hampi"]
+}
+
+
+def _load_sample_phrases() -> Dict[str, Dict[str, str]]:
+    with open(os.path.join(REPO_ROOT, 'data', 'languages.json'), 'r', encoding='utf-8') as f:
+        languages = json.load(f)['supported_languages']
+    return {code: info.get('sample_phrases', {}) for code, info in languages.items()}
+
+
+def _by_length(phrases: List[str]) -> Dict[str, str]:
+    """Short: one phrase. Medium: two joined. Long: every phrase, twice (~40-60 words)."""
+    return {
+        'short': phrases[0],
+        'medium': f"{phrases[0]}. {phrases[1]}",
+        'long': ". ".join(phrases * 2)
+    }
+
+
+def build_corpus() -> List[Dict[str, str]]:
+    """One entry per (language, form, length): ``{'language', 'form', 'length', 'text'}``."""
+    corpus = []
+
+    for lang, sample_phrases in _load_sample_phrases().items():
+        native = [
+            sample_phrases.get('query_fort', ''),
+            sample_phrases.get('location_ask', ''),
+            sample_phrases.get('story_request', ''),
+            sample_phrases.get('greeting', '')
+        ]
+        forms = {'script': [p for p in native if p]}
+        if lang != 'en':
+            forms['romanized'] = ROMANIZED_PHRASES[lang]
+
+        for form, phrases in forms.items():
+            for length, text in _by_length(phrases).items():
+                corpus.append({'language': lang, 'form': form, 'length': length, 'text': text})
+
+    return corpus
+
+
+def sample_history(language: str, turns: int = 6) -> List[Dict[str, str]]:
+    """Synthetic conversation history for prompt-building benchmarks."""
+    phrases = _load_sample_phrases().get(language, {})
+    user_text = phrases.get('query_fort', 'Tell me about the Red Fort')
+    assistant_text = phrases.get('greeting', 'Welcome to India') + " " + phrases.get('location_ask', '')
+
+    history = []
+    for i in range(turns):
+        history.append({'role': 'user' if i % 2 == 0 else 'assistant',
+                        'content': user_text if i % 2 == 0 else assistant_text})
+    return history
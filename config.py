@@ -12,10 +12,13 @@ class Config:
     TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
     TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
     TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER')
+    TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL')  # override only for local stand-ins
     
     # LLM API Keys
     GROQ_API_KEY = os.getenv('GROQ_API_KEY')
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+    GROQ_API_URL = os.getenv('GROQ_API_URL', 'https://api.groq.com/openai/v1/chat/completions')
+    OPENAI_API_URL = os.getenv('OPENAI_API_URL', 'https://api.openai.com/v1/chat/completions')
     
     # Redis Configuration
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
@@ -24,14 +27,94 @@ class Config:
     # Session and Cache
     SESSION_TIMEOUT = int(os.getenv('SESSION_TIMEOUT', '7200'))  # 2 hours
     CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', '3600'))  # 1 hour
+    MESSAGE_DEDUP_TTL = int(os.getenv('MESSAGE_DEDUP_TTL', '86400'))  # remember MessageSids for 24 hours
+    MESSAGE_DEDUP_MAX_ENTRIES = int(os.getenv('MESSAGE_DEDUP_MAX_ENTRIES', '50000'))  # in-memory fallback only
     
     # LLM Configuration
     LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'groq')  # 'groq' or 'openai'
     MAX_TOKENS = int(os.getenv('MAX_TOKENS', '300'))
     TEMPERATURE = float(os.getenv('TEMPERATURE', '0.9'))
     
+    # Background Worker Pool
+    WORKER_POOL_SIZE = int(os.getenv('WORKER_POOL_SIZE', '8'))  # users processed in parallel
+    WORKER_QUEUE_MAX_SIZE = int(os.getenv('WORKER_QUEUE_MAX_SIZE', '1000'))
+    ASGI_BLOCKING_THREADS = int(os.getenv('ASGI_BLOCKING_THREADS', '64'))  # blocking SDK calls under asgi.py
+    SERVING_MODE = os.getenv('SERVING_MODE', 'flask')  # asgi.py sets 'asgi'
+    
+    # LLM HTTP Connection Pool
+    LLM_HTTP_MAX_CONNECTIONS = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', '100'))  # per provider
+    LLM_HTTP_MAX_KEEPALIVE = int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', '20'))
+    LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY', '60'))
+    LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT', '5'))
+    LLM_HTTP_READ_TIMEOUT = float(os.getenv('LLM_HTTP_READ_TIMEOUT', '30'))
+    LLM_HTTP2 = os.getenv('LLM_HTTP2', 'True').lower() == 'true'
+    
+    # Provider Selection, Hedging and Circuit Breakers
+    LLM_LATENCY_WINDOW = int(os.getenv('LLM_LATENCY_WINDOW', '100'))  # recent calls kept per provider
+    LLM_LATENCY_PRIOR_SECONDS = float(os.getenv('LLM_LATENCY_PRIOR_SECONDS', '2.0'))  # assumed until a provider has data
+    LLM_HEDGING_ENABLED = os.getenv('LLM_HEDGING_ENABLED', 'False').lower() == 'true'  # race the backup after the primary's p95
+    LLM_HEDGE_MIN_DELAY = float(os.getenv('LLM_HEDGE_MIN_DELAY', '0.3'))
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', '3'))  # errors in a row to open
+    LLM_BREAKER_SLOW_CALL_SECONDS = float(os.getenv('LLM_BREAKER_SLOW_CALL_SECONDS', '10'))  # slower counts as an error
+    LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', '30'))  # seconds open before a probe
+    
+    # Model Routing
+    MODEL_ROUTING_ENABLED = os.getenv('MODEL_ROUTING_ENABLED', 'True').lower() == 'true'  # off: small models, 300 tokens
+    GROQ_SMALL_MODEL = os.getenv('GROQ_SMALL_MODEL', 'llama3-8b-8192')
+    GROQ_LARGE_MODEL = os.getenv('GROQ_LARGE_MODEL', 'llama3-70b-8192')
+    OPENAI_SMALL_MODEL = os.getenv('OPENAI_SMALL_MODEL', 'gpt-3.5-turbo')
+    OPENAI_LARGE_MODEL = os.getenv('OPENAI_LARGE_MODEL', 'gpt-4o-mini')
+    ROUTING_SHORT_MESSAGE_WORDS = int(os.getenv('ROUTING_SHORT_MESSAGE_WORDS', '8'))  # at most: small model, short reply
+    ROUTING_LONG_MESSAGE_WORDS = int(os.getenv('ROUTING_LONG_MESSAGE_WORDS', '40'))  # at least: large model
+    ROUTING_DEEP_TURN = int(os.getenv('ROUTING_DEEP_TURN', '8'))  # conversation turn from which the large model answers
+    ROUTING_LARGE_LANGUAGES = os.getenv('ROUTING_LARGE_LANGUAGES', '')  # e.g. "ta,ml" - always the large model
+    SHORT_REPLY_MAX_TOKENS = int(os.getenv('SHORT_REPLY_MAX_TOKENS', '150'))
+    STORY_MAX_TOKENS = int(os.getenv('STORY_MAX_TOKENS', '450'))  # stories and voice replies
+    
+    # Streaming Replies
+    LLM_STREAMING = os.getenv('LLM_STREAMING', 'False').lower() == 'true'  # send each sentence as it's generated
+    STREAM_MIN_SEGMENT_CHARS = int(os.getenv('STREAM_MIN_SEGMENT_CHARS', '40'))  # shorter sentences are merged
+    
+    # Response Cache
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '5000'))  # LRU beyond this
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '21600'))  # 6 hours
+    RESPONSE_CACHE_VARIANTS = int(os.getenv('RESPONSE_CACHE_VARIANTS', '3'))  # distinct replies served per question
+    RESPONSE_CACHE_MAX_MESSAGE_CHARS = int(os.getenv('RESPONSE_CACHE_MAX_MESSAGE_CHARS', '200'))  # longer = personal, not cached
+    
+    # Conversation Memory
+    CONVERSATION_MEMORY_ENABLED = os.getenv('CONVERSATION_MEMORY_ENABLED', 'True').lower() == 'true'
+    MEMORY_RECENT_TURNS = int(os.getenv('MEMORY_RECENT_TURNS', '2'))  # turns kept verbatim, older ones are summarized
+    CONVERSATION_TOKEN_BUDGET = int(os.getenv('CONVERSATION_TOKEN_BUDGET', '600'))  # summary + history per LLM call
+    MEMORY_SUMMARY_MAX_TOKENS = int(os.getenv('MEMORY_SUMMARY_MAX_TOKENS', '150'))
+    MEMORY_COMPACT_MIN_MESSAGES = int(os.getenv('MEMORY_COMPACT_MIN_MESSAGES', '2'))  # unsummarized messages before folding
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '1200'))  # whole reply prompt: system, history, message
+    
+    # Usage Telemetry
+    USAGE_LOG_FILE = os.getenv('USAGE_LOG_FILE', 'usage.log')  # one JSON line per LLM call, empty to disable
+    
+    # Pre-generated Stories
+    CONTENT_STORE_ENABLED = os.getenv('CONTENT_STORE_ENABLED', 'True').lower() == 'true'
+    CONTENT_STORE_DIR = os.getenv('CONTENT_STORE_DIR', 'content_store')
+    STORY_VARIANTS = int(os.getenv('STORY_VARIANTS', '3'))  # stories per place and language
+    STORY_REFRESH_DAYS = float(os.getenv('STORY_REFRESH_DAYS', '30'))  # older pairs are regenerated by the job
+    PREGEN_CONCURRENCY = int(os.getenv('PREGEN_CONCURRENCY', '4'))
+    
+    # Intent Router
+    INTENT_ROUTER_ENABLED = os.getenv('INTENT_ROUTER_ENABLED', 'True').lower() == 'true'  # canned replies to greetings, thanks, ok
+    
+    # Local Knowledge Fast Path
+    KNOWLEDGE_FAST_PATH_ENABLED = os.getenv('KNOWLEDGE_FAST_PATH_ENABLED', 'True').lower() == 'true'
+    KNOWLEDGE_MIN_COVERAGE = float(os.getenv('KNOWLEDGE_MIN_COVERAGE', '0.75'))  # share of the question a fact must match
+    KNOWLEDGE_MAX_QUERY_WORDS = int(os.getenv('KNOWLEDGE_MAX_QUERY_WORDS', '12'))  # longer messages go to the LLM
+    
+    # Tracing
+    SLOW_REQUEST_THRESHOLD_MS = int(os.getenv('SLOW_REQUEST_THRESHOLD_MS', '5000'))
+    
     # Voice and Audio
-    VOICE_RESPONSES_ENABLED = os.getenv('VOICE_RESPONSES_ENABLED', 'True').lower() == 'true'
+    VOICE_RESPONSES_ENABLED = os.getenv('VOICE_RESPONSES_ENABLED', 'True').lower() == 'true'  # False = text-only worker
+    PRELOAD_VOICE = os.getenv('PRELOAD_VOICE', 'True').lower() == 'true'  # warm up Whisper/gTTS in the background
+    WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'True').lower() == 'true'
     DEFAULT_VOICE_LANGUAGE = os.getenv('DEFAULT_VOICE_LANGUAGE', 'en')
     AUDIO_UPLOAD_FOLDER = os.getenv('AUDIO_UPLOAD_FOLDER', './uploads/audio')
     
@@ -84,6 +167,10 @@ class Config:
     # API Rate Limits
     GROQ_RATE_LIMIT = int(os.getenv('GROQ_RATE_LIMIT', '100'))  # requests per minute
     OPENAI_RATE_LIMIT = int(os.getenv('OPENAI_RATE_LIMIT', '60'))  # requests per minute
+    GROQ_TOKENS_PER_MINUTE = int(os.getenv('GROQ_TOKENS_PER_MINUTE', '0'))  # 0 = no token budget
+    OPENAI_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_TOKENS_PER_MINUTE', '0'))
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '2.0'))  # seconds a call may queue for budget
+    RATE_LIMIT_SHARED = os.getenv('RATE_LIMIT_SHARED', 'True').lower() == 'true'  # share buckets via Redis
     
     # Cloud Storage (for audio files)
     CLOUD_STORAGE_PROVIDER = os.getenv('CLOUD_STORAGE_PROVIDER', 'local')  # 'aws', 'gcp', 'azure', 'local'
@@ -94,6 +181,8 @@ class Config:
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', 'app.log')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # 'text' or 'json'
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '0.1'))  # share of requests with DEBUG output
     
     @classmethod
     def validate_config(cls):
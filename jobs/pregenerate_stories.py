@@ -0,0 +1,241 @@
+"""Pre-generate story variants for popular places in every supported language.
+
+Places come from data/cities.json (cities, states, hill stations and what
+the metros are famous for) and data/cultural_content.json, whose stories
+and facts are passed to the LLM as material. Each place/language pair gets
+``STORY_VARIANTS`` stories, narrated with the TTS service, in the content
+store the live bot serves story requests from.
+
+Re-running is cheap: pairs that are complete and fresh are skipped, a pair
+left half-done by an interrupted run is finished, and pairs older than
+``STORY_REFRESH_DAYS`` (or whose source material changed) are regenerated
+while the old variants keep being served until the new set is complete.
+
+    python -m jobs.pregenerate_stories --dry-run
+    python -m jobs.pregenerate_stories --languages en,hi,ta --places "Red Fort,Jaipur"
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Components read data/ relative to the working directory
+os.chdir(REPO_ROOT)
+sys.path.insert(0, REPO_ROOT)
+
+from config import Config  # noqa: E402
+from services.content_store import ContentStore, place_slug  # noqa: E402
+from utils.language_registry import get_language_registry  # noqa: E402
+from utils.logger import get_logger  # noqa: E402
+from utils.tracing import trace  # noqa: E402
+
+logger = get_logger(__name__)
+
+# Bump when the story prompt changes so every pair is regenerated
+PROMPT_VERSION = 1
+
+# One angle per variant so the stories for a place don't retell each other
+STORY_ANGLES = (
+    "its history",
+    "a legend or folk tale told about it",
+    "the people, food and festivals around it",
+    "what a visitor sees and hears there today"
+)
+
+
+def popular_places() -> List[Dict[str, Any]]:
+    """Places from the data files with their aliases and any source material per language."""
+    from utils.location_extractor import LocationExtractor
+
+    with open('data/cities.json', 'r', encoding='utf-8') as f:
+        cities = json.load(f)
+    with open('data/cultural_content.json', 'r', encoding='utf-8') as f:
+        cultural = json.load(f)
+
+    places: Dict[str, Dict[str, Any]] = {}
+
+    def add(name: str, material: Optional[Dict[str, List[str]]] = None):
+        place = places.setdefault(name, {"place": name, "material": {}})
+        place["material"].update(material or {})
+
+    for group in cities.values():
+        for name, info in group.items():
+            add(name)
+            for landmark in info.get("famous_for", []):
+                add(landmark)
+
+    for key, by_language in cultural.items():
+        add(key.replace('_', ' ').title(), {
+            language: content.get("stories", []) + content.get("facts", [])
+            for language, content in by_language.items()
+        })
+
+    # Every spelling the location extractor maps to a place also finds its stories
+    aliases: Dict[str, List[str]] = {}
+    for alias, name in LocationExtractor().indian_cities.items():
+        aliases.setdefault(name, []).append(alias)
+    for place in places.values():
+        place["aliases"] = sorted(set(aliases.get(place["place"], [])))
+
+    return list(places.values())
+
+
+def story_request(place: str, variant: int, material: List[str]) -> str:
+    angle = STORY_ANGLES[variant % len(STORY_ANGLES)]
+    message = f"Tell me a story about {place}, focusing on {angle}."
+    if material:
+        message += " You can draw on: " + " ".join(material)
+    return message
+
+
+def fingerprint(place: str, language: str, material: List[str]) -> str:
+    source = json.dumps([PROMPT_VERSION, STORY_ANGLES, place, language, material], ensure_ascii=False)
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+class StoryPregenerator:
+    """Fills the content store, ``concurrency`` place/language pairs at a time."""
+
+    def __init__(self, args: argparse.Namespace):
+        from models.llm_agent import LocalGuideAgent
+        from services.tts_service import TTSService
+
+        self.args = args
+        self.store = ContentStore(args.store_dir)
+        self.agent = LocalGuideAgent()
+        self.tts = TTSService() if args.audio else None
+        self.max_age = args.max_age_days * 86400
+        self.counts = {"generated": 0, "failed": 0, "skipped": 0}
+
+    def plan(self) -> List[Dict[str, Any]]:
+        """Place/language pairs that need work."""
+        registry = get_language_registry()
+        languages = [code.strip() for code in self.args.languages.split(',')] if self.args.languages \
+            else [record.code for record in registry]
+        wanted = {name.strip().lower() for name in self.args.places.split(',')} if self.args.places else None
+
+        jobs = []
+        for place in popular_places():
+            if wanted is not None and place["place"].lower() not in wanted:
+                continue
+            for language in languages:
+                if language not in registry:
+                    logger.warning("⚠️ Skipping unsupported language %s", language)
+                    continue
+                material = place["material"].get(language) or place["material"].get('en', [])
+                job = dict(place, language=language, material=material,
+                           fingerprint=fingerprint(place["place"], language, material))
+                if self.args.force or self.store.needs_refresh(
+                        place["place"], language, job["fingerprint"], self.args.variants, self.max_age):
+                    jobs.append(job)
+                else:
+                    self.counts["skipped"] += 1
+        return jobs
+
+    async def run(self) -> Dict[str, int]:
+        jobs = self.plan()
+        logger.info("📚 %d place/language pairs to generate, %d up to date", len(jobs), self.counts["skipped"])
+        if self.args.dry_run:
+            for job in jobs:
+                print(f"{job['place']} [{job['language']}]")
+            return self.counts
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            pending.put_nowait(job)
+
+        async def worker():
+            while not pending.empty():
+                await self.generate_pair(pending.get_nowait())
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, self.args.concurrency))))
+        finally:
+            await self.agent.http_clients.aclose()
+        return self.counts
+
+    async def generate_pair(self, job: Dict[str, Any]):
+        place, language = job["place"], job["language"]
+        entry = self.store.get_entry(place, language)
+        expired = entry is not None and entry.get("completed_at") and \
+            time.time() - entry["completed_at"] > self.max_age
+        # Resume a half-finished pair; replace an outdated one only once its successor is complete
+        resuming = entry is not None and not self.args.force and not expired and \
+            entry.get("fingerprint") == job["fingerprint"]
+        variants = list(entry["variants"][:self.args.variants]) if resuming else []
+
+        while len(variants) < self.args.variants:
+            variant = await self.generate_variant(job, len(variants))
+            if variant is None:
+                self.counts["failed"] += 1
+                logger.error("❌ Story generation failed for %s [%s], will retry on the next run", place, language)
+                return
+            variants.append(variant)
+            self.counts["generated"] += 1
+            if resuming or entry is None:
+                self.store.put_entry(place, language, job["aliases"], job["fingerprint"], variants,
+                                     complete=len(variants) >= self.args.variants)
+
+        if not (resuming or entry is None):
+            self.store.put_entry(place, language, job["aliases"], job["fingerprint"], variants, complete=True)
+        logger.info("✅ %s [%s]: %d stories", place, language, len(variants))
+
+    async def generate_variant(self, job: Dict[str, Any], index: int) -> Optional[Dict[str, Any]]:
+        language = job["language"]
+        user_context = {
+            "detected_language": language,
+            "current_location": job["place"],
+            "mood": "curious",
+            "conversation_turns": 1,
+            "wants_voice_response": True
+        }
+
+        with trace("pregenerate_stories"):
+            text = await self.agent.generate_fresh(story_request(job["place"], index, job["material"]), user_context)
+            if not text:
+                return None
+
+            audio = None
+            # Without a voice for the language there is no narration - never read it in an English voice
+            if self.tts and language in self.tts.get_supported_languages():
+                temp_path = await self.tts.text_to_speech(text, language)
+                if temp_path:
+                    audio = f"{place_slug(job['place'])}_{language}_{uuid.uuid4().hex[:8]}.mp3"
+                    os.makedirs(self.store.audio_dir, exist_ok=True)
+                    shutil.move(temp_path, os.path.join(self.store.audio_dir, audio))
+
+        return {"text": text, "audio": audio, "generated_at": time.time()}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pre-generate stories for popular places")
+    parser.add_argument("--languages", help="Comma-separated language codes (default: every supported language)")
+    parser.add_argument("--places", help="Comma-separated place names (default: every place in data/)")
+    parser.add_argument("--variants", type=int, default=Config.STORY_VARIANTS, help="Stories per place and language")
+    parser.add_argument("--concurrency", type=int, default=Config.PREGEN_CONCURRENCY,
+                        help="Place/language pairs generated at the same time")
+    parser.add_argument("--max-age-days", type=float, default=Config.STORY_REFRESH_DAYS,
+                        help="Regenerate pairs completed longer ago than this")
+    parser.add_argument("--store-dir", default=Config.CONTENT_STORE_DIR)
+    parser.add_argument("--no-audio", dest="audio", action="store_false", help="Text only, skip TTS")
+    parser.add_argument("--force", action="store_true", help="Regenerate everything selected")
+    parser.add_argument("--dry-run", action="store_true", help="List the pairs that would be generated")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    counts = asyncio.run(StoryPregenerator(args).run())
+    print(f"Generated {counts['generated']} stories, {counts['failed']} pairs failed, {counts['skipped']} up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""Local stand-ins for Groq/OpenAI, the Twilio Messages API and Redis.
+
+Everything here is stdlib-only so load tests run without network access.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+FAKE_REPLIES = {
+    'en': "The Red Fort is magnificent! Built by Shah Jahan in 1648, it housed Mughal emperors. Would you like to hear about its Diwan-i-Khas?",
+    'hi': "लाल किला शानदार है! शाहजहाँ ने 1648 में बनवाया था। क्या आप दीवान-ए-ख़ास के बारे में सुनना चाहेंगे?",
+    'bn': "লাল কেল্লা দুর্দান্ত! শাহজাহান ১৬৪৮ সালে নির্মাণ করেছিলেন। আপনি কি আরও জানতে চান?"
+}
+
+
+class _BackgroundHTTPServer:
+    """ThreadingHTTPServer running on a daemon thread."""
+
+    handler_class = BaseHTTPRequestHandler
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), self.handler_class)
+        self.server.daemon_threads = True
+        self.server.owner = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _LLMHandler(_QuietHandler):
+    def do_GET(self):
+        # Model listing - used for connection priming
+        self._send_json(200, {"object": "list", "data": [{"id": "fake-model"}]})
+
+    def do_POST(self):
+        owner: FakeLLMServer = self.server.owner
+        request = json.loads(self._read_body() or b"{}")
+        owner.requests += 1
+
+        if owner.error_rate and random.random() < owner.error_rate:
+            self._send_json(500, {"error": {"message": "fake upstream error"}})
+            return
+
+        time.sleep(owner.next_delay())
+        content = owner.reply_for(request)
+        prompt_tokens = sum(len(m.get('content', '')) for m in request.get('messages', [])) // 4
+        completion_tokens = max(1, len(content) // 4)
+
+        if request.get('stream'):
+            self._stream(request, content, owner.token_delay)
+            return
+
+        # A non-streamed completion still takes the full generation time
+        time.sleep(owner.token_delay * len(content.split(' ')))
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "model": request.get('model', 'fake-model'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _stream(self, request: Dict[str, Any], content: str, token_delay: float):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        for word in content.split(' '):
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": request.get('model', 'fake-model'),
+                "choices": [{"index": 0, "delta": {"content": word + ' '}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if token_delay:
+                time.sleep(token_delay)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class FakeLLMServer(_BackgroundHTTPServer):
+    """OpenAI-compatible chat completions endpoint with configurable latency.
+
+    Serves ``POST /openai/v1/chat/completions`` (Groq) and ``POST /v1/chat/completions`` (OpenAI).
+    """
+
+    handler_class = _LLMHandler
+
+    def __init__(self, delay: float = 0.5, jitter: float = 0.2, error_rate: float = 0.0,
+                 token_delay: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.token_delay = token_delay
+        self.requests = 0
+
+    def next_delay(self) -> float:
+        return max(0.0, self.delay + random.uniform(-self.jitter, self.jitter))
+
+    def reply_for(self, request: Dict[str, Any]) -> str:
+        system_prompt = next(
+            (m.get('content', '') for m in request.get('messages', []) if m.get('role') == 'system'), ''
+        )
+        for lang, language_name in (('hi', 'Hindi'), ('bn', 'Bengali')):
+            if language_name in system_prompt:
+                return FAKE_REPLIES[lang]
+        return FAKE_REPLIES['en']
+
+    @property
+    def groq_url(self) -> str:
+        return f"{self.url}/openai/v1/chat/completions"
+
+    @property
+    def openai_url(self) -> str:
+        return f"{self.url}/v1/chat/completions"
+
+
+class _TwilioHandler(_QuietHandler):
+    def do_GET(self):
+        # Account fetch used by /test-twilio-setup
+        account_sid = self.path.split('/')[3] if self.path.count('/') >= 3 else 'AC0'
+        self._send_json(200, {"sid": account_sid.replace('.json', ''), "status": "active", "friendly_name": "Fake Account"})
+
+    def do_POST(self):
+        owner: FakeTwilioServer = self.server.owner
+        form = {k: v[0] for k, v in parse_qs(self._read_body().decode('utf-8')).items()}
+        sid = f"SM{uuid.uuid4().hex}"
+        owner.record(form, sid)
+
+        self._send_json(201, {
+            "sid": sid,
+            "status": "queued",
+            "body": form.get('Body', ''),
+            "from": form.get('From'),
+            "to": form.get('To'),
+            "account_sid": self.path.split('/')[3] if self.path.count('/') >= 3 else 'AC0',
+            "direction": "outbound-api",
+            "num_segments": "1",
+            "date_created": None,
+            "date_updated": None,
+            "date_sent": None,
+            "uri": self.path
+        })
+
+
+class FakeTwilioServer(_BackgroundHTTPServer):
+    """Twilio Messages API stand-in that records every outbound message."""
+
+    handler_class = _TwilioHandler
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.messages: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, threading.Event] = {}
+
+    def record(self, form: Dict[str, str], sid: str):
+        to_number = form.get('To', '')
+        with self._lock:
+            self.messages.append({"to": to_number, "body": form.get('Body', ''), "sid": sid, "received_at": time.perf_counter()})
+            waiter = self._waiters.get(to_number)
+        if waiter:
+            waiter.set()
+
+    def expect(self, to_number: str) -> threading.Event:
+        """Register interest in the next message to ``to_number`` (whatsapp:+... form)."""
+        event = threading.Event()
+        with self._lock:
+            self._waiters[to_number] = event
+        return event
+
+    def first_message_to(self, to_number: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((m for m in self.messages if m["to"] == to_number), None)
+
+
+class FakeRedisServer:
+    """Tiny RESP2 server covering the Redis commands CacheService uses."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.data: Dict[str, Any] = {}
+        self.expires: Dict[str, float] = {}
+        self.loop = asyncio.new_event_loop()
+        self._server = None
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    def start(self):
+        self.thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self._server = self.loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self.loop.run_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                writer.write(self._execute(command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[str]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.decode().split()
+
+        parts = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            parts.append((await reader.readexactly(size + 2))[:-2].decode('utf-8'))
+        return parts
+
+    # RESP encoding
+    @staticmethod
+    def _bulk(value: Optional[str]) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        encoded = str(value).encode('utf-8')
+        return b"$" + str(len(encoded)).encode() + b"\r\n" + encoded + b"\r\n"
+
+    @staticmethod
+    def _int(value: int) -> bytes:
+        return f":{value}\r\n".encode()
+
+    def _array(self, values: List[str]) -> bytes:
+        return f"*{len(values)}\r\n".encode() + b"".join(self._bulk(v) for v in values)
+
+    def _alive(self, key: str) -> bool:
+        expiry = self.expires.get(key)
+        if expiry is not None and expiry <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def _set_ttl(self, key: str, seconds: Optional[float]):
+        if seconds is None:
+            self.expires.pop(key, None)
+        else:
+            self.expires[key] = time.time() + seconds
+
+    def _execute(self, command: List[str]) -> bytes:
+        name = command[0].upper()
+        args = command[1:]
+
+        if name in ('PING',):
+            return b"+PONG\r\n"
+        if name in ('CLIENT', 'SELECT', 'AUTH'):
+            return b"+OK\r\n"
+        if name == 'GET':
+            return self._bulk(self.data.get(args[0]) if self._alive(args[0]) else None)
+        if name == 'SET':
+            key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+            if 'NX' in options and self._alive(key):
+                return b"$-1\r\n"
+            self.data[key] = value
+            ttl = None
+            if 'EX' in options:
+                ttl = float(args[2 + options.index('EX') + 1])
+            elif 'PX' in options:
+                ttl = float(args[2 + options.index('PX') + 1]) / 1000
+            self._set_ttl(key, ttl)
+            return b"+OK\r\n"
+        if name == 'SETEX':
+            self.data[args[0]] = args[2]
+            self._set_ttl(args[0], float(args[1]))
+            return b"+OK\r\n"
+        if name == 'DEL':
+            removed = sum(1 for key in args if self._alive(key) and self.data.pop(key, None) is not None)
+            return self._int(removed)
+        if name == 'EXPIRE':
+            if not self._alive(args[0]):
+                return self._int(0)
+            self._set_ttl(args[0], float(args[1]))
+            return self._int(1)
+        if name == 'INCR' or name == 'INCRBY':
+            amount = int(args[1]) if name == 'INCRBY' else 1
+            value = int(self.data.get(args[0], 0) if self._alive(args[0]) else 0) + amount
+            self.data[args[0]] = str(value)
+            return self._int(value)
+        if name == 'LPUSH':
+            items = self.data.get(args[0]) if self._alive(args[0]) else None
+            items = items if isinstance(items, list) else []
+            for value in args[1:]:
+                items.insert(0, value)
+            self.data[args[0]] = items
+            return self._int(len(items))
+        if name == 'LRANGE':
+            items = self.data.get(args[0], []) if self._alive(args[0]) else []
+            start, stop = int(args[1]), int(args[2])
+            stop = len(items) if stop == -1 else stop + 1
+            return self._array(items[start:stop])
+        if name == 'LTRIM':
+            if self._alive(args[0]):
+                start, stop = int(args[1]), int(args[2])
+                items = self.data[args[0]]
+                self.data[args[0]] = items[start:(len(items) if stop == -1 else stop + 1)]
+            return b"+OK\r\n"
+
+        return f"-ERR unknown command '{name}'\r\n".encode()
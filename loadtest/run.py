@@ -0,0 +1,353 @@
+"""Offline load test for the /webhook and /test endpoints.
+
+Starts local stand-ins for Groq/OpenAI, the Twilio Messages API and
+(optionally) Redis, boots the bot against them and drives it at a fixed
+request rate. Reports p50/p95/p99 latency and throughput.
+
+    python -m loadtest.run --endpoint webhook --rate 20 --duration 30 --llm-delay 0.8
+    python -m loadtest.run --endpoint test --rate 5 --requests 50 --redis --json-out results.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .fakes import FakeLLMServer, FakeRedisServer, FakeTwilioServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_MESSAGES = [
+    "Tell me about the Red Fort",
+    "What should I see in Jaipur?",
+    "I'm tired in Mumbai, suggest a calm place",
+    "लाल किले के बारे में बताओ",
+    "मुझे ताजमहल की कहानी सुनाओ",
+    "লাল কেল্লা কোথায়?",
+    "சிவப்பு கோட்டை பற்றி சொல்லுங்கள்",
+    "ఎర్రకోట గురించి చెప్పండి",
+    "ചുവന്ന കോട്ടയെക്കുറിച്ച് പറയൂ",
+    "Best time to visit Munnar?"
+]
+
+SERVER_BOOTSTRAP = {
+    "flask": "from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)",
+    "asgi": "import uvicorn; from asgi import asgi_app; uvicorn.run(asgi_app, host='127.0.0.1', port={port}, log_level='warning')"
+}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99/max in milliseconds."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+        return round(ordered[index] * 1000, 1)
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99), "max": round(ordered[-1] * 1000, 1)}
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.llm: Optional[FakeLLMServer] = None
+        self.twilio: Optional[FakeTwilioServer] = None
+        self.redis: Optional[FakeRedisServer] = None
+        self.server_process: Optional[subprocess.Popen] = None
+        self.target = args.target
+
+        self._lock = threading.Lock()
+        self.ack_latencies: List[float] = []
+        self.e2e_latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.sent_at: Dict[str, List[float]] = {}
+        self.load_started_at = 0.0
+        self.last_completion = 0.0
+
+    # Setup / teardown
+
+    def start_fakes(self):
+        self.llm = FakeLLMServer(
+            delay=self.args.llm_delay, jitter=self.args.llm_jitter,
+            error_rate=self.args.llm_error_rate, token_delay=self.args.llm_token_delay, port=self.args.llm_port
+        ).start()
+        self.twilio = FakeTwilioServer(port=self.args.twilio_port).start()
+        if self.args.redis:
+            self.redis = FakeRedisServer(port=self.args.redis_port).start()
+
+    def server_env(self, port: int) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            "GROQ_API_KEY": "gsk_loadtest",
+            "OPENAI_API_KEY": "sk-loadtest",
+            "GROQ_API_URL": self.llm.groq_url,
+            "OPENAI_API_URL": self.llm.openai_url,
+            "TWILIO_ACCOUNT_SID": "AC" + "0" * 32,
+            "TWILIO_AUTH_TOKEN": "loadtest",
+            "TWILIO_PHONE_NUMBER": "+14155238886",
+            "TWILIO_API_BASE_URL": self.twilio.url,
+            # Unreachable Redis makes CacheService use its in-memory fallback
+            "REDIS_URL": self.redis.url if self.redis else "redis://127.0.0.1:1/0",
+            "WORKER_POOL_SIZE": str(self.args.server_workers),
+            "LLM_STREAMING": str(self.args.streaming),
+            "LOG_LEVEL": self.args.server_log_level,
+            "LOG_FILE": "",
+            "USAGE_LOG_FILE": "",
+            # gTTS and Whisper would reach the internet (and Whisper may download weights)
+            "VOICE_RESPONSES_ENABLED": "False",
+            "PRELOAD_VOICE": "False",
+            "NO_PROXY": "127.0.0.1,localhost"
+        })
+        return env
+
+    def start_server(self):
+        if self.target:
+            return
+
+        port = self.args.server_port
+        log_file = open(self.args.server_log, 'w') if self.args.server_log else subprocess.DEVNULL
+        self.server_process = subprocess.Popen(
+            [sys.executable, "-c", SERVER_BOOTSTRAP[self.args.server].format(port=port)],
+            cwd=REPO_ROOT, env=self.server_env(port),
+            stdout=log_file, stderr=subprocess.STDOUT
+        )
+        self.target = f"http://127.0.0.1:{port}"
+
+        deadline = time.time() + self.args.startup_timeout
+        while time.time() < deadline:
+            if self.server_process.poll() is not None:
+                raise RuntimeError("Server exited during startup - rerun with --server-log to see why")
+            try:
+                if requests.get(f"{self.target}/health/ready", timeout=1).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+
+        raise RuntimeError(f"Server did not become ready within {self.args.startup_timeout}s")
+
+    def stop(self):
+        if self.server_process:
+            self.server_process.terminate()
+            try:
+                self.server_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.server_process.kill()
+        for fake in (self.llm, self.twilio, self.redis):
+            if fake:
+                fake.stop()
+
+    # Load generation
+
+    def _record_error(self, kind: str):
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def _user_for(self, index: int) -> str:
+        users = self.args.users or self.total_requests
+        return f"+9170{index % users:08d}"
+
+    def _send_webhook(self, session: requests.Session, index: int):
+        user = self._user_for(index)
+        form = {
+            "From": f"whatsapp:{user}",
+            "Body": SAMPLE_MESSAGES[index % len(SAMPLE_MESSAGES)],
+            "MessageSid": f"SM{uuid.uuid4().hex}"
+        }
+        started_at = time.perf_counter()
+        response = session.post(f"{self.target}/webhook", data=form, timeout=self.args.timeout)
+        elapsed = time.perf_counter() - started_at
+
+        if response.status_code != 200:
+            self._record_error(f"http_{response.status_code}")
+            return
+
+        with self._lock:
+            self.ack_latencies.append(elapsed)
+            self.sent_at.setdefault(f"whatsapp:{user}", []).append(started_at)
+
+    def _send_test(self, session: requests.Session, index: int):
+        payload = {
+            "user_id": self._user_for(index),
+            "message": SAMPLE_MESSAGES[index % len(SAMPLE_MESSAGES)]
+        }
+        started_at = time.perf_counter()
+        response = session.post(f"{self.target}/test", json=payload, timeout=self.args.timeout)
+        elapsed = time.perf_counter() - started_at
+
+        if response.status_code != 200:
+            self._record_error(f"http_{response.status_code}")
+            return
+
+        with self._lock:
+            self.ack_latencies.append(elapsed)
+            self.e2e_latencies.append(elapsed)
+            self.last_completion = max(self.last_completion, started_at + elapsed)
+
+    def _run_one(self, index: int):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+
+        endpoint = self.args.endpoint
+        if endpoint == 'mixed':
+            endpoint = 'webhook' if index % 2 == 0 else 'test'
+
+        try:
+            if endpoint == 'webhook':
+                self._send_webhook(session, index)
+            else:
+                self._send_test(session, index)
+        except requests.Timeout:
+            self._record_error("timeout")
+        except requests.RequestException as e:
+            self._record_error(type(e).__name__)
+
+    def generate_load(self) -> float:
+        """Open-loop arrivals at --rate; returns wall-clock seconds spent sending."""
+        self._local = threading.local()
+        interval = 1.0 / self.args.rate
+        started_at = self.load_started_at = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            for index in range(self.total_requests):
+                scheduled = started_at + index * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._run_one, index)
+
+        return time.perf_counter() - started_at
+
+    def collect_deliveries(self) -> int:
+        """Match outbound Twilio messages to webhook sends; returns replies still missing."""
+        deadline = time.time() + self.args.drain_timeout
+
+        # A streamed reply arrives as several messages, so wait per recipient
+        # rather than on the overall message count
+        while True:
+            delivered: Dict[str, List[float]] = {}
+            for message in list(self.twilio.messages):
+                delivered.setdefault(message["to"], []).append(message["received_at"])
+            if time.time() >= deadline or all(
+                len(delivered.get(number, [])) >= len(sent_times) for number, sent_times in self.sent_at.items()
+            ):
+                break
+            time.sleep(0.1)
+
+        # Per-user ordering means the n-th reply answers the n-th message
+        missing = 0
+        for number, sent_times in self.sent_at.items():
+            received_times = delivered.get(number, [])
+            for i, sent_time in enumerate(sent_times):
+                if i < len(received_times):
+                    self.e2e_latencies.append(received_times[i] - sent_time)
+                    self.last_completion = max(self.last_completion, received_times[i])
+                else:
+                    missing += 1
+        return missing
+
+    def run(self) -> Dict[str, Any]:
+        if self.args.requests:
+            self.total_requests = self.args.requests
+        else:
+            self.total_requests = int(self.args.rate * self.args.duration)
+
+        self.start_fakes()
+        try:
+            self.start_server()
+            sending_time = self.generate_load()
+            missing = self.collect_deliveries() if self.sent_at else 0
+            wall_time = max(self.last_completion - self.load_started_at, sending_time, 1e-9)
+
+            completed = len(self.e2e_latencies)
+            return {
+                "endpoint": self.args.endpoint,
+                "target": self.target,
+                "server": self.args.server,
+                "offered_rate_rps": self.args.rate,
+                "requests": self.total_requests,
+                "acknowledged": len(self.ack_latencies),
+                "completed": completed,
+                "missing_replies": missing,
+                "errors": self.errors,
+                "sending_time_s": round(sending_time, 2),
+                "throughput_rps": round(completed / wall_time, 2),
+                "ack_latency_ms": percentiles(self.ack_latencies),
+                "e2e_latency_ms": percentiles(self.e2e_latencies),
+                "llm_requests": self.llm.requests,
+                "llm_delay_s": self.args.llm_delay,
+                "redis": "fake" if self.redis else "in-memory"
+            }
+        finally:
+            self.stop()
+
+
+def print_report(results: Dict[str, Any]):
+    print(f"\n📊 Load test: {results['endpoint']} @ {results['offered_rate_rps']} req/s against {results['target']} ({results['server']})")
+    print("=" * 60)
+    print(f"Requests:     {results['requests']} sent, {results['acknowledged']} acknowledged, "
+          f"{results['completed']} completed, {results['missing_replies']} missing")
+    print(f"Throughput:   {results['throughput_rps']} replies/s")
+    print(f"LLM calls:    {results['llm_requests']} (fake delay {results['llm_delay_s']}s)")
+    for label, key in (("Ack latency", "ack_latency_ms"), ("End-to-end", "e2e_latency_ms")):
+        stats = results[key]
+        print(f"{label + ':':<13} p50={stats['p50']}ms p95={stats['p95']}ms p99={stats['p99']}ms max={stats['max']}ms")
+    if results['errors']:
+        print(f"Errors:       {results['errors']}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test for the CityChai bot")
+    parser.add_argument("--endpoint", choices=["webhook", "test", "mixed"], default="webhook")
+    parser.add_argument("--rate", type=float, default=10.0, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load (ignored with --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max in-flight client requests")
+    parser.add_argument("--users", type=int, default=0, help="Distinct senders (default: one per request)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request HTTP timeout")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="Seconds to wait for webhook replies")
+
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="Fake LLM response time in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-token-delay", type=float, default=0.0, help="Delay between streamed tokens")
+    parser.add_argument("--streaming", action="store_true", help="Run the server with LLM_STREAMING enabled; end-to-end then measures the first segment (keep one message per user)")
+    parser.add_argument("--llm-port", type=int, default=0)
+    parser.add_argument("--twilio-port", type=int, default=0)
+    parser.add_argument("--redis", action="store_true", help="Use the fake Redis server instead of in-memory cache")
+    parser.add_argument("--redis-port", type=int, default=0)
+
+    parser.add_argument("--target", help="Use an already running server instead of starting one")
+    parser.add_argument("--server", choices=["flask", "asgi"], default="flask", help="Serving mode for the spawned server")
+    parser.add_argument("--server-port", type=int, default=5055)
+    parser.add_argument("--server-workers", type=int, default=8, help="WORKER_POOL_SIZE for the spawned server")
+    parser.add_argument("--server-log", help="Write the spawned server's output to this file")
+    parser.add_argument("--server-log-level", default="WARNING")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--json-out", help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results = LoadTest(args).run()
+    print_report(results)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
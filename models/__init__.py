@@ -1,5 +1,17 @@
-from .llm_agent import LocalGuideAgent
-from .language_detector import QuickLanguageDetector
-from .mood_analyzer import MoodAnalyzer
+import importlib
 
-__all__ = ['LocalGuideAgent', 'QuickLanguageDetector', 'MoodAnalyzer']
+# Loaded on first attribute access, like services/
+_MODELS = {
+    'LocalGuideAgent': '.llm_agent',
+    'QuickLanguageDetector': '.language_detector',
+    'MoodAnalyzer': '.mood_analyzer',
+    'ConversationMemory': '.conversation_memory'
+}
+
+__all__ = list(_MODELS)
+
+
+def __getattr__(name):
+    if name in _MODELS:
+        return getattr(importlib.import_module(_MODELS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Dict, List, Set
+
+from config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.singleflight import SingleFlight
+from utils.tracing import run_blocking
+from utils.token_estimator import estimate_message_tokens, estimate_tokens, truncate_to_tokens
+
+logger = get_logger(__name__)
+
+HISTORY_TOKENS = metrics.histogram(
+    "prompt_history_tokens", "Estimated tokens of summary plus history sent with each LLM call",
+    buckets=(50, 100, 200, 400, 600, 800, 1200, 1600, 2400)
+)
+COMPACTIONS = metrics.counter(
+    "conversation_compactions_total", "Background folds of older turns into the running summary, by outcome"
+)
+
+
+class ConversationMemory:
+    """Bounded conversation context: a running summary plus the last few turns verbatim.
+
+    ``prompt_history`` builds what goes to the LLM within a token budget.
+    ``schedule_compaction`` folds turns that have slid out of the verbatim
+    window into the summary, as a background task after the reply is sent.
+    """
+
+    def __init__(self, cache_service, llm_agent):
+        self.cache_service = cache_service
+        self.llm_agent = llm_agent
+        self.enabled = Config.CONVERSATION_MEMORY_ENABLED
+        self.recent_messages = Config.MEMORY_RECENT_TURNS * 2  # a turn is the user message plus the reply
+        self.token_budget = Config.CONVERSATION_TOKEN_BUDGET
+        self.summary_max_tokens = Config.MEMORY_SUMMARY_MAX_TOKENS
+        self._compactions = SingleFlight("memory_compaction")
+        self._tasks: Set[asyncio.Task] = set()
+
+    def prompt_history(self, user_id: str, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Summary message plus the newest turns that fit in the token budget, oldest first."""
+        if not self.enabled:
+            return history
+
+        summary = self.cache_service.get_conversation_summary(user_id) or {}
+        covered_until = summary.get('covered_until') or ''
+        budget = self.token_budget
+
+        summary_message = None
+        if summary.get('text'):
+            text = truncate_to_tokens(summary['text'], min(self.summary_max_tokens, budget // 2))
+            summary_message = {"role": "system", "content": f"Earlier in this conversation: {text}"}
+            budget -= estimate_message_tokens([summary_message])
+
+        # Newest first: the recent window, then older turns the summary doesn't cover yet
+        recent = history[-self.recent_messages:] if self.recent_messages else []
+        uncovered = [msg for msg in history[:len(history) - len(recent)]
+                     if (msg.get('timestamp') or '') > covered_until]
+
+        # The agent only sends its last max_history_messages, summary included
+        max_messages = self.llm_agent.max_history_messages - (1 if summary_message else 0)
+        kept = []
+        for msg in reversed(uncovered + recent):
+            cost = estimate_message_tokens([msg])
+            if cost > budget or len(kept) >= max_messages:
+                break
+            kept.append(msg)
+            budget -= cost
+        kept.reverse()
+
+        result = ([summary_message] if summary_message else []) + kept
+        HISTORY_TOKENS.observe(estimate_message_tokens(result))
+        return result
+
+    def schedule_compaction(self, user_id: str):
+        """Fold older turns into the summary in the background; never delays the reply."""
+        if not self.enabled:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._compactions.do(user_id, lambda: self.compact(user_id)))
+        # Keep a reference until it finishes so the task isn't garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def compact(self, user_id: str) -> bool:
+        """Summarize turns older than the verbatim window; True if the summary changed."""
+        try:
+            # Redis reads and writes here are blocking - keep them off the event loop
+            history = await run_blocking(self.cache_service.get_conversation, user_id)
+            older = history[:len(history) - self.recent_messages] if self.recent_messages else history
+
+            summary = await run_blocking(self.cache_service.get_conversation_summary, user_id) or {}
+            covered_until = summary.get('covered_until') or ''
+            new_messages = [msg for msg in older if (msg.get('timestamp') or '') > covered_until]
+            if len(new_messages) < Config.MEMORY_COMPACT_MIN_MESSAGES:
+                return False
+
+            text = await self.llm_agent.summarize(summary.get('text', ''), new_messages, self.summary_max_tokens)
+            if not text:
+                COMPACTIONS.inc(outcome="skipped")
+                return False
+
+            await run_blocking(lambda: self.cache_service.set_conversation_summary(user_id, {
+                "text": truncate_to_tokens(text, self.summary_max_tokens),
+                "covered_until": new_messages[-1].get('timestamp') or covered_until,
+                "tokens": estimate_tokens(text)
+            }, ttl=Config.SESSION_TIMEOUT))
+            COMPACTIONS.inc(outcome="ok")
+            logger.debug("🧠 Folded %d messages into the conversation summary", len(new_messages))
+            return True
+
+        except Exception as e:
+            COMPACTIONS.inc(outcome="error")
+            logger.error("❌ Conversation compaction error: %s", e)
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "recent_messages": self.recent_messages,
+            "token_budget": self.token_budget,
+            "compactions_running": len(self._tasks)
+        }
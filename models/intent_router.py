@@ -0,0 +1,200 @@
+import random
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from utils.language_registry import get_language_registry
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+ROUTED_INTENTS = metrics.counter(
+    "intent_router_total", "Messages classified by the intent router, by intent (llm = needs the full pipeline)"
+)
+
+# Whole-message phrases per intent and language. Romanized phrases are under
+# None: they don't tell us the language, so the user's usual one is used.
+TRIVIAL_PHRASES: Dict[str, Dict[Optional[str], List[str]]] = {
+    'greeting': {
+        None: ["hi", "hello", "hey", "hola", "yo", "good morning", "good afternoon", "good evening", "namaste",
+               "namaskar", "namaskaram", "vanakkam", "sat sri akal", "salaam", "assalamualaikum", "adaab",
+               "kem cho", "ram ram"],
+        'hi': ["नमस्ते", "नमस्कार", "हेलो", "हाय", "राम राम", "प्रणाम"],
+        'bn': ["নমস্কার", "হ্যালো", "আদাব"],
+        'ta': ["வணக்கம்", "ஹலோ"],
+        'te': ["నమస్కారం", "నమస్తే", "హలో"],
+        'ml': ["നമസ്കാരം", "ഹലോ"],
+        'kn': ["ನಮಸ್ಕಾರ", "ಹಲೋ"],
+        'gu': ["નમસ્તે", "કેમ છો"],
+        'mr': ["नमस्कार", "नमस्ते"],
+        'pa': ["ਸਤ ਸ੍ਰੀ ਅਕਾਲ", "ਸਤਿ ਸ੍ਰੀ ਅਕਾਲ"],
+        'or': ["ନମସ୍କାର"],
+        'as': ["নমস্কাৰ"],
+        'ur': ["السلام علیکم", "آداب", "ہیلو"]
+    },
+    'thanks': {
+        None: ["thanks", "thank you", "thx", "ty", "thank u", "tysm", "dhanyavad", "dhanyawad", "shukriya",
+               "nandri", "nanri", "nandi", "dhanyavadalu", "dhanyavadagalu", "aabhar"],
+        'hi': ["धन्यवाद", "शुक्रिया"],
+        'bn': ["ধন্যবাদ"],
+        'ta': ["நன்றி"],
+        'te': ["ధన్యవాదాలు", "ధన్యవాదం"],
+        'ml': ["നന്ദി"],
+        'kn': ["ಧನ್ಯವಾದ", "ಧನ್ಯವಾದಗಳು"],
+        'gu': ["આભાર"],
+        'mr': ["धन्यवाद", "आभार"],
+        'pa': ["ਧੰਨਵਾਦ", "ਸ਼ੁਕਰੀਆ"],
+        'or': ["ଧନ୍ୟବାଦ"],
+        'as': ["ধন্যবাদ"],
+        'ur': ["شکریہ"]
+    },
+    'acknowledgement': {
+        None: ["ok", "okay", "k", "kk", "cool", "great", "nice", "got it", "alright", "fine", "awesome",
+               "theek hai", "thik hai", "accha", "acha", "achha", "sari", "sare", "shari"],
+        'hi': ["ठीक है", "अच्छा", "ठीक"],
+        'bn': ["ঠিক আছে", "আচ্ছা"],
+        'ta': ["சரி"],
+        'te': ["సరే"],
+        'ml': ["ശരി"],
+        'kn': ["ಸರಿ"],
+        'gu': ["સારું", "બરાબર"],
+        'mr': ["ठीक आहे", "बरं"],
+        'pa': ["ਠੀਕ ਹੈ"],
+        'or': ["ଠିକ ଅଛି"],
+        'as': ["ঠিক আছে"],
+        'ur': ["ٹھیک ہے", "اچھا"]
+    },
+    'goodbye': {
+        None: ["bye", "goodbye", "bye bye", "see you", "see ya", "good night", "gn", "tata", "alvida",
+               "phir milenge", "khuda hafiz", "aavjo"],
+        'hi': ["अलविदा", "फिर मिलेंगे", "शुभ रात्रि"],
+        'bn': ["বিদায়", "শুভ রাত্রি"],
+        'ta': ["போய் வருகிறேன்", "பிறகு சந்திப்போம்"],
+        'te': ["వెళ్ళొస్తాను", "శుభ రాత్రి"],
+        'ml': ["വിട", "ശുഭരാത്രി"],
+        'kn': ["ಹೋಗಿ ಬರುತ್ತೇನೆ", "ಶುಭ ರಾತ್ರಿ"],
+        'gu': ["આવજો"],
+        'mr': ["पुन्हा भेटू", "शुभ रात्री"],
+        'pa': ["ਅਲਵਿਦਾ", "ਫਿਰ ਮਿਲਾਂਗੇ"],
+        'or': ["ବିଦାୟ"],
+        'as': ["বিদায়"],
+        'ur': ["خدا حافظ", "الوداع"]
+    }
+}
+
+# A story asked for in any supported language (or romanized). Whole words
+# only: "history" and "Kathakali" are not story requests.
+STORY_WORDS = frozenset({
+    "story", "stories", "कहानी", "कहानियां", "कहानियाँ", "कथा", "কাহিনী", "গল্প", "গল্পটা", "கதை", "கதைகள்",
+    "கதையை", "కథ", "కథలు", "കഥ", "കഥകൾ", "ಕಥೆ", "ಕಥೆಗಳು", "વાર્તા", "ਕਹਾਣੀ", "କାହାଣୀ", "کہانی", "کہانیاں",
+    "kahani", "kahaani", "kahaniyan", "golpo", "kathai", "katha"
+})
+
+# Words that may pad a trivial message without changing it: "thanks a lot ji"
+PADDING_WORDS = frozenset({
+    'ji', 'bhai', 'dost', 'dear', 'so', 'much', 'very', 'a', 'lot', 'again', 'there', 'buddy', 'bro', 'all',
+    'citychai', 'bot', 'sir', 'madam', 'friend', 'guys', 'too', 'then', 'for', 'now', 'everyone'
+})
+
+# When a message mixes intents the closing one wins: "ok thanks bye" is a goodbye
+INTENT_PRIORITY = ('goodbye', 'thanks', 'greeting', 'acknowledgement')
+
+# Messages longer than this always get the full pipeline
+MAX_TRIVIAL_WORDS = 6
+
+
+def _normalize(text: str) -> str:
+    """Casefold, drop punctuation and squeeze stretched letters: "Hiii!!" -> "hi"."""
+    text = unicodedata.normalize('NFC', text).casefold()
+    text = ''.join(ch if unicodedata.category(ch)[0] in 'LNM' else ' ' for ch in text)
+    return re.sub(r'(.)\1{2,}', r'\1', ' '.join(text.split()))
+
+
+def is_story_request(message: str) -> bool:
+    return not STORY_WORDS.isdisjoint(_normalize(message).split())
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A message that doesn't need the LLM: what it is and, if its script says so, its language."""
+    name: str
+    language: Optional[str] = None
+
+
+class IntentRouter:
+    """Recognizes greetings, thanks, acknowledgements, goodbyes and emoji-only messages.
+
+    ``classify`` is a few dictionary lookups, so it can run in front of
+    language detection, mood analysis and the LLM; anything it doesn't
+    recognize returns None and takes the full pipeline. Replies come from
+    ``cultural_greetings`` in languages.json and the response templates.
+    """
+
+    def __init__(self, response_templates: Optional[Dict[str, Dict]] = None):
+        self.registry = get_language_registry()
+        self.templates = response_templates or {}
+        self._phrases: Dict[Tuple[str, ...], Tuple[str, Optional[str]]] = {}
+        for intent, by_language in TRIVIAL_PHRASES.items():
+            for language, phrases in by_language.items():
+                for phrase in phrases:
+                    self._phrases.setdefault(tuple(_normalize(phrase).split()), (intent, language))
+        self._longest = max(len(words) for words in self._phrases)
+
+    def classify(self, message: str) -> Optional[Intent]:
+        """The trivial intent of ``message``, or None when it needs the full pipeline."""
+        intent = self._classify(message)
+        ROUTED_INTENTS.inc(intent=intent.name if intent else "llm")
+        return intent
+
+    def _classify(self, message: str) -> Optional[Intent]:
+        if not message or not message.strip():
+            return None
+
+        words = _normalize(message).split()
+        if not words:
+            # Nothing but emoji and punctuation
+            if any(unicodedata.category(ch) == 'So' for ch in message):
+                return Intent('emoji')
+            return None
+        if len(words) > MAX_TRIVIAL_WORDS:
+            return None
+
+        # Cover the whole message with known phrases, longest match first
+        found = []
+        position = 0
+        while position < len(words):
+            for size in range(min(self._longest, len(words) - position), 0, -1):
+                match = self._phrases.get(tuple(words[position:position + size]))
+                if match:
+                    found.append(match)
+                    position += size
+                    break
+            else:
+                if words[position] not in PADDING_WORDS:
+                    return None
+                position += 1
+
+        if not found:
+            return None
+        intents = {intent for intent, _ in found}
+        name = next(intent for intent in INTENT_PRIORITY if intent in intents)
+        language = next((language for _, language in found if language), None)
+        return Intent(name, language)
+
+    def reply(self, intent: Intent, language: str, returning: bool = False) -> str:
+        """Canned reply for ``intent`` in ``language``."""
+        templates = self.templates.get(language, {})
+
+        if intent.name == 'greeting':
+            options = templates.get('greetings', {}).get('returning_user' if returning else 'welcome')
+            return random.choice(options) if options else self.registry.greeting(language, 'casual')
+        if intent.name == 'goodbye':
+            return self.registry.greeting(language, 'farewell')
+        if intent.name == 'thanks':
+            return self.registry.greeting(language, 'thanks_reply')
+
+        # Acknowledgements and emoji: keep the conversation going
+        options = templates.get('interactive_prompts')
+        return random.choice(options) if options else self.registry.greeting(language, 'casual')
@@ -0,0 +1,248 @@
+import glob
+import json
+import math
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from config import Config
+from services.response_cache import normalize_message
+from utils.language_registry import get_language_registry
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+KNOWLEDGE_LOOKUPS = metrics.counter(
+    "knowledge_fast_path_total", "Questions looked up in the local knowledge index, by result (hit, miss)"
+)
+
+# Question words that carry no content; "when", "where" and "how" stay - they say what is asked
+STOPWORDS = frozenset({
+    'what', 'whats', 'which', 'who', 'is', 'are', 'was', 'were', 'be', 'do', 'does', 'did', 'should', 'shall',
+    'of', 'in', 'on', 'at', 'for', 'from', 'with', 'and', 'or', 'it', 'its', 'there', 'my', 'we', 'tell',
+    'about', 'know', 'any', 'some', 'good', 'nice',
+    'का', 'की', 'के', 'है', 'हैं', 'में', 'क्या', 'और', 'से', 'को', 'बताओ', 'बताइए', 'कौन', 'सा'
+})
+
+# Words a question about each kind of fact tends to use, indexed with the fact
+FIELD_KEYWORDS = {
+    'best_time': "best time visit season when weather go month",
+    'famous_for': "famous known sight see attraction visit popular must highlight",
+    'specialties': "known special speciality famous culture food",
+    'altitude': "altitude height elevation high how",
+    'capital': "capital city",
+    'languages': "language languages speak spoken talk",
+    'region': "where located region state part",
+    'famous_cities': "cities city town places visit popular",
+    'located_in': "where located city which",
+    'overview': "like overview describe special"
+}
+
+# BM25 parameters - the usual defaults; facts are one sentence so length barely matters
+K1 = 1.2
+B = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized, lightly stemmed words: "Visiting" and "visit", "sights" and "sight" match."""
+    tokens = []
+    for word in normalize_message(text).split():
+        if word.isascii() and len(word) > 5 and word.endswith('ing'):
+            word = word[:-3]
+        elif word.isascii() and len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+@dataclass(frozen=True)
+class KnowledgeDoc:
+    """One fact about a place, in one language, ready to send as an answer."""
+    place: str
+    kind: str
+    answer: str
+    terms: FrozenSet[str] = field(default_factory=frozenset)
+
+
+class _BM25:
+    """Inverted index with BM25 scoring over one language's facts."""
+
+    def __init__(self, docs: List[KnowledgeDoc], doc_tokens: List[List[str]]):
+        self.docs = docs
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.lengths = [len(tokens) for tokens in doc_tokens]
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 1.0
+        for doc_id, tokens in enumerate(doc_tokens):
+            for term, tf in Counter(tokens).items():
+                self.postings[term].append((doc_id, tf))
+
+        total = len(docs)
+        self.idf = {term: math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+                    for term, posting in self.postings.items()}
+
+    def search(self, terms: List[str]) -> List[Tuple[float, int]]:
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            for doc_id, tf in self.postings.get(term, ()):
+                norm = K1 * (1 - B + B * self.lengths[doc_id] / self.avg_length)
+                scores[doc_id] += self.idf[term] * tf * (K1 + 1) / (tf + norm)
+        return sorted(((score, doc_id) for doc_id, score in scores.items()), reverse=True)
+
+
+class KnowledgeIndex:
+    """Answers short factual questions about places from the bundled data files.
+
+    Facts come from ``data/cities.json`` (best time, sights, altitude,
+    languages...), ``data/cultural_content.json`` and the place lines in
+    ``data/responses/``; each language gets its own BM25 index. A question
+    is only answered when it names a place the facts are about and the best
+    fact covers at least ``KNOWLEDGE_MIN_COVERAGE`` of its other words -
+    anything vaguer goes to the LLM.
+    """
+
+    def __init__(self, data_dir: str = 'data', min_coverage: Optional[float] = None,
+                 max_query_words: Optional[int] = None):
+        self.min_coverage = Config.KNOWLEDGE_MIN_COVERAGE if min_coverage is None else min_coverage
+        self.max_query_words = max_query_words or Config.KNOWLEDGE_MAX_QUERY_WORDS
+        self.hits = 0
+        self.misses = 0
+
+        docs = self._load_docs(data_dir)
+        self._aliases = self._place_aliases({doc.place for _, doc in docs})
+        self.indexes: Dict[str, _BM25] = {}
+        by_language: Dict[str, List[KnowledgeDoc]] = defaultdict(list)
+        for language, doc in docs:
+            by_language[language].append(doc)
+        for language, language_docs in by_language.items():
+            self.indexes[language] = _BM25(language_docs, [self._doc_tokens(doc) for doc in language_docs])
+
+        logger.info("📖 Knowledge index: %d facts in %d languages", len(docs), len(self.indexes))
+
+    def _doc_tokens(self, doc: KnowledgeDoc) -> List[str]:
+        return tokenize(doc.answer) + tokenize(FIELD_KEYWORDS.get(doc.kind, '')) + tokenize(doc.place)
+
+    @staticmethod
+    def _place_aliases(places: set) -> List[Tuple[str, str]]:
+        """Normalized names per place, longest first so "fort kochi" wins over "kochi"."""
+        from utils.location_extractor import LocationExtractor
+
+        aliases = {' '.join(tokenize(place)): place for place in places}
+        for alias, place in LocationExtractor().indian_cities.items():
+            if place in places:
+                aliases.setdefault(' '.join(tokenize(alias)), place)
+        return sorted(((alias, place) for alias, place in aliases.items() if alias), key=lambda item: -len(item[0]))
+
+    def _load_docs(self, data_dir: str) -> List[Tuple[str, KnowledgeDoc]]:
+        docs = []
+
+        def add(language: str, place: str, kind: str, answer: str):
+            doc = KnowledgeDoc(place, kind, answer)
+            docs.append((language, KnowledgeDoc(place, kind, answer, frozenset(self._doc_tokens(doc)))))
+
+        registry = get_language_registry()
+
+        with open(os.path.join(data_dir, 'cities.json'), 'r', encoding='utf-8') as f:
+            cities = json.load(f)
+        states = cities.get('states', {})
+        for group in cities.values():
+            for place, info in group.items():
+                state = info.get('state')
+                if info.get('best_time'):
+                    add('en', place, 'best_time', f"The best time to visit {place} is {info['best_time']}.")
+                elif state in states and states[state].get('best_time'):
+                    add('en', place, 'best_time',
+                        f"{place} is in {state}, where the best time to visit is {states[state]['best_time']}.")
+                if info.get('famous_for'):
+                    add('en', place, 'famous_for', f"{place} is famous for {_join(info['famous_for'])}.")
+                    for sight in info['famous_for']:
+                        add('en', sight, 'located_in', f"{sight} is in {place}" + (f", {state}." if state and state != place else "."))
+                if info.get('specialties'):
+                    add('en', place, 'specialties', f"{place} is known for {_join(info['specialties'])}.")
+                if info.get('altitude'):
+                    add('en', place, 'altitude', f"{place} sits at an altitude of about {info['altitude']}.")
+                if info.get('capital'):
+                    add('en', place, 'capital', f"The capital of {place} is {info['capital']}.")
+                if info.get('famous_cities'):
+                    add('en', place, 'famous_cities', f"Popular places in {place} include {_join(info['famous_cities'])}.")
+                names = [registry.get(code).name for code in info.get('languages', []) if code in registry]
+                if names:
+                    add('en', place, 'languages', f"People in {place} speak {_join(names)}.")
+                where = ', '.join(part for part in (state if state != place else None, info.get('region')) if part)
+                if where:
+                    add('en', place, 'region', f"{place} is in {where}.")
+
+        with open(os.path.join(data_dir, 'cultural_content.json'), 'r', encoding='utf-8') as f:
+            cultural = json.load(f)
+        for key, by_language in cultural.items():
+            place = key.replace('_', ' ').title()
+            for language, content in by_language.items():
+                for kind in ('stories', 'facts'):
+                    for text in content.get(kind, []):
+                        add(language, place, kind, text)
+
+        for path in sorted(glob.glob(os.path.join(data_dir, 'responses', '*_responses.json'))):
+            language = os.path.basename(path).split('_', 1)[0]
+            with open(path, 'r', encoding='utf-8') as f:
+                responses = json.load(f)
+            for key, lines in responses.get('location_specific', {}).items():
+                for text in lines:
+                    add(language, key.replace('_', ' ').title(), 'overview', text)
+
+        return docs
+
+    def _find_place(self, text: str) -> Tuple[Optional[str], str]:
+        """Place named in the normalized ``text`` and the text with it removed."""
+        padded = f" {text} "
+        for alias, place in self._aliases:
+            if f" {alias} " in padded:
+                return place, padded.replace(f" {alias} ", " ", 1).strip()
+        return None, text
+
+    def answer(self, message: str, language: str) -> Optional[str]:
+        """A stored fact answering ``message``, or None when the index isn't confident."""
+        result = self._answer(message, language)
+        if result is None:
+            self.misses += 1
+            KNOWLEDGE_LOOKUPS.inc(result="miss", language=language)
+        else:
+            self.hits += 1
+            KNOWLEDGE_LOOKUPS.inc(result="hit", language=language)
+        return result
+
+    def _answer(self, message: str, language: str) -> Optional[str]:
+        index = self.indexes.get(language)
+        tokens = tokenize(message)
+        if index is None or not tokens or len(tokens) > self.max_query_words:
+            return None
+
+        place, rest = self._find_place(' '.join(tokens))
+        question = [term for term in rest.split() if term not in STOPWORDS]
+        if place is None or not question:
+            return None
+
+        for score, doc_id in index.search(question + tokenize(place)):
+            doc = index.docs[doc_id]
+            if doc.place != place:
+                continue
+            # The best fact about the place must cover most of what was asked
+            coverage = sum(1 for term in question if term in doc.terms) / len(question)
+            if coverage >= self.min_coverage:
+                logger.debug("📖 Knowledge hit (%.2f, coverage %.2f): %s", score, coverage, doc.answer)
+                return doc.answer
+            return None
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "facts": sum(len(index.docs) for index in self.indexes.values()),
+            "languages": len(self.indexes),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def _join(items: List[str]) -> str:
+    items = list(items)
+    return items[0] if len(items) == 1 else f"{', '.join(items[:-1])} and {items[-1]}"
@@ -1,14 +1,16 @@
 import re
-import json
-import os
-from langdetect import detect
 from typing import Tuple, Dict, List, Optional
 
+from utils.language_registry import get_language_registry
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class QuickLanguageDetector:
     def __init__(self):
-        # Load comprehensive language data
-        self.language_data = self._load_language_data()
-        self.supported_languages = list(self.language_data.get('supported_languages', {}).keys())
+        # Shared language registry (languages.json is parsed once per process)
+        self.registry = get_language_registry()
+        self.supported_languages = list(self.registry.codes)
         
         # Enhanced Unicode patterns from languages.json
         self.script_patterns = {}
@@ -16,27 +18,7 @@ class QuickLanguageDetector:
         self.strong_indicators = {}
         
         self._initialize_detection_patterns()
-        print(f"✅ Language detector initialized with {len(self.supported_languages)} languages")
-
-    def _load_language_data(self) -> Dict:
-        """Load comprehensive language data from JSON."""
-        try:
-            lang_file = os.path.join('data', 'languages.json')
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"❌ Failed to load languages.json: {e}")
-            return self._get_fallback_language_data()
-
-    def _get_fallback_language_data(self) -> Dict:
-        """Fallback language data if JSON fails to load."""
-        return {
-            'supported_languages': {
-                'en': {'name': 'English', 'tts_supported': True, 'stt_supported': True},
-                'hi': {'name': 'Hindi', 'tts_supported': True, 'stt_supported': True},
-                'bn': {'name': 'Bengali', 'tts_supported': True, 'stt_supported': True}
-            }
-        }
+        logger.info("✅ Language detector initialized with %d languages", len(self.supported_languages))
 
     def _initialize_detection_patterns(self):
         """Initialize detection patterns from language data."""
@@ -58,19 +40,16 @@ class QuickLanguageDetector:
         }
 
         # Enhanced keyword patterns with sample phrases from languages.json
-        for lang_code, lang_info in self.language_data.get('supported_languages', {}).items():
-            sample_phrases = lang_info.get('sample_phrases', {})
-            
+        for record in self.registry:
             # Extract keywords from sample phrases
             keywords = []
-            for phrase in sample_phrases.values():
-                if isinstance(phrase, str):
-                    # Split into words and add to keywords
-                    words = phrase.split()
-                    keywords.extend([word.strip('.,!?') for word in words if len(word.strip('.,!?')) > 2])
+            for phrase in record.sample_phrases.values():
+                # Split into words and add to keywords
+                words = phrase.split()
+                keywords.extend([word.strip('.,!?') for word in words if len(word.strip('.,!?')) > 2])
             
             if keywords:
-                self.keyword_patterns[lang_code] = keywords
+                self.keyword_patterns[record.code] = keywords
 
         # Strong indicators for high-confidence detection
         self.strong_indicators = {
@@ -94,36 +73,35 @@ class QuickLanguageDetector:
         if not text or not text.strip():
             return ('en', 0.0)
 
-        print(f"🔍 Detecting language for: '{text}'")
-
         # Method 1: Strong indicators check (highest priority)
         strong_result = self._check_strong_indicators(text)
         if strong_result[1] > 0.0:
-            print(f"🎯 Strong indicator detection: {strong_result}")
+            logger.debug("🎯 Strong indicator detection: %s", strong_result)
             return strong_result
 
         # Method 2: Script detection (high priority)
         script_result = self._detect_by_script(text)
-        print(f"📝 Script detection: {script_result}")
+        logger.debug("📝 Script detection: %s", script_result)
         if script_result[1] > 0.2:
             return script_result
 
         # Method 3: Keyword matching from sample phrases (medium priority)
         keyword_result = self._detect_by_keywords(text)
-        print(f"🔑 Keyword detection: {keyword_result}")
+        logger.debug("🔑 Keyword detection: %s", keyword_result)
         if keyword_result[1] > 0.15:
             return keyword_result
 
         # Method 4: langdetect with corrections (lowest priority)
         try:
+            from langdetect import detect  # deferred: loads its language profiles on import
             detected = detect(text)
-            print(f"🌐 Langdetect result: {detected}")
+            logger.debug("🌐 Langdetect result: %s", detected)
             
             # Fix common misdetections
             if detected in ['nl', 'no', 'da', 'sv', 'de']:
                 # Check if it might be Bengali
                 if re.search(self.script_patterns.get('bn', ''), text):
-                    print(f"🔄 Correcting {detected} -> bn")
+                    logger.debug("🔄 Correcting %s -> bn", detected)
                     return ('bn', 0.8)
             
             # Return langdetect result if it's a supported language
@@ -131,10 +109,10 @@ class QuickLanguageDetector:
                 return (detected, 0.7)
             
         except Exception as e:
-            print(f"❌ Langdetect error: {e}")
+            logger.debug("❌ Langdetect error: %s", e)
 
         # Default to English
-        print("🔄 Defaulting to English")
+        logger.debug("🔄 Defaulting to English")
         return ('en', 0.0)
 
     def _check_strong_indicators(self, text: str) -> Tuple[str, float]:
@@ -197,22 +175,22 @@ class QuickLanguageDetector:
 
     def get_language_info(self, lang_code: str) -> Dict:
         """Get comprehensive language information."""
-        return self.language_data.get('supported_languages', {}).get(lang_code, {})
+        return dict(self.registry.languages.get(lang_code, {}))
 
     def is_voice_supported(self, lang_code: str) -> bool:
         """Check if voice (TTS/STT) is supported for language."""
-        lang_info = self.get_language_info(lang_code)
-        return lang_info.get('tts_supported', False) and lang_info.get('stt_supported', False)
+        record = self.registry.get(lang_code)
+        return bool(record and record.voice_available)
 
     def get_language_name(self, code: str) -> str:
         """Get full language name from code."""
-        lang_info = self.get_language_info(code)
-        return lang_info.get('name', 'English')
+        record = self.registry.get(code)
+        return record.name if record else 'English'
 
     def get_native_name(self, code: str) -> str:
         """Get native language name."""
-        lang_info = self.get_language_info(code)
-        return lang_info.get('native_name', 'English')
+        record = self.registry.get(code)
+        return record.native_name if record else 'English'
 
     def get_supported_languages(self) -> List[str]:
         """Get list of supported language codes."""
@@ -220,5 +198,4 @@ class QuickLanguageDetector:
 
     def get_greeting(self, lang_code: str, style: str = 'formal') -> str:
         """Get culturally appropriate greeting."""
-        greetings = self.language_data.get('cultural_greetings', {}).get(style, {})
-        return greetings.get(lang_code, greetings.get('en', 'Welcome!'))
+        return self.registry.greeting(lang_code, style)
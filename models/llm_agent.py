@@ -1,261 +1,544 @@
-import os
 import asyncio
-import requests
+import os
+import time
+import httpx
 import json
 import random
-from typing import Dict, List
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from services.http_client import HTTPClientPool
+from services.rate_limiter import RateLimiter, RateLimitedError
+from services.response_cache import ResponseCache
+from services.usage_tracker import UsageTracker
+from models.model_router import ModelRouter
+from models.prompt_templates import PromptTemplates
+from models.provider_health import CircuitBreaker, CircuitOpenError, ProviderLatencyTracker
+from utils.metrics import metrics
+from utils.sentence_splitter import SentenceChunker
+from utils.singleflight import SingleFlight
+from utils.token_estimator import estimate_message_tokens, estimate_tokens
+from utils.tracing import span
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HEDGED_REQUESTS = metrics.counter(
+    "llm_hedged_requests_total", "LLM calls that were hedged with the backup provider, by which one answered"
+)
+FIRST_TOKEN_LATENCY = metrics.histogram(
+    "llm_first_token_seconds", "Time from sending a streaming request to its first token"
+)
 
 class LocalGuideAgent:
     def __init__(self):
         self.max_tokens = 300  # Increased for richer responses
         self.temperature = 0.9  # Higher creativity
+        self.max_history_messages = 6  # More history for better context
         self.working_provider = None
         self.groq_api_key = None
         self.openai_api_key = None
+        self.groq_api_url = Config.GROQ_API_URL
+        self.openai_api_url = Config.OPENAI_API_URL
+
+        # Keep-alive connections per provider, so replies skip DNS/TCP/TLS setup
+        self.http_clients = HTTPClientPool()
+
+        # Repeat questions (same intent, language and location) skip the provider
+        self.response_cache = ResponseCache()
+        # ...and identical ones arriving at the same time wait for one call
+        self.in_flight = SingleFlight("llm_prompt")
 
         # Initialize APIs
         if os.getenv('GROQ_API_KEY'):
             self.groq_api_key = os.getenv('GROQ_API_KEY').strip()
             self.working_provider = 'groq'
-            print(f"✅ Groq API key loaded: {self.groq_api_key[:10]}...")
+            logger.info("✅ Groq API key loaded")
         
         if os.getenv('OPENAI_API_KEY'):
             self.openai_api_key = os.getenv('OPENAI_API_KEY').strip()
             if not self.working_provider:
                 self.working_provider = 'openai'
-            print(f"✅ OpenAI API key loaded: {self.openai_api_key[:10]}...")
+            logger.info("✅ OpenAI API key loaded")
         
         if not self.working_provider:
             raise Exception("❌ NO LLM API KEYS FOUND! Cannot operate without LLM.")
 
+        # working_provider is re-ranked by recent latency on every call
+        self.default_provider = self.working_provider
+        self.latency = ProviderLatencyTracker()
+        self.breakers = {
+            name: CircuitBreaker(name)
+            for name, key in (('groq', self.groq_api_key), ('openai', self.openai_api_key)) if key
+        }
+
+        # GROQ_RATE_LIMIT / OPENAI_RATE_LIMIT, shared by every worker process through Redis
+        self.rate_limiter = RateLimiter()
+
+        # Tokens, cost and latency of every provider call
+        self.usage = UsageTracker()
+
+        # Small or large model, and the reply budget, per message
+        self.model_router = ModelRouter(self.max_tokens)
+
+        # Per-language system prompts, compiled once
+        self.prompts = PromptTemplates()
+
+    async def warm_up(self) -> int:
+        """Open pooled connections to each configured provider; returns how many were reached."""
+        reached = 0
+        for name, url, api_key in (('groq', self.groq_api_url, self.groq_api_key),
+                                   ('openai', self.openai_api_url, self.openai_api_key)):
+            if not api_key:
+                continue
+            try:
+                # Any response will do - the point is the open connection left in the pool
+                models_url = url.rsplit('/chat/completions', 1)[0] + '/models'
+                await self.http_clients.get(name).get(models_url, headers={"Authorization": f"Bearer {api_key}"}, timeout=5)
+                reached += 1
+            except httpx.HTTPError as e:
+                logger.warning("⚠️ Could not reach %s during warm-up: %s", name, e)
+        return reached
+
     async def get_response(self, user_message: str, conversation_history: List[Dict], user_context: Dict) -> str:
-        """ALWAYS generate dynamic LLM response - NO FALLBACKS ALLOWED."""
+        """ALWAYS generate dynamic LLM response - NO FALLBACKS ALLOWED.
+
+        Repeat first-turn questions are answered from the response cache; only
+        real provider replies are cached, never the emergency response, and
+        never follow-ups, whose meaning depends on the history. Identical
+        first-turn questions that arrive together share a single provider call.
+        """
+
+        cache_key = self.response_cache.key_for(user_message, user_context, conversation_history)
+        cached = self.response_cache.get(cache_key)
+        if cached:
+            logger.debug("⚡ Response cache hit: '%.50s'", user_message)
+            return cached
+
+        flight_key = None if conversation_history else ResponseCache.intent_key(user_message, user_context)
+        if flight_key is None:
+            return await self._generate_response(user_message, conversation_history, user_context, cache_key)
+
+        return await self.in_flight.do(
+            flight_key, lambda: self._generate_response(user_message, conversation_history, user_context, cache_key)
+        )
+
+    async def generate_fresh(self, user_message: str, user_context: Dict) -> Optional[str]:
+        """A new first-turn provider reply, skipping the response cache; None if every provider failed.
+
+        For batch jobs that want distinct variants and must never store the
+        emergency response.
+        """
+        return await self._get_provider_response(user_message, [], user_context)
+
+    async def _generate_response(self, user_message: str, conversation_history: List[Dict], user_context: Dict,
+                                 cache_key: Optional[Tuple[str, str, str]]) -> str:
+        response = await self._get_provider_response(user_message, conversation_history, user_context)
+        if response is None:
+            # ABSOLUTE LAST RESORT - Simple generative response
+            return self._generate_emergency_response(user_message, user_context)
+
+        self.response_cache.put(cache_key, response)
+        return response
+
+    async def _get_provider_response(self, user_message: str, conversation_history: List[Dict],
+                                     user_context: Dict) -> Optional[str]:
+        """Fastest provider first, then the backup (hedged if enabled); None if both failed."""
 
         detected_lang = user_context.get('detected_language', 'en')
-        print(f"🔄 MANDATORY LLM call for {detected_lang}: '{user_message[:50]}...'")
+        logger.debug("🔄 MANDATORY LLM call for %s: '%.50s'", detected_lang, user_message)
+        self.model_router.record(self.model_router.route(user_message, user_context), detected_lang)
+
+        providers = self._provider_order()
+        if Config.LLM_HEDGING_ENABLED and len(providers) > 1:
+            return await self._hedged_call(providers, user_message, user_context, conversation_history)
+
+        for attempt, provider in enumerate(providers):
+            if attempt:
+                logger.info("🔄 Trying %s as backup...", provider)
+            # Out of budget: spill over to the next provider, only the last one queues
+            max_wait = None if attempt == len(providers) - 1 else 0
+            try:
+                response = await self._call_provider(
+                    provider, user_message, user_context, conversation_history, max_wait, attempt + 1
+                )
+                logger.debug("✅ %s SUCCESS: %.100s", provider.upper(), response)
+                return response
+            except Exception as e:
+                if attempt:
+                    logger.error("❌ Backup LLM failed: %s", e)
+                else:
+                    logger.warning("❌ Primary LLM failed: %s", e)
+
+        return None
+
+    def _provider_order(self) -> List[str]:
+        """Providers whose circuit lets calls through, fastest by recent latency first.
+
+        ``working_provider`` follows the ranking so /health shows who is primary now.
+        Empty when every circuit is open - the caller answers without waiting on a dead provider.
+        """
+        configured = [name for name, breaker in self.breakers.items() if breaker.available]
+        # The provider picked at startup wins ties while there's no latency data yet
+        configured.sort(key=lambda name: name != self.default_provider)
+
+        providers = self.latency.rank(configured)
+        if providers and providers[0] != self.working_provider:
+            logger.info("🔀 Primary LLM provider is now %s", providers[0])
+            self.working_provider = providers[0]
+        elif not providers:
+            logger.warning("⚠️ All LLM provider circuits are open")
+        return providers
+
+    def provider_status(self) -> Dict[str, Dict]:
+        """Circuit state and recent latency per provider, for /health."""
+        latency = self.latency.stats()
+        return {
+            name: {
+                "primary": name == self.working_provider,
+                "circuit": breaker.stats(),
+                "latency": latency.get(name)
+            }
+            for name, breaker in self.breakers.items()
+        }
 
-        # Try primary LLM provider
+    async def _call_provider(self, provider: str, user_message: str, user_context: Dict,
+                             conversation_history: List[Dict], max_wait: Optional[float] = None, attempt: int = 1) -> str:
+        """One reply from ``provider``, through its circuit breaker and rate limiter."""
+        call = self._call_groq if provider == 'groq' else self._call_openai
+        route = self.model_router.route(user_message, user_context)
+        return await self._guarded_call(
+            provider, lambda: call(user_message, user_context, conversation_history, attempt),
+            self._estimate_tokens(user_message, user_context, conversation_history, route.max_tokens), max_wait
+        )
+
+    async def _guarded_call(self, provider: str, make_call: Callable[[], Awaitable[str]], tokens: int,
+                            max_wait: Optional[float] = None, track_latency: bool = True) -> str:
+        """Run ``make_call`` if the breaker and rate limiter allow it, recording latency and outcome."""
+        breaker = self.breakers[provider]
+        if not breaker.try_acquire():
+            raise CircuitOpenError(f"{provider} circuit is open")
+
+        if not await self.rate_limiter.acquire(provider, tokens, max_wait):
+            breaker.release()
+            raise RateLimitedError(f"{provider} rate limit reached")
+
+        started_at = time.perf_counter()
         try:
-            if self.working_provider == 'groq':
-                response = await self._call_groq(user_message, user_context, conversation_history)
-                print(f"✅ GROQ SUCCESS: {response[:100]}...")
-                return response
-            elif self.working_provider == 'openai':
-                response = await self._call_openai(user_message, user_context, conversation_history)
-                print(f"✅ OPENAI SUCCESS: {response[:100]}...")
-                return response
+            response = await make_call()
+        except asyncio.CancelledError:
+            # Lost a hedge race - says nothing about how long it would have taken
+            breaker.release()
+            raise
         except Exception as e:
-            print(f"❌ Primary LLM failed: {e}")
+            if track_latency:
+                self.latency.record(provider, time.perf_counter() - started_at, ok=False)
+            breaker.record_failure(str(e) or type(e).__name__)
+            raise
+
+        elapsed = time.perf_counter() - started_at
+        if track_latency:
+            self.latency.record(provider, elapsed)
+        breaker.record_success(elapsed)
+        return response
+
+    async def summarize(self, previous_summary: str, messages: List[Dict], max_tokens: int) -> Optional[str]:
+        """Fold ``messages`` into ``previous_summary``; None if no provider could do it right now.
+
+        Background work: it never queues for rate-limit budget and its (short)
+        calls stay out of the latency ranking.
+        """
+        transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages if msg.get('content'))
+        prompt = [
+            {"role": "system", "content": (
+                "You keep a running summary of a WhatsApp chat between a traveller and CityChai, an Indian "
+                "travel guide. Merge the new messages into the summary. Keep places, plans, preferences, "
+                "mood and the language the traveller uses; drop greetings and small talk. Write it in "
+                f"English, in at most {max_tokens * 3 // 4} words, as plain sentences."
+            )},
+            {"role": "user", "content": f"Summary so far:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"}
+        ]
+        tokens = estimate_message_tokens(prompt) + max_tokens
+
+        for provider in self._provider_order():
+            try:
+                return await self._guarded_call(
+                    provider, lambda provider=provider: self._post_chat(provider, prompt, max_tokens, purpose="summary"),
+                    tokens, max_wait=0, track_latency=False
+                )
+            except Exception as e:
+                logger.warning("⚠️ %s could not summarize conversation: %s", provider, e)
+        return None
+
+    async def _hedged_call(self, providers: List[str], user_message: str, user_context: Dict,
+                           conversation_history: List[Dict]) -> Optional[str]:
+        """Give the primary its p95; if it hasn't answered by then, race the backup too.
+
+        The first successful reply wins and the other request is cancelled.
+        """
+        primary, backup = providers[0], providers[1]
+        delay = self.latency.hedge_delay(primary)
+        tasks = {
+            asyncio.create_task(self._call_provider(primary, user_message, user_context, conversation_history, 0)): primary
+        }
+        pending = set(tasks)
 
-        # Try backup provider if available
         try:
-            if self.working_provider == 'groq' and self.openai_api_key:
-                print("🔄 Trying OpenAI as backup...")
-                response = await self._call_openai(user_message, user_context, conversation_history)
-                return response
-            elif self.working_provider == 'openai' and self.groq_api_key:
-                print("🔄 Trying Groq as backup...")
-                response = await self._call_groq(user_message, user_context, conversation_history)
-                return response
-        except Exception as e:
-            print(f"❌ Backup LLM failed: {e}")
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1:
+                            HEDGED_REQUESTS.inc(winner="primary" if tasks[task] == primary else "backup")
+                        return task.result()
+                    logger.warning("❌ %s LLM call failed: %s", tasks[task], task.exception())
+
+                if len(tasks) == 1:
+                    # Primary is slow (or already failed) - bring in the backup
+                    logger.info("🔄 No reply from %s within %.2fs, hedging with %s", primary, delay, backup)
+                    backup_task = asyncio.create_task(
+                        self._call_provider(backup, user_message, user_context, conversation_history, attempt=2)
+                    )
+                    tasks[backup_task] = backup
+                    pending.add(backup_task)
+
+                if not pending:
+                    return None
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call_groq(self, user_message: str, user_context: Dict, conversation_history: List[Dict],
+                          attempt: int = 1) -> str:
+        """Enhanced Groq API call with aggressive prompting."""
 
-        # ABSOLUTE LAST RESORT - Simple generative response
-        return self._generate_emergency_response(user_message, user_context)
+        messages = self._build_conversation_messages(user_message, user_context, conversation_history)
+        route = self.model_router.route(user_message, user_context)
+        return await self._post_chat('groq', messages, route.max_tokens, language=user_context.get('detected_language'),
+                                     tier=route.tier, attempt=attempt)
 
-    async def _call_groq(self, user_message: str, user_context: Dict, conversation_history: List[Dict]) -> str:
-        """Enhanced Groq API call with aggressive prompting."""
+    async def _call_openai(self, user_message: str, user_context: Dict, conversation_history: List[Dict],
+                            attempt: int = 1) -> str:
+        """Enhanced OpenAI API call with aggressive prompting."""
 
-        url = "https://api.groq.com/openai/v1/chat/completions"
+        messages = self._build_conversation_messages(user_message, user_context, conversation_history)
+        route = self.model_router.route(user_message, user_context)
+        return await self._post_chat('openai', messages, route.max_tokens, language=user_context.get('detected_language'),
+                                     tier=route.tier, attempt=attempt)
+
+    async def _post_chat(self, provider: str, messages: List[Dict], max_tokens: Optional[int] = None,
+                         language: Optional[str] = None, purpose: str = "reply", tier: str = 'small',
+                         attempt: int = 1) -> str:
+        """POST a chat completion to ``provider`` and return the reply text; usage is recorded either way.
+
+        ``attempt`` is 1 for the first provider tried for a reply, 2 for the backup - it goes into the usage log.
+        """
+        url = self.groq_api_url if provider == 'groq' else self.openai_api_url
+        api_key = self.groq_api_key if provider == 'groq' else self.openai_api_key
         headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
 
-        messages = self._build_conversation_messages(user_message, user_context, conversation_history)
+        payload = self._build_payload(provider, messages, tier=tier)
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        usage = dict(provider=provider, model=payload["model"], purpose=purpose, language=language, attempt=attempt)
 
-        payload = {
-            "model": "llama3-8b-8192",
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "top_p": 0.95,
-            "stream": False
-        }
-
-        def send_request():
-            return requests.post(url, headers=headers, json=payload, proxies={}, timeout=30)
+        started_at = time.perf_counter()
+        try:
+            with span(f"llm.{provider}"):
+                response = await self.http_clients.get(provider).post(url, headers=headers, json=payload)
+        except httpx.HTTPError:
+            self.usage.record(latency=time.perf_counter() - started_at, ok=False, **usage)
+            raise
+        latency = time.perf_counter() - started_at
 
-        response = await asyncio.get_event_loop().run_in_executor(None, send_request)
-        
         if response.status_code == 200:
             data = response.json()
             content = data['choices'][0]['message']['content'].strip()
+            reported = data.get('usage') or {}
+            self.usage.record(
+                latency=latency, status=200,
+                prompt_tokens=reported.get('prompt_tokens') or estimate_message_tokens(messages),
+                completion_tokens=reported.get('completion_tokens') or estimate_tokens(content),
+                estimated=not reported, **usage
+            )
             return content
         else:
-            raise Exception(f"Groq API error {response.status_code}: {response.text[:300]}")
-
-    async def _call_openai(self, user_message: str, user_context: Dict, conversation_history: List[Dict]) -> str:
-        """Enhanced OpenAI API call with aggressive prompting."""
-
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.openai_api_key}",
-            "Content-Type": "application/json"
-        }
-
-        messages = self._build_conversation_messages(user_message, user_context, conversation_history)
+            self.usage.record(latency=latency, ok=False, status=response.status_code, **usage)
+            name = "Groq" if provider == 'groq' else "OpenAI"
+            raise Exception(f"{name} API error {response.status_code}: {response.text[:300]}")
+
+    def _build_payload(self, provider: str, messages: List[Dict], stream: bool = False, tier: str = 'small') -> Dict:
+        model = self.model_router.model(provider, tier)
+        if provider == 'groq':
+            return {
+                "model": model,
+                "messages": messages,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "top_p": 0.95,
+                "stream": stream
+            }
 
         payload = {
-            "model": "gpt-3.5-turbo",
+            "model": model,
             "messages": messages,
             "max_tokens": self.max_tokens,
             "temperature": self.temperature
         }
+        if stream:
+            payload["stream"] = True
+            # Without this OpenAI never reports usage on a stream
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    async def stream_response(self, user_message: str, conversation_history: List[Dict],
+                              user_context: Dict) -> AsyncIterator[str]:
+        """Stream the reply as complete sentence segments, with the same failover as get_response.
+
+        A provider that fails before its first segment is replaced by the backup.
+        Once text has been yielded it can't be taken back, so a mid-stream
+        failure just ends the reply early. Cache hits are served as segments
+        too; only replies that streamed through completely are cached.
+        """
+        cache_key = self.response_cache.key_for(user_message, user_context, conversation_history)
+        cached = self.response_cache.get(cache_key)
+        if cached:
+            chunker = SentenceChunker(Config.STREAM_MIN_SEGMENT_CHARS)
+            for segment in chunker.feed(cached):
+                yield segment
+            remainder = chunker.flush()
+            if remainder:
+                yield remainder
+            return
+
+        route = self.model_router.route(user_message, user_context)
+        self.model_router.record(route, user_context.get('detected_language'))
+
+        providers = self._provider_order()
+        for attempt, provider in enumerate(providers):
+            breaker = self.breakers[provider]
+            if not breaker.try_acquire():
+                continue
+            max_wait = None if attempt == len(providers) - 1 else 0
+            tokens = self._estimate_tokens(user_message, user_context, conversation_history, route.max_tokens)
+            if not await self.rate_limiter.acquire(provider, tokens, max_wait):
+                breaker.release()
+                logger.warning("⏳ %s rate limit reached, not streaming from it", provider)
+                continue
+
+            segments = []
+            started_at = time.perf_counter()
+            first_segment_seconds = None
+            try:
+                async for segment in self._stream_provider(provider, user_message, user_context, conversation_history,
+                                                           attempt + 1):
+                    if first_segment_seconds is None:
+                        first_segment_seconds = time.perf_counter() - started_at
+                    segments.append(segment)
+                    yield segment
+            except (GeneratorExit, asyncio.CancelledError):
+                # Consumer went away mid-reply; nothing learned about the provider
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure(str(e) or type(e).__name__)
+                if segments:
+                    logger.error("❌ %s stream broke mid-reply: %s %s", provider, type(e).__name__, e)
+                    return
+                logger.warning("❌ %s streaming failed: %s", provider, e)
+                continue
+
+            # A stream is judged on how soon it started talking, not on its total length
+            breaker.record_success(first_segment_seconds or time.perf_counter() - started_at)
+            self.response_cache.put(cache_key, " ".join(segments))
+            return
 
-        def send_request():
-            return requests.post(url, headers=headers, json=payload, proxies={}, timeout=30)
-
-        response = await asyncio.get_event_loop().run_in_executor(None, send_request)
-
-        if response.status_code == 200:
-            data = response.json()
-            content = data['choices'][0]['message']['content'].strip()
-            return content
-        else:
-            raise Exception(f"OpenAI API error {response.status_code}: {response.text[:300]}")
+        # ABSOLUTE LAST RESORT - Simple generative response
+        yield self._generate_emergency_response(user_message, user_context)
 
-    def _build_conversation_messages(self, user_message: str, user_context: Dict, conversation_history: List[Dict]) -> List[Dict]:
-        """Build ultra-strong conversation messages."""
-        
-        system_prompt = self._build_ultimate_system_prompt(user_context, user_message)
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Add conversation history with context
-        for msg in conversation_history[-6:]:  # More history for better context
-            if msg.get('role') and msg.get('content'):
-                messages.append({
-                    "role": msg['role'],
-                    "content": msg['content']
-                })
-        
-        messages.append({"role": "user", "content": user_message})
-        return messages
+    async def _stream_provider(self, provider: str, user_message: str, user_context: Dict,
+                               conversation_history: List[Dict], attempt: int = 1) -> AsyncIterator[str]:
+        """Consume one provider's server-sent events, cutting the tokens into sentences."""
+        url = self.groq_api_url if provider == 'groq' else self.openai_api_url
+        api_key = self.groq_api_key if provider == 'groq' else self.openai_api_key
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
 
-    def _build_ultimate_system_prompt(self, user_context: Dict, user_message: str) -> str:
-        """Build the most aggressive, dynamic system prompt possible."""
+        messages = self._build_conversation_messages(user_message, user_context, conversation_history)
+        route = self.model_router.route(user_message, user_context)
+        payload = self._build_payload(provider, messages, stream=True, tier=route.tier)
+        payload["max_tokens"] = route.max_tokens
+        chunker = SentenceChunker(Config.STREAM_MIN_SEGMENT_CHARS)
+
+        usage = dict(provider=provider, model=payload["model"], purpose="stream",
+                     language=user_context.get('detected_language'), attempt=attempt)
+        completion = []
+        reported = {}
+        status = None
+        started_at = time.perf_counter()
 
-        language_code = user_context.get('detected_language', 'en')
-        location = user_context.get('current_location', 'India')
-        mood = user_context.get('mood', 'curious')
-        conversation_turns = user_context.get('conversation_turns', 1)
-        wants_voice = user_context.get('wants_voice_response', False)
-
-        # Ultra-dynamic language rules
-        language_rules = {
-            'en': {
-                'name': 'English',
-                'rule': 'RESPOND ONLY IN ENGLISH',
-                'greeting': 'Welcome to incredible India!',
-                'example': 'The Red Fort is magnificent! Built by Shah Jahan in 1648, it housed Mughal emperors.'
-            },
-            'hi': {
-                'name': 'Hindi',
-                'rule': 'केवल हिंदी में जवाब दें - ABSOLUTELY NO ENGLISH',
-                'greeting': 'अविश्वसनीय भारत में आपका स्वागत है!',
-                'example': 'लाल किला शानदार है! शाहजहाँ ने 1648 में बनवाया था, यहाँ मुगल सम्राट रहते थे।'
-            },
-            'bn': {
-                'name': 'Bengali',
-                'rule': 'শুধুমাত্র বাংলায় উত্তর দিন - ABSOLUTELY NO ENGLISH',
-                'greeting': 'অবিশ্বাস্য ভারতে আপনাকে স্বাগতম!',
-                'example': 'লাল কেল্লা দুর্দান্ত! শাহজাহান ১৬৪৮ সালে নির্মাণ করেছিলেন, এখানে মুগল সম্রাটরা থাকতেন।'
-            },
-            'ta': {
-                'name': 'Tamil',
-                'rule': 'தமிழில் மட்டுமே பதிலளிக்கவும் - ABSOLUTELY NO ENGLISH',
-                'greeting': 'நம்பமுடியாத இந்தியாவிற்கு வருக!',
-                'example': 'சிவப்பு கோட்டை அற்புதமானது! ஷாஜஹான் 1648-இல் கட்டினார், முகலாய மன்னர்கள் இங்கு வாழ்ந்தனர்।'
-            },
-            'te': {
-                'name': 'Telugu',
-                'rule': 'తెలుగులో మాత్రమే సమాధానం ఇవ్వండి - ABSOLUTELY NO ENGLISH',
-                'greeting': 'అద్భుతమైన భారతదేశానికి స్వాగతం!',
-                'example': 'ఎర్రకోట అద్భుతమైనది! షాజహాన్ 1648లో నిర్మించాడు, మొఘల్ చక్రవర్తులు ఇక్కడ నివసించారు।'
-            },
-            'ml': {
-                'name': 'Malayalam',
-                'rule': 'മലയാളത്തിൽ മാത്രം മറുപടി നൽകുക - ABSOLUTELY NO ENGLISH',
-                'greeting': 'അവിശ്വസനീയമായ ഇന്ത്യയിലേക്ക് സ്വാഗതം!',
-                'example': 'ചുവന്ന കോട്ട അവിശ്വസനീയമാണ്! ഷാജഹാൻ 1648-ൽ നിർമ്മിച്ചു, മുഗൾ ചക്രവർത്തിമാർ ഇവിടെ താമസിച്ചു।'
-            }
-        }
+        try:
+            with span(f"llm.{provider}.stream"):
+                first_token = True
+
+                async with self.http_clients.get(provider).stream("POST", url, headers=headers, json=payload) as response:
+                    status = response.status_code
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode('utf-8', 'replace')
+                        raise Exception(f"{provider} API error {response.status_code}: {body[:300]}")
+
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+
+                        chunk = json.loads(data)
+                        # Groq puts usage on the last chunk under x_groq; OpenAI only with stream_options
+                        reported = chunk.get('usage') or (chunk.get('x_groq') or {}).get('usage') or reported
+                        choices = chunk.get('choices') or [{}]
+                        token = (choices[0].get('delta') or {}).get('content')
+                        if not token:
+                            continue
+
+                        if first_token:
+                            FIRST_TOKEN_LATENCY.observe(time.perf_counter() - started_at, provider=provider)
+                            first_token = False
+
+                        completion.append(token)
+                        for segment in chunker.feed(token):
+                            yield segment
+        except Exception:
+            self.usage.record(latency=time.perf_counter() - started_at, ok=False, status=status, **usage)
+            raise
+
+        self.usage.record(
+            latency=time.perf_counter() - started_at, status=status,
+            prompt_tokens=reported.get('prompt_tokens') or estimate_message_tokens(messages),
+            completion_tokens=reported.get('completion_tokens') or estimate_tokens("".join(completion)),
+            estimated=not reported, **usage
+        )
+
+        remainder = chunker.flush()
+        if remainder:
+            yield remainder
+
+    def _estimate_tokens(self, user_message: str, user_context: Dict, conversation_history: List[Dict],
+                         max_tokens: Optional[int] = None) -> int:
+        """Rough token cost of a call for the tokens-per-minute budget: prompt plus the full completion."""
+        prompt_tokens = self.prompts.estimate(user_message, user_context, conversation_history[-self.max_history_messages:])
+        return prompt_tokens + (max_tokens or self.max_tokens)
 
-        lang_info = language_rules.get(language_code, language_rules['en'])
-
-        # Dynamic context integration
-        context_elements = []
-        if location:
-            context_elements.append(f"Current focus: {location}")
-        if mood != 'curious':
-            context_elements.append(f"User mood: {mood}")
-        if conversation_turns > 1:
-            context_elements.append(f"Conversation turn: {conversation_turns}")
-        if wants_voice:
-            context_elements.append("VOICE RESPONSE REQUESTED - be more narrative and descriptive")
-
-        context_string = " | ".join(context_elements) if context_elements else "Fresh conversation"
-
-        # Voice-specific adjustments
-        voice_instructions = ""
-        if wants_voice:
-            voice_instructions = f"""
-🎤 VOICE RESPONSE MODE ACTIVATED:
-- Be more narrative and storytelling
-- Use descriptive language that sounds good when spoken
-- Add dramatic pauses with punctuation
-- Make it engaging for audio consumption
-- Paint vivid pictures with words
-"""
-
-        # Ultimate dynamic prompt
-        prompt = f"""🌍 You are CityChai, India's most passionate and knowledgeable AI tour guide.
-
-🚨 CRITICAL LANGUAGE RULE 🚨
-{lang_info['rule']}
-USER LANGUAGE: {lang_info['name']}
-YOU MUST RESPOND ONLY IN: {lang_info['name']}
-
-CONTEXT: {context_string}
-
-USER MESSAGE: "{user_message}"
-CONVERSATION TURN: {conversation_turns}
-
-{voice_instructions}
-
-🎯 RESPONSE REQUIREMENTS:
-1. Generate COMPLETELY UNIQUE content - never repeat previous responses
-2. Use ONLY {lang_info['name']} language - NO exceptions
-3. Be conversational, engaging, and passionate about India
-4. Include fascinating cultural details, stories, or insights
-5. Reference location ({location}) and mood ({mood}) naturally
-6. Keep responses 3-4 sentences but rich in content
-7. Use emojis naturally but not excessively
-8. End with an engaging question or suggestion when appropriate
-
-🔥 STYLE GUIDE:
-- Be like a local friend who's deeply passionate about Indian culture
-- Share insider knowledge and hidden gems
-- Tell mini-stories or interesting facts
-- Match the user's energy and interest level
-- Be helpful, informative, and genuinely exciting
-
-EXAMPLE PERFECT RESPONSE:
-{lang_info['example']}
-
-🌟 Remember: This is turn {conversation_turns} of our conversation. Be contextual, dynamic, and absolutely passionate about India! Respond ONLY in {lang_info['name']}!"""
-
-        return prompt.strip()
+    def _build_conversation_messages(self, user_message: str, user_context: Dict, conversation_history: List[Dict]) -> List[Dict]:
+        """Compiled system prompt, recent history, context and the message, within PROMPT_TOKEN_BUDGET."""
+        return self.prompts.build(user_message, user_context, conversation_history[-self.max_history_messages:])
 
     def _generate_emergency_response(self, user_message: str, user_context: Dict) -> str:
         """Last resort generative response if all LLMs fail."""
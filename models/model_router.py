@@ -0,0 +1,96 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config import Config
+from models.intent_router import is_story_request
+from utils.language_registry import get_language_registry
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+MODEL_ROUTES = metrics.counter(
+    "llm_model_routes_total", "Replies routed to each model tier, by the reason the router gave"
+)
+
+# Non-Latin scripts take several times more tokens for the same sentence
+# (see utils/token_estimator), so their replies get a bigger budget
+NON_LATIN_TOKEN_FACTOR = 1.5
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Which model tier answers a message, with what reply budget, and why."""
+    tier: str
+    max_tokens: int
+    reason: str
+
+
+class ModelRouter:
+    """Picks the model tier and ``max_tokens`` for a reply from how demanding the message looks.
+
+    Stories and voice replies, long messages, deep conversations and
+    languages listed in ``ROUTING_LARGE_LANGUAGES`` go to the large tier;
+    everything else gets the small, fast one, and short messages also a
+    shorter reply budget. ``route`` is a pure function of the message and
+    context, so it can be called per provider attempt; ``record`` counts one
+    decision per reply.
+    """
+
+    def __init__(self, default_max_tokens: int):
+        self.enabled = Config.MODEL_ROUTING_ENABLED
+        self.default_max_tokens = default_max_tokens
+        self.models = {
+            'groq': {'small': Config.GROQ_SMALL_MODEL, 'large': Config.GROQ_LARGE_MODEL},
+            'openai': {'small': Config.OPENAI_SMALL_MODEL, 'large': Config.OPENAI_LARGE_MODEL}
+        }
+        self.large_languages = {code.strip() for code in Config.ROUTING_LARGE_LANGUAGES.split(',') if code.strip()}
+        self.registry = get_language_registry()
+        self.decisions: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def model(self, provider: str, tier: str = 'small') -> str:
+        return self.models[provider][tier]
+
+    def route(self, user_message: str, user_context: Dict) -> ModelRoute:
+        if not self.enabled:
+            return ModelRoute('small', self.default_max_tokens, 'disabled')
+
+        words = len(user_message.split())
+        language = user_context.get('detected_language', 'en')
+
+        if user_context.get('wants_voice_response') or is_story_request(user_message):
+            tier, max_tokens, reason = 'large', Config.STORY_MAX_TOKENS, 'story'
+        elif language in self.large_languages:
+            tier, max_tokens, reason = 'large', self.default_max_tokens, 'language'
+        elif words >= Config.ROUTING_LONG_MESSAGE_WORDS:
+            tier, max_tokens, reason = 'large', self.default_max_tokens, 'long_message'
+        elif user_context.get('conversation_turns', 1) >= Config.ROUTING_DEEP_TURN:
+            tier, max_tokens, reason = 'large', self.default_max_tokens, 'deep_conversation'
+        elif words <= Config.ROUTING_SHORT_MESSAGE_WORDS:
+            tier, max_tokens, reason = 'small', Config.SHORT_REPLY_MAX_TOKENS, 'short_message'
+        else:
+            tier, max_tokens, reason = 'small', self.default_max_tokens, 'default'
+
+        record = self.registry.get(language)
+        if record and record.script not in ('Latin', 'Unknown'):
+            max_tokens = int(max_tokens * NON_LATIN_TOKEN_FACTOR)
+        return ModelRoute(tier, max_tokens, reason)
+
+    def record(self, route: ModelRoute, language: Optional[str] = None):
+        MODEL_ROUTES.inc(tier=route.tier, reason=route.reason)
+        with self._lock:
+            self.decisions[f"{route.tier}:{route.reason}"] += 1
+        logger.debug("🧭 Routed %s reply to the %s tier (%s, max_tokens=%d)",
+                     language or "-", route.tier, route.reason, route.max_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decisions = dict(self.decisions)
+        return {
+            "enabled": self.enabled,
+            "models": self.models,
+            "decisions": decisions
+        }
@@ -1,8 +1,11 @@
 import re
 from typing import Dict, List, Tuple
-from textblob import TextBlob
 import json
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class MoodAnalyzer:
     def __init__(self):
         # Multilingual mood keywords
@@ -56,7 +59,7 @@ class MoodAnalyzer:
             'low': ['tired', 'slow', 'calm', 'peaceful', 'rest', 'quiet']
         }
         
-        print("✅ Mood analyzer initialized with multilingual support")
+        logger.info("✅ Mood analyzer initialized with multilingual support")
     
     def analyze_mood(self, text: str, language: str = 'en') -> Dict[str, str]:
         """Analyze user mood from text with language awareness."""
@@ -99,6 +102,7 @@ class MoodAnalyzer:
     def _sentiment_analysis_fallback(self, text: str) -> str:
         """Fallback sentiment analysis using TextBlob."""
         try:
+            from textblob import TextBlob  # deferred: pulls in nltk (~200ms import)
             blob = TextBlob(text)
             polarity = blob.sentiment.polarity
             
@@ -0,0 +1,188 @@
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.token_estimator import MESSAGE_OVERHEAD_TOKENS, estimate_message_tokens, estimate_tokens, truncate_to_tokens
+
+logger = get_logger(__name__)
+
+PROMPT_TOKENS = metrics.histogram(
+    "prompt_tokens_estimated", "Estimated prompt tokens of each reply request, after trimming to the budget",
+    buckets=(400, 600, 800, 1000, 1200, 1600, 2000, 3000)
+)
+PROMPT_TRIMS = metrics.counter(
+    "prompt_trimmed_total", "Reply prompts that went over PROMPT_TOKEN_BUDGET, by the part that was cut"
+)
+
+# Languages without an entry are answered with the English rules
+LANGUAGE_RULES: Dict[str, Dict[str, str]] = {
+    'en': {
+        'name': 'English',
+        'rule': 'RESPOND ONLY IN ENGLISH',
+        'example': 'The Red Fort is magnificent! Built by Shah Jahan in 1648, it housed Mughal emperors.'
+    },
+    'hi': {
+        'name': 'Hindi',
+        'rule': 'केवल हिंदी में जवाब दें - ABSOLUTELY NO ENGLISH',
+        'example': 'लाल किला शानदार है! शाहजहाँ ने 1648 में बनवाया था, यहाँ मुगल सम्राट रहते थे।'
+    },
+    'bn': {
+        'name': 'Bengali',
+        'rule': 'শুধুমাত্র বাংলায় উত্তর দিন - ABSOLUTELY NO ENGLISH',
+        'example': 'লাল কেল্লা দুর্দান্ত! শাহজাহান ১৬৪৮ সালে নির্মাণ করেছিলেন, এখানে মুগল সম্রাটরা থাকতেন।'
+    },
+    'ta': {
+        'name': 'Tamil',
+        'rule': 'தமிழில் மட்டுமே பதிலளிக்கவும் - ABSOLUTELY NO ENGLISH',
+        'example': 'சிவப்பு கோட்டை அற்புதமானது! ஷாஜஹான் 1648-இல் கட்டினார், முகலாய மன்னர்கள் இங்கு வாழ்ந்தனர்।'
+    },
+    'te': {
+        'name': 'Telugu',
+        'rule': 'తెలుగులో మాత్రమే సమాధానం ఇవ్వండి - ABSOLUTELY NO ENGLISH',
+        'example': 'ఎర్రకోట అద్భుతమైనది! షాజహాన్ 1648లో నిర్మించాడు, మొఘల్ చక్రవర్తులు ఇక్కడ నివసించారు।'
+    },
+    'ml': {
+        'name': 'Malayalam',
+        'rule': 'മലയാളത്തിൽ മാത്രം മറുപടി നൽകുക - ABSOLUTELY NO ENGLISH',
+        'example': 'ചുവന്ന കോട്ട അവിശ്വസനീയമാണ്! ഷാജഹാൻ 1648-ൽ നിർമ്മിച്ചു, മുഗൾ ചക്രവർത്തിമാർ ഇവിടെ താമസിച്ചു।'
+    }
+}
+
+# Identical for every request in a language, and sent first, so providers
+# that cache prompt prefixes can reuse it. Nothing per-user goes in here.
+SYSTEM_TEMPLATE = """🌍 You are CityChai, India's most passionate and knowledgeable AI tour guide.
+
+🚨 CRITICAL LANGUAGE RULE 🚨
+{rule}
+USER LANGUAGE: {name}
+YOU MUST RESPOND ONLY IN: {name}
+
+🎯 RESPONSE REQUIREMENTS:
+1. Generate COMPLETELY UNIQUE content - never repeat previous responses
+2. Use ONLY {name} language - NO exceptions
+3. Be conversational, engaging, and passionate about India
+4. Include fascinating cultural details, stories, or insights
+5. Reference the user's location and mood from the CONTEXT note naturally
+6. Keep responses 3-4 sentences but rich in content
+7. Use emojis naturally but not excessively
+8. End with an engaging question or suggestion when appropriate
+
+🔥 STYLE GUIDE:
+- Be like a local friend who's deeply passionate about Indian culture
+- Share insider knowledge and hidden gems
+- Tell mini-stories or interesting facts
+- Match the user's energy and interest level
+- Be helpful, informative, and genuinely exciting
+
+EXAMPLE PERFECT RESPONSE:
+{example}
+
+🌟 Remember: Be contextual, dynamic, and absolutely passionate about India! Respond ONLY in {name}!"""
+
+VOICE_INSTRUCTIONS = """🎤 VOICE RESPONSE MODE ACTIVATED:
+- Be more narrative and storytelling
+- Use descriptive language that sounds good when spoken
+- Add dramatic pauses with punctuation
+- Make it engaging for audio consumption
+- Paint vivid pictures with words"""
+
+# Never cut the user's message below this, whatever the budget says
+MIN_USER_MESSAGE_TOKENS = 64
+
+
+class PromptTemplates:
+    """Reply prompts from per-language system prompts compiled once at startup.
+
+    A request is the static system prompt for its language, the history,
+    a short CONTEXT note (location, mood, turn, voice mode) and the user
+    message - the per-request parts last, so the prefix stays cacheable.
+    ``build`` keeps the whole prompt within ``token_budget``: the oldest
+    history goes first, then the CONTEXT note is cut, then the user message.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = token_budget or Config.PROMPT_TOKEN_BUDGET
+        self.system_messages: Dict[str, Dict[str, str]] = {}
+        self.system_tokens: Dict[str, int] = {}
+        for code, rules in LANGUAGE_RULES.items():
+            message = {"role": "system", "content": SYSTEM_TEMPLATE.format(**rules)}
+            self.system_messages[code] = message
+            self.system_tokens[code] = estimate_message_tokens([message])
+        logger.debug("📝 Compiled system prompts for %d languages", len(self.system_messages))
+
+    def system_message(self, language: str) -> Dict[str, str]:
+        return self.system_messages.get(language) or self.system_messages['en']
+
+    def context_note(self, user_context: Dict) -> str:
+        location = user_context.get('current_location', 'India')
+        mood = user_context.get('mood', 'curious')
+        conversation_turns = user_context.get('conversation_turns', 1)
+
+        context_elements = []
+        if location:
+            context_elements.append(f"Current focus: {location}")
+        if mood != 'curious':
+            context_elements.append(f"User mood: {mood}")
+        if conversation_turns > 1:
+            context_elements.append(f"Conversation turn: {conversation_turns}")
+        note = "CONTEXT: " + (" | ".join(context_elements) if context_elements else "Fresh conversation")
+
+        if user_context.get('wants_voice_response'):
+            note += "\n\n" + VOICE_INSTRUCTIONS
+        return note
+
+    def build(self, user_message: str, user_context: Dict, history: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """System prompt, as much recent history as fits, CONTEXT note and user message."""
+        language = user_context.get('detected_language', 'en')
+        system = self.system_message(language)
+        context = {"role": "system", "content": self.context_note(user_context)}
+        user = {"role": "user", "content": user_message}
+
+        budget = (self.token_budget - self.system_tokens.get(language, self.system_tokens['en'])
+                  - estimate_message_tokens([context, user]))
+
+        # Newest first, until the budget runs out
+        kept = []
+        for msg in reversed(history):
+            if not (msg.get('role') and msg.get('content')):
+                continue
+            cost = estimate_tokens(msg['content']) + MESSAGE_OVERHEAD_TOKENS
+            if cost > budget:
+                PROMPT_TRIMS.inc(part="history")
+                break
+            kept.append({"role": msg['role'], "content": msg['content']})
+            budget -= cost
+        kept.reverse()
+
+        if budget < 0:
+            budget = self._trim(context, budget, 0, "context")
+        if budget < 0:
+            budget = self._trim(user, budget, MIN_USER_MESSAGE_TOKENS, "user_message")
+
+        PROMPT_TOKENS.observe(self.token_budget - budget)
+        return [system] + kept + ([context] if context['content'] else []) + [user]
+
+    def estimate(self, user_message: str, user_context: Dict, history: List[Dict[str, Any]]) -> int:
+        """Prompt tokens ``build`` would send, without building (or counting) it."""
+        language = user_context.get('detected_language', 'en')
+        extra = [{"content": self.context_note(user_context)}, {"content": user_message}]
+        tokens = self.system_tokens.get(language, self.system_tokens['en']) + estimate_message_tokens(history + extra)
+        return min(tokens, self.token_budget)
+
+    @staticmethod
+    def _trim(message: Dict[str, str], budget: int, floor: int, part: str) -> int:
+        """Shorten ``message`` in place by the ``budget`` overrun, to no less than ``floor`` tokens."""
+        tokens = estimate_tokens(message['content'])
+        target = max(floor, tokens + budget)
+        if target >= tokens:
+            return budget
+        message['content'] = truncate_to_tokens(message['content'], target) if target else ""
+        PROMPT_TRIMS.inc(part=part)
+        return budget + tokens - estimate_tokens(message['content'])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "token_budget": self.token_budget,
+            "system_tokens": dict(self.system_tokens)
+        }
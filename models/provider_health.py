@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+BREAKER_TRANSITIONS = metrics.counter(
+    "llm_circuit_transitions_total", "LLM provider circuit breaker state changes"
+)
+
+
+class ProviderLatencyTracker:
+    """Rolling window of recent call latencies per LLM provider.
+
+    A failed call is recorded as if it had taken the full read timeout, so a
+    provider that errors ranks like one that hangs. Providers with fewer than
+    ``min_samples`` results are assumed to take ``prior`` seconds.
+    """
+
+    def __init__(self, window: Optional[int] = None, min_samples: int = 5, prior: Optional[float] = None):
+        self.window = window or Config.LLM_LATENCY_WINDOW
+        self.min_samples = min_samples
+        self.prior = prior or Config.LLM_LATENCY_PRIOR_SECONDS
+        self.failure_penalty = Config.LLM_HTTP_READ_TIMEOUT
+        self._samples: Dict[str, Deque[float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float, ok: bool = True):
+        with self._lock:
+            samples = self._samples.setdefault(provider, deque(maxlen=self.window))
+            samples.append(seconds if ok else max(seconds, self.failure_penalty))
+            if not ok:
+                self._failures[provider] = self._failures.get(provider, 0) + 1
+
+    def _sorted(self, provider: str) -> List[float]:
+        with self._lock:
+            return sorted(self._samples.get(provider, ()))
+
+    def quantile(self, provider: str, q: float) -> Optional[float]:
+        samples = self._sorted(provider)
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def score(self, provider: str) -> float:
+        """Expected latency in seconds - the rolling mean, or the prior while data is thin."""
+        samples = self._sorted(provider)
+        if len(samples) < self.min_samples:
+            return self.prior
+        return sum(samples) / len(samples)
+
+    def rank(self, providers: Sequence[str]) -> List[str]:
+        """Fastest first; ties keep the given (configured) order."""
+        return sorted(providers, key=self.score)
+
+    def hedge_delay(self, provider: str) -> float:
+        """How long to give ``provider`` before asking another: its p95, within sane bounds."""
+        p95 = self.quantile(provider, 0.95)
+        if p95 is None:
+            return self.prior
+        return min(max(p95, Config.LLM_HEDGE_MIN_DELAY), self.failure_penalty)
+
+    def stats(self) -> Dict[str, Any]:
+        result = {}
+        for provider in list(self._samples):
+            p50 = self.quantile(provider, 0.50)
+            p95 = self.quantile(provider, 0.95)
+            result[provider] = {
+                "samples": len(self._samples[provider]),
+                "failures": self._failures.get(provider, 0),
+                "mean_s": round(self.score(provider), 3),
+                "p50_s": round(p50, 3) if p50 is not None else None,
+                "p95_s": round(p95, 3) if p95 is not None else None
+            }
+        return result
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Per-provider breaker: closed -> open after repeated trouble -> half-open probe.
+
+    Errors and calls slower than ``slow_call_seconds`` both count as trouble.
+    ``failure_threshold`` of them in a row open the circuit, and while it's
+    open the provider is skipped outright. After ``cooldown`` seconds one
+    request at a time is let through as a probe: success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 slow_call_seconds: Optional[float] = None, cooldown: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURE_THRESHOLD
+        self.slow_call_seconds = slow_call_seconds or Config.LLM_BREAKER_SLOW_CALL_SECONDS
+        self.cooldown = cooldown or Config.LLM_BREAKER_COOLDOWN
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _cooled_down(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at >= self.cooldown
+
+    @property
+    def available(self) -> bool:
+        """Would a call be let through right now? Doesn't claim the probe slot."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            return self._cooled_down() and not self._probe_in_flight
+
+    def try_acquire(self) -> bool:
+        """Claim permission for one call; in half-open only one probe runs at a time."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if not self._cooled_down() or self._probe_in_flight:
+                return False
+            if self.state == self.OPEN:
+                self._transition(self.HALF_OPEN)
+            self._probe_in_flight = True
+            return True
+
+    def release(self):
+        """Give back a claim whose call was abandoned (e.g. lost a hedge race)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self, seconds: float):
+        if seconds > self.slow_call_seconds:
+            self.record_failure(f"slow call ({seconds:.1f}s)")
+            return
+
+        with self._lock:
+            self._probe_in_flight = False
+            self.consecutive_failures = 0
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+                self.opened_at = None
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self._probe_in_flight = False
+            self.consecutive_failures += 1
+            self.last_error = error[:200]
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._transition(self.OPEN)
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+
+    def _transition(self, state: str):
+        if state == self.OPEN:
+            logger.warning("🔌 %s circuit OPEN after %d failures (last: %s)",
+                           self.name, self.consecutive_failures, self.last_error)
+        elif state == self.CLOSED:
+            logger.info("✅ %s circuit closed, provider recovered", self.name)
+        else:
+            logger.info("🔍 %s circuit half-open, probing", self.name)
+        self.state = state
+        BREAKER_TRANSITIONS.inc(provider=self.name, state=state)
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == self.OPEN and self.opened_at is not None:
+            retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "retry_in_s": retry_in,
+            "last_error": self.last_error
+        }
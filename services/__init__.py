@@ -1,6 +1,18 @@
-from .whatsapp_service import WhatsAppService
-from .speech_service import SpeechService
-from .tts_service import TTSService
-from .cache_service import CacheService
+import importlib
 
-__all__ = ['WhatsAppService', 'SpeechService', 'TTSService', 'CacheService']
+# Services load on first attribute access so importing one of them (or a
+# submodule like services.message_queue) doesn't drag in the voice stack
+_SERVICES = {
+    'WhatsAppService': '.whatsapp_service',
+    'SpeechService': '.speech_service',
+    'TTSService': '.tts_service',
+    'CacheService': '.cache_service'
+}
+
+__all__ = list(_SERVICES)
+
+
+def __getattr__(name):
+    if name in _SERVICES:
+        return getattr(importlib.import_module(_SERVICES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
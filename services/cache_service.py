@@ -1,13 +1,25 @@
 import os
 import json
+import threading
 import redis
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class CacheService:
     def __init__(self):
         self.redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
         self.redis_password = os.getenv('REDIS_PASSWORD', '')
+        self.message_dedup_ttl = Config.MESSAGE_DEDUP_TTL
+        self.message_dedup_max_entries = Config.MESSAGE_DEDUP_MAX_ENTRIES
+        self._memory_lock = threading.Lock()
+        # Without Redis: message SIDs in write order, pruned as new ones arrive
+        self._message_sids: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         
         try:
             if self.redis_password:
@@ -21,14 +33,14 @@ class CacheService:
             
             # Test connection
             self.redis_client.ping()
-            print("✅ Redis connected successfully")
+            logger.info("✅ Redis connected successfully")
             
         except Exception as e:
-            print(f"❌ Redis connection failed: {e}")
+            logger.error("❌ Redis connection failed: %s", e)
             # Fallback to in-memory cache
             self.redis_client = None
             self.memory_cache = {}
-            print("⚠️ Using in-memory cache fallback")
+            logger.warning("⚠️ Using in-memory cache fallback")
     
     def cache_user_context(self, user_id: str, context: Dict[str, Any], ttl: int = 7200) -> bool:
         """Cache user context with TTL."""
@@ -48,7 +60,7 @@ class CacheService:
             return True
             
         except Exception as e:
-            print(f"❌ Cache context error: {e}")
+            logger.error("❌ Cache context error: %s", e)
             return False
     
     def get_user_context(self, user_id: str) -> Dict[str, Any]:
@@ -79,7 +91,7 @@ class CacheService:
             }
             
         except Exception as e:
-            print(f"❌ Get context error: {e}")
+            logger.error("❌ Get context error: %s", e)
             return {}
     
     def update_conversation(self, user_id: str, role: str, content: str) -> bool:
@@ -116,7 +128,7 @@ class CacheService:
             return True
             
         except Exception as e:
-            print(f"❌ Update conversation error: {e}")
+            logger.error("❌ Update conversation error: %s", e)
             return False
     
     def get_conversation(self, user_id: str) -> List[Dict[str, Any]]:
@@ -139,9 +151,52 @@ class CacheService:
             return conversation
             
         except Exception as e:
-            print(f"❌ Get conversation error: {e}")
+            logger.error("❌ Get conversation error: %s", e)
             return []
     
+    def get_conversation_summary(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get the running summary of older turns, if one has been written."""
+        try:
+            key = f"conversation_summary:{user_id}"
+
+            if self.redis_client:
+                cached_data = self.redis_client.get(key)
+            else:
+                cached_entry = self.memory_cache.get(key)
+                if cached_entry and cached_entry['expires'] > datetime.now():
+                    cached_data = cached_entry['value']
+                else:
+                    cached_data = None
+
+            if cached_data:
+                return json.loads(cached_data)
+
+            return None
+
+        except Exception as e:
+            logger.error("❌ Get conversation summary error: %s", e)
+            return None
+
+    def set_conversation_summary(self, user_id: str, summary: Dict[str, Any], ttl: int = 7200) -> bool:
+        """Store the running summary; it expires with the conversation it belongs to."""
+        try:
+            key = f"conversation_summary:{user_id}"
+            value = json.dumps(summary, default=str)
+
+            if self.redis_client:
+                self.redis_client.setex(key, ttl, value)
+            else:
+                self.memory_cache[key] = {
+                    'value': value,
+                    'expires': datetime.now() + timedelta(seconds=ttl)
+                }
+
+            return True
+
+        except Exception as e:
+            logger.error("❌ Set conversation summary error: %s", e)
+            return False
+
     def cache_location_data(self, location: str, data: Dict[str, Any], ttl: int = 86400) -> bool:
         """Cache location-specific data."""
         try:
@@ -159,7 +214,7 @@ class CacheService:
             return True
             
         except Exception as e:
-            print(f"❌ Cache location error: {e}")
+            logger.error("❌ Cache location error: %s", e)
             return False
     
     def get_location_data(self, location: str) -> Optional[Dict[str, Any]]:
@@ -182,9 +237,110 @@ class CacheService:
             return None
             
         except Exception as e:
-            print(f"❌ Get location data error: {e}")
+            logger.error("❌ Get location data error: %s", e)
             return None
     
+    def claim_message(self, message_sid: str, ttl: Optional[int] = None) -> bool:
+        """Record an inbound message SID. Returns False if it was already seen."""
+        if not message_sid:
+            return True
+
+        key = f"message_sid:{message_sid}"
+        ttl = ttl or self.message_dedup_ttl
+
+        try:
+            if self.redis_client:
+                # SET NX is atomic across workers and processes
+                return bool(self.redis_client.set(key, "processing", nx=True, ex=ttl))
+
+            with self._memory_lock:
+                cached_entry = self._message_sids.get(key)
+                if cached_entry and cached_entry['expires'] > datetime.now():
+                    return False
+
+                self._remember_message(key, "processing", ttl)
+                return True
+
+        except Exception as e:
+            logger.error("❌ Claim message error: %s", e)
+            # Never drop a message because the dedup store is unavailable
+            return True
+
+    def release_message(self, message_sid: str) -> bool:
+        """Forget a claimed message SID so a redelivery gets processed."""
+        try:
+            key = f"message_sid:{message_sid}"
+
+            if self.redis_client:
+                self.redis_client.delete(key)
+            else:
+                with self._memory_lock:
+                    self._message_sids.pop(key, None)
+
+            return True
+
+        except Exception as e:
+            logger.error("❌ Release message error: %s", e)
+            return False
+
+    def cache_message_response(self, message_sid: str, response_data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Store the response generated for a message SID."""
+        try:
+            key = f"message_sid:{message_sid}"
+            value = json.dumps(response_data, default=str)
+            ttl = ttl or self.message_dedup_ttl
+
+            if self.redis_client:
+                self.redis_client.setex(key, ttl, value)
+            else:
+                with self._memory_lock:
+                    self._remember_message(key, value, ttl)
+
+            return True
+
+        except Exception as e:
+            logger.error("❌ Cache message response error: %s", e)
+            return False
+
+    def get_message_response(self, message_sid: str) -> Optional[Dict[str, Any]]:
+        """Get the stored response for a message SID, if processing finished."""
+        try:
+            key = f"message_sid:{message_sid}"
+
+            if self.redis_client:
+                cached_data = self.redis_client.get(key)
+            else:
+                cached_entry = self._message_sids.get(key)
+                if cached_entry and cached_entry['expires'] > datetime.now():
+                    cached_data = cached_entry['value']
+                else:
+                    cached_data = None
+
+            if cached_data and cached_data != "processing":
+                return json.loads(cached_data)
+
+            return None
+
+        except Exception as e:
+            logger.error("❌ Get message response error: %s", e)
+            return None
+
+    def _remember_message(self, key: str, value: str, ttl: int):
+        """Store a message SID entry in memory; caller holds ``_memory_lock``.
+
+        Entries are kept in write order, so expired ones are dropped from the
+        front on every write, and the oldest go once the store is full.
+        """
+        now = datetime.now()
+        self._message_sids.pop(key, None)
+        self._message_sids[key] = {'value': value, 'expires': now + timedelta(seconds=ttl)}
+
+        while self._message_sids:
+            oldest = next(iter(self._message_sids.values()))
+            if oldest['expires'] > now and len(self._message_sids) <= self.message_dedup_max_entries:
+                break
+            self._message_sids.popitem(last=False)
+
     def cleanup_expired_data(self):
         """Clean up expired data from memory cache."""
         if not self.redis_client and hasattr(self, 'memory_cache'):
@@ -200,4 +356,4 @@ class CacheService:
                 del self.memory_cache[key]
             
             if expired_keys:
-                print(f"🗑️ Cleaned up {len(expired_keys)} expired cache entries")
+                logger.info("🗑️ Cleaned up %d expired cache entries", len(expired_keys))
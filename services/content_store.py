@@ -0,0 +1,177 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from services.response_cache import normalize_message
+from utils.location_extractor import LocationExtractor
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+PREPARED_STORIES = metrics.counter(
+    "prepared_story_requests_total", "Story requests looked up in the content store, by result (hit, miss)"
+)
+
+
+def place_slug(place: str) -> str:
+    """Filesystem- and key-safe form of a place name: "Red Fort" -> "red_fort"."""
+    return re.sub(r'[^a-z0-9]+', '_', place.lower()).strip('_')
+
+
+class ContentStore:
+    """Pre-generated story variants (text plus audio) per place and language.
+
+    Filled offline by ``jobs.pregenerate_stories``; the live path only reads.
+    Everything lives under ``CONTENT_STORE_DIR``: a ``manifest.json`` with the
+    texts and an ``audio/`` folder with the narrations. The manifest is
+    rewritten atomically after every variant, so an interrupted job loses at
+    most the call in flight, and a running server picks up new content the
+    next time it looks something up.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or Config.CONTENT_STORE_DIR)
+        self.audio_dir = os.path.join(self.root, "audio")
+        self.path = os.path.join(self.root, self.MANIFEST)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._aliases: List[tuple] = []
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.location_extractor = LocationExtractor()
+        self._reload()
+
+    @staticmethod
+    def key(place: str, language: str) -> str:
+        return f"{place_slug(place)}:{language}"
+
+    def _reload(self):
+        """Re-read the manifest if the batch job has written a newer one."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries", {})
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ Could not read content store manifest: %s", e)
+            return
+
+        # Longest alias first so "red fort" wins over "delhi" in "red fort in delhi"
+        aliases = {}
+        for entry in entries.values():
+            for alias in [entry["place"]] + entry.get("aliases", []):
+                normalized = normalize_message(alias)
+                if normalized:
+                    aliases.setdefault(normalized, entry["place"])
+
+        with self._lock:
+            self.entries = entries
+            self._aliases = sorted(aliases.items(), key=lambda item: -len(item[0]))
+            self._mtime = mtime
+        logger.info("📚 Content store loaded: %d place/language pairs", len(entries))
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": self.entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime
+
+    def match_place(self, message: str, location: Optional[str] = None) -> Optional[str]:
+        """Place named in ``message``, else ``location`` if the store knows it.
+
+        ``location`` only stands in for a message that names no place at all -
+        "a story about Goa" with no Goa stories is a miss, not the Delhi story.
+        """
+        text = f" {normalize_message(message)} "
+        with self._lock:
+            for alias, place in self._aliases:
+                if f" {alias} " in text:
+                    return place
+        if location and self.location_extractor.extract_location(message) is None:
+            with self._lock:
+                normalized = normalize_message(location)
+                for alias, place in self._aliases:
+                    if alias == normalized:
+                        return place
+        return None
+
+    def find(self, message: str, language: str, location: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """A random prepared variant for the place asked about, in ``language``; None if there isn't one."""
+        self._reload()
+        place = self.match_place(message, location)
+        entry = self.entries.get(self.key(place, language)) if place else None
+        variants = entry["variants"] if entry else None
+        if not variants:
+            self.misses += 1
+            PREPARED_STORIES.inc(result="miss")
+            return None
+
+        self.hits += 1
+        PREPARED_STORIES.inc(result="hit")
+        variant = dict(random.choice(variants))
+        if variant.get("audio"):
+            audio_path = os.path.join(self.audio_dir, variant["audio"])
+            variant["audio"] = audio_path if os.path.exists(audio_path) else None
+        return variant
+
+    # --- batch job side ---
+
+    def get_entry(self, place: str, language: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(self.key(place, language))
+
+    def needs_refresh(self, place: str, language: str, fingerprint: str, variants: int, max_age: float) -> bool:
+        """True when the pair is missing, incomplete, built from other sources or older than ``max_age`` seconds."""
+        entry = self.get_entry(place, language)
+        return (entry is None or entry.get("fingerprint") != fingerprint
+                or len(entry["variants"]) < variants
+                or time.time() - entry.get("completed_at", 0) > max_age)
+
+    def put_entry(self, place: str, language: str, aliases: List[str], fingerprint: str,
+                  variants: List[Dict[str, Any]], complete: bool):
+        """Store the variants for a pair and write the manifest; old audio no longer referenced is removed."""
+        key = self.key(place, language)
+        previous = self.entries.get(key) or {}
+        entry = {
+            "place": place,
+            "language": language,
+            "aliases": aliases,
+            "fingerprint": fingerprint,
+            "variants": variants,
+            "completed_at": time.time() if complete else previous.get("completed_at", 0)
+        }
+
+        with self._lock:
+            self.entries = dict(self.entries, **{key: entry})
+            self._save()
+
+        kept = {variant.get("audio") for variant in variants}
+        for variant in previous.get("variants", []):
+            if variant.get("audio") and variant["audio"] not in kept:
+                try:
+                    os.unlink(os.path.join(self.audio_dir, variant["audio"]))
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "places": len({entry["place"] for entry in self.entries.values()}),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional
+
+import httpx
+
+from config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientPool:
+    """Long-lived keep-alive ``httpx.AsyncClient`` per provider.
+
+    Connections belong to the event loop that opened them, so clients are
+    kept per loop: one set for the worker pool's loop (or the ASGI server's),
+    another for anything else that calls in, e.g. a script using asyncio.run.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None, max_keepalive: Optional[int] = None,
+                 keepalive_expiry: Optional[float] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, http2: Optional[bool] = None):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or Config.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive or Config.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=keepalive_expiry or Config.LLM_HTTP_KEEPALIVE_EXPIRY
+        )
+        self.timeout = httpx.Timeout(
+            read_timeout or Config.LLM_HTTP_READ_TIMEOUT,
+            connect=connect_timeout or Config.LLM_HTTP_CONNECT_TIMEOUT
+        )
+
+        want_http2 = Config.LLM_HTTP2 if http2 is None else http2
+        self.http2 = want_http2 and _http2_available()
+        if want_http2 and not self.http2:
+            logger.warning("⚠️ HTTP/2 requested but the h2 package is missing, using HTTP/1.1")
+
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """Client for ``provider`` bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(provider)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=self.http2,
+                    trust_env=False  # providers are always reached directly, never via HTTP(S)_PROXY
+                )
+                clients[provider] = client
+                logger.debug("🔌 Opened %s HTTP client (http2=%s)", provider, self.http2)
+            return client
+
+    async def aclose(self):
+        """Close the clients owned by the running loop."""
+        with self._lock:
+            clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+import concurrent.futures
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the message queue cannot accept more jobs."""
+
+
+class MessageQueue:
+    """Async worker pool that processes inbound messages off the request path.
+
+    Jobs submitted with the same key (e.g. the sender's number) run strictly
+    in submission order, one at a time; different keys run in parallel up to
+    ``num_workers``.
+    """
+
+    def __init__(self, num_workers: int = 8, max_size: int = 1000, latency_window: int = 500):
+        self.num_workers = max(1, num_workers)
+        self.max_size = max_size
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready_keys: Optional[asyncio.Queue] = None
+        self._lanes: Dict[Any, deque] = {}
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._workers = []
+        self._start_lock = threading.Lock()
+        self._started = threading.Event()
+
+        # Stats
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self._wait_times = deque(maxlen=latency_window)
+        self._total_times = deque(maxlen=latency_window)
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Start workers on the given loop, or on a dedicated background loop."""
+        with self._start_lock:
+            if self._started.is_set():
+                return
+
+            if loop is not None:
+                self.loop = loop
+                self._spawn_workers()
+                self._started.set()
+                return
+
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, name="message-queue", daemon=True)
+            self._thread.start()
+            self._started.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self._spawn_workers()
+        self._started.set()
+        self.loop.run_forever()
+
+    def _spawn_workers(self):
+        self._ready_keys = asyncio.Queue()
+        self._workers = [
+            self.loop.create_task(self._worker(i)) for i in range(self.num_workers)
+        ]
+        logger.info("✅ Message queue started with %d workers", self.num_workers)
+
+    def submit(self, func: Callable[..., Awaitable[Any]], *args, key: Optional[str] = None,
+               **kwargs) -> concurrent.futures.Future:
+        """Enqueue an async job from any thread and return a future for its result.
+
+        Jobs sharing ``key`` are serialized in order; ``None`` means no ordering.
+        """
+        if not self._started.is_set():
+            self.start()
+
+        with self._pending_lock:
+            if self._pending >= self.max_size:
+                self.rejected += 1
+                raise QueueFullError(f"Message queue full ({self.max_size} jobs pending)")
+            self._pending += 1
+
+        future = concurrent.futures.Future()
+        job = {
+            "func": func,
+            "args": args,
+            "kwargs": kwargs,
+            "future": future,
+            "enqueued_at": time.perf_counter()
+        }
+
+        self.submitted += 1
+        self.loop.call_soon_threadsafe(self._enqueue, key if key is not None else object(), job)
+        return future
+
+    def _enqueue(self, key: Any, job: Dict[str, Any]):
+        """Append a job to its key's lane; runs on the queue's event loop."""
+        lane = self._lanes.get(key)
+        if lane is not None:
+            # Key already queued or running - the worker holding it will pick this up
+            lane.append(job)
+            return
+
+        self._lanes[key] = deque([job])
+        self._ready_keys.put_nowait(key)
+
+    async def _worker(self, worker_id: int):
+        while True:
+            key = await self._ready_keys.get()
+            lane = self._lanes[key]
+            job = lane.popleft()
+            with self._pending_lock:
+                self._pending -= 1
+
+            started_at = time.perf_counter()
+            self._wait_times.append(started_at - job["enqueued_at"])
+            self.in_flight += 1
+
+            try:
+                result = await job["func"](*job["args"], **job["kwargs"])
+                self.completed += 1
+                if not job["future"].done():
+                    job["future"].set_result(result)
+            except Exception as e:
+                self.failed += 1
+                logger.exception("❌ Worker %d job failed: %s", worker_id, e)
+                if not job["future"].done():
+                    job["future"].set_exception(e)
+            finally:
+                self.in_flight -= 1
+                self._total_times.append(time.perf_counter() - job["enqueued_at"])
+
+                # Hand the key back at the tail so one busy user can't starve others
+                if lane:
+                    self._ready_keys.put_nowait(key)
+                else:
+                    del self._lanes[key]
+
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return max(self._pending, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and job latency percentiles (ms)."""
+        return {
+            "running": self._started.is_set(),
+            "workers": self.num_workers,
+            "depth": self.depth(),
+            "max_size": self.max_size,
+            "in_flight": self.in_flight,
+            "active_keys": len(self._lanes),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_ms": self._percentiles(self._wait_times),
+            "latency_ms": self._percentiles(self._total_times)
+        }
+
+    @staticmethod
+    def _percentiles(samples) -> Dict[str, float]:
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {
+            "p50": round(ordered[int(last * 0.50)] * 1000, 1),
+            "p95": round(ordered[int(last * 0.95)] * 1000, 1),
+            "max": round(ordered[-1] * 1000, 1)
+        }
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+RATE_LIMITED = metrics.counter(
+    "llm_rate_limited_total", "LLM calls held back by the client-side rate limiter, by outcome (waited, denied)"
+)
+
+
+class RateLimitedError(Exception):
+    """The provider's budget didn't refill in time; the call was not made."""
+
+
+# Refill and take from every bucket of one provider atomically; Redis TIME keeps
+# all processes on the same clock. Returns 0 when granted, else seconds to wait.
+TAKE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local wait = 0
+local state = {}
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local cost = math.min(tonumber(ARGV[i * 2]), capacity)
+    local rate = capacity / 60
+    local stored = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(stored[1]) or capacity
+    local ts = tonumber(stored[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    state[i] = tokens
+    if tokens < cost then
+        wait = math.max(wait, (cost - tokens) / rate)
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local tokens = state[i]
+    if wait == 0 then
+        tokens = tokens - math.min(tonumber(ARGV[i * 2]), tonumber(ARGV[i * 2 - 1]))
+    end
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', key, 120)
+end
+
+return tostring(wait)
+"""
+
+
+class _LocalBuckets:
+    """Same token-bucket maths in process memory, used when Redis isn't reachable."""
+
+    def __init__(self):
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, buckets: List[Tuple[str, float, float]]) -> float:
+        now = time.monotonic()
+        with self._lock:
+            wait = 0.0
+            refilled = []
+            for key, capacity, cost in buckets:
+                rate = capacity / 60
+                tokens, ts = self._state.get(key, (capacity, now))
+                tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+                refilled.append(tokens)
+                cost = min(cost, capacity)
+                if tokens < cost:
+                    wait = max(wait, (cost - tokens) / rate)
+
+            for (key, capacity, cost), tokens in zip(buckets, refilled):
+                if wait == 0:
+                    tokens -= min(cost, capacity)
+                self._state[key] = (tokens, now)
+            return wait
+
+
+class RateLimiter:
+    """Client-side token buckets per LLM provider: requests and, optionally, tokens per minute.
+
+    Buckets live in Redis so every worker process draws from the same budget;
+    if Redis is unavailable each process keeps its own. ``acquire`` queues the
+    caller until the buckets refill or ``max_wait`` runs out - with
+    ``max_wait=0`` it answers at once, which is how callers spill over to
+    the other provider instead of waiting.
+    """
+
+    KEY_PREFIX = "llm_rate"
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None, redis_url: Optional[str] = None):
+        self.limits = limits or {
+            'groq': {'requests': Config.GROQ_RATE_LIMIT, 'tokens': Config.GROQ_TOKENS_PER_MINUTE},
+            'openai': {'requests': Config.OPENAI_RATE_LIMIT, 'tokens': Config.OPENAI_TOKENS_PER_MINUTE}
+        }
+        self.default_wait = Config.RATE_LIMIT_MAX_WAIT
+        self._local = _LocalBuckets()
+        self._script = None
+        self.granted = 0
+        self.denied = 0
+
+        if Config.RATE_LIMIT_SHARED:
+            try:
+                client = redis.from_url(redis_url or Config.REDIS_URL, password=Config.REDIS_PASSWORD or None,
+                                        decode_responses=True, socket_timeout=0.5, socket_connect_timeout=0.5)
+                client.ping()
+                self._script = client.register_script(TAKE_SCRIPT)
+                logger.info("✅ LLM rate limits shared through Redis")
+            except Exception as e:
+                logger.warning("⚠️ Redis unavailable for rate limiting, limits are per process: %s", e)
+
+    def _buckets(self, provider: str, tokens: int) -> List[Tuple[str, float, float]]:
+        limits = self.limits.get(provider, {})
+        buckets = []
+        if limits.get('requests'):
+            buckets.append((f"{self.KEY_PREFIX}:{provider}:requests", float(limits['requests']), 1.0))
+        if limits.get('tokens') and tokens:
+            buckets.append((f"{self.KEY_PREFIX}:{provider}:tokens", float(limits['tokens']), float(tokens)))
+        return buckets
+
+    def _take(self, buckets: List[Tuple[str, float, float]]) -> float:
+        """Seconds until the buckets can cover the call; 0 means it was granted."""
+        if self._script is not None:
+            try:
+                args = []
+                for _, capacity, cost in buckets:
+                    args += [capacity, cost]
+                return float(self._script(keys=[key for key, _, _ in buckets], args=args))
+            except Exception as e:
+                logger.warning("⚠️ Redis rate limiting failed, falling back to per-process limits: %s", e)
+                self._script = None
+        return self._local.take(buckets)
+
+    async def acquire(self, provider: str, tokens: int = 0, max_wait: Optional[float] = None) -> bool:
+        """Wait for budget to call ``provider``; False if it isn't there within ``max_wait`` seconds."""
+        buckets = self._buckets(provider, tokens)
+        if not buckets:
+            return True
+
+        max_wait = self.default_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        loop = asyncio.get_running_loop()
+        waited = False
+
+        while True:
+            if self._script is not None:
+                # Redis round-trip is blocking - keep it off the event loop
+                wait = await loop.run_in_executor(None, self._take, buckets)
+            else:
+                wait = self._take(buckets)
+
+            if wait <= 0:
+                self.granted += 1
+                if waited:
+                    RATE_LIMITED.inc(provider=provider, outcome="waited")
+                return True
+
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                self.denied += 1
+                RATE_LIMITED.inc(provider=provider, outcome="denied")
+                return False
+
+            waited = True
+            await asyncio.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "shared": self._script is not None,
+            "limits": self.limits,
+            "granted": self.granted,
+            "denied": self.denied
+        }
@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+CACHE_REQUESTS = metrics.counter(
+    "response_cache_requests_total", "Response cache lookups by result (hit, miss, bypass)"
+)
+
+# Words that change how a question is asked, not what is asked
+FILLER_WORDS = frozenset({
+    'please', 'pls', 'plz', 'kindly', 'hi', 'hello', 'hey', 'namaste', 'ji',
+    'can', 'could', 'would', 'you', 'u', 'me', 'i', 'want', 'to', 'the', 'a', 'an',
+    'kripya', 'zara', 'bhai', 'dada', 'anna'
+})
+
+
+def normalize_message(message: str) -> str:
+    """Reduce a message to its intent: case, punctuation, emoji and filler words dropped.
+
+    "Tell me about the Red Fort!!" and "tell me about red fort please" share a key.
+    Word order is kept - it carries meaning in every supported language.
+    """
+    text = unicodedata.normalize('NFC', message).casefold()
+    # Keep letters, digits and combining marks (Indic vowel signs); everything else separates words
+    text = ''.join(ch if unicodedata.category(ch)[0] in 'LNM' else ' ' for ch in text)
+    words = [word for word in text.split() if word not in FILLER_WORDS]
+    return ' '.join(words)
+
+
+class ResponseCache:
+    """In-process LRU of LLM replies keyed by normalized message, language and location.
+
+    Each key holds up to ``variants`` replies. Until that many have been
+    generated a lookup counts as a miss so the next call adds another one;
+    after that a random variant is served, so regulars don't get the same
+    wording every time.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None,
+                 variants: Optional[int] = None, max_message_chars: Optional[int] = None):
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl = ttl or Config.RESPONSE_CACHE_TTL
+        self.variants = max(1, variants or Config.RESPONSE_CACHE_VARIANTS)
+        self.max_message_chars = max_message_chars or Config.RESPONSE_CACHE_MAX_MESSAGE_CHARS
+        self.enabled = Config.RESPONSE_CACHE_ENABLED
+
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def intent_key(message: str, user_context: Dict) -> Optional[Tuple[str, str, str]]:
+        """(normalized message, language, location), or None for a message with no words."""
+        intent = normalize_message(message)
+        if not intent:
+            return None
+
+        location = (user_context.get('current_location') or '').strip().casefold()
+        return intent, user_context.get('detected_language', 'en'), location
+
+    def key_for(self, message: str, user_context: Dict,
+                conversation_history: Optional[List[Dict]] = None) -> Optional[Tuple[str, str, str]]:
+        """Cache key, or None when the message shouldn't be cached (too long, empty or a follow-up).
+
+        The key ignores history, so only first-turn messages are cached: a
+        follow-up like "tell me more" means something different in every
+        conversation.
+        """
+        if not self.enabled or conversation_history or len(message) > self.max_message_chars:
+            return None
+        return self.intent_key(message, user_context)
+
+    def get(self, key: Optional[Tuple[str, str, str]]) -> Optional[str]:
+        if key is None:
+            CACHE_REQUESTS.inc(result="bypass")
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['expires'] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None or len(entry['replies']) < self.variants:
+                self.misses += 1
+                CACHE_REQUESTS.inc(result="miss")
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_REQUESTS.inc(result="hit")
+            return random.choice(entry['replies'])
+
+    def put(self, key: Optional[Tuple[str, str, str]], reply: str):
+        if key is None or not reply:
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['expires'] <= time.monotonic():
+                # TTL runs from the first variant, so a key refreshes all its wording at once
+                entry = {'replies': [], 'expires': time.monotonic() + self.ttl}
+                self._entries[key] = entry
+
+            replies: List[str] = entry['replies']
+            if len(replies) < self.variants:
+                replies.append(reply)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "variants": self.variants,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -1,32 +1,51 @@
 import asyncio
 import tempfile
 import os
-import whisper
-import speech_recognition as sr
-from pydub import AudioSegment
-from typing import Optional
+from typing import Any, Optional
+
+from utils.language_registry import get_language_registry
+from utils.tracing import span
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class SpeechService:
+    # whisper (torch), speech_recognition and pydub are imported on first use so
+    # text-only workers never pay for them
     def __init__(self):
-        self.recognizer = sr.Recognizer()
+        self._recognizer = None
         self.whisper_model = None
-        self.supported_languages = {
-            'en': 'english', 'hi': 'hindi', 'bn': 'bengali',
-            'ta': 'tamil', 'te': 'telugu', 'mr': 'marathi',
-            'gu': 'gujarati', 'kn': 'kannada', 'ml': 'malayalam'
-        }
+        self.registry = get_language_registry()
     
-    def load_whisper_model(self) -> Optional[whisper.Whisper]:
+    @property
+    def recognizer(self):
+        if self._recognizer is None:
+            import speech_recognition as sr
+            self._recognizer = sr.Recognizer()
+        return self._recognizer
+
+    def load_whisper_model(self) -> Optional[Any]:
         """Load Whisper model for accurate transcription."""
         if self.whisper_model is None:
             try:
+                import whisper
                 self.whisper_model = whisper.load_model("base")
-                print("✅ Whisper model loaded successfully")
+                logger.info("✅ Whisper model loaded successfully")
             except Exception as e:
-                print(f"❌ Whisper load error: {e}")
+                logger.error("❌ Whisper load error: %s", e)
                 self.whisper_model = None
         return self.whisper_model
     
+    def warm_up(self):
+        """Load Whisper and run it once on a second of silence so the first voice note is fast."""
+        model = self.load_whisper_model()
+        if not model:
+            raise RuntimeError("Whisper model unavailable")
+
+        import numpy as np
+        model.transcribe(np.zeros(16000, dtype=np.float32), language='english', task="transcribe")
+        logger.info("✅ Whisper warmed up")
+
     async def transcribe_audio(self, audio_data: bytes, language: str = 'auto') -> Optional[str]:
         """Advanced audio transcription with language detection."""
         
@@ -38,13 +57,13 @@ class SpeechService:
             # Try Whisper first (most accurate for multilingual)
             result = await self._transcribe_with_whisper(tmp_file_path, language)
             if result and len(result.strip()) > 2:  # Valid transcription
-                print(f"✅ Whisper transcription: {result}")
+                logger.debug("✅ Whisper transcription: %s", result)
                 return result
             
             # Fallback to Google Speech Recognition
             result = await self._transcribe_with_google(tmp_file_path, language)
             if result:
-                print(f"✅ Google transcription: {result}")
+                logger.debug("✅ Google transcription: %s", result)
                 return result
                 
             return None
@@ -62,26 +81,31 @@ class SpeechService:
                 return None
             
             # Map to Whisper language
-            whisper_lang = self.supported_languages.get(language, 'english')
+            record = self.registry.get(language)
+            whisper_lang = record.whisper_code if record else 'english'
             
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: model.transcribe(
-                    audio_path, 
-                    language=whisper_lang,
-                    task="transcribe"
+            with span("stt.whisper"):
+                result = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: model.transcribe(
+                        audio_path, 
+                        language=whisper_lang,
+                        task="transcribe"
+                    )
                 )
-            )
             
             return result['text'].strip()
             
         except Exception as e:
-            print(f"❌ Whisper transcription error: {e}")
+            logger.error("❌ Whisper transcription error: %s", e)
             return None
     
     async def _transcribe_with_google(self, audio_path: str, language: str) -> Optional[str]:
         """Google Speech Recognition fallback."""
         try:
+            import speech_recognition as sr
+            from pydub import AudioSegment
+
             # Convert to proper format
             audio = AudioSegment.from_file(audio_path)
             wav_path = audio_path.replace('.wav', '_converted.wav')
@@ -92,22 +116,17 @@ class SpeechService:
                 self.recognizer.adjust_for_ambient_noise(source)
                 audio_data = self.recognizer.record(source)
             
-            # Google language mapping
-            google_languages = {
-                'en': 'en-IN', 'hi': 'hi-IN', 'bn': 'bn-IN',
-                'ta': 'ta-IN', 'te': 'te-IN', 'mr': 'mr-IN',
-                'gu': 'gu-IN', 'kn': 'kn-IN', 'ml': 'ml-IN'
-            }
-            
-            google_lang = google_languages.get(language, 'en-IN')
+            record = self.registry.get(language)
+            google_lang = record.google_stt_code if record else 'en-IN'
             
-            text = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.recognizer.recognize_google(
-                    audio_data, 
-                    language=google_lang
+            with span("stt.google"):
+                text = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: self.recognizer.recognize_google(
+                        audio_data, 
+                        language=google_lang
+                    )
                 )
-            )
             
             # Cleanup
             if os.path.exists(wav_path):
@@ -116,5 +135,5 @@ class SpeechService:
             return text
             
         except Exception as e:
-            print(f"❌ Google transcription error: {e}")
+            logger.error("❌ Google transcription error: %s", e)
             return None
@@ -2,62 +2,39 @@ import asyncio
 import tempfile
 import os
 import uuid
-import json
 import re
-from gtts import gTTS
 from typing import Optional, Dict
-import logging
+
+from utils.language_registry import get_language_registry
+from utils.tracing import span
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class TTSService:
     def __init__(self):
-        # Load language data
-        self.language_data = self._load_language_data()
+        self.registry = get_language_registry()
         
         # Enhanced language support for TTS with voice settings
-        self.gtts_languages = {}
-        self.voice_settings = {}
-        
-        self._initialize_tts_config()
+        self.gtts_languages = {r.code: r.gtts_code for r in self.registry if r.tts_supported}
+        self.voice_settings = {r.code: r.voice_settings for r in self.registry if r.tts_supported}
         
         self.temp_dir = tempfile.gettempdir()
-        print(f"✅ TTS Service initialized with {len(self.gtts_languages)} languages")
-    
-    def _load_language_data(self) -> Dict:
-        """Load language configuration from languages.json."""
-        try:
-            lang_file = os.path.join('data', 'languages.json')
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"❌ Failed to load languages.json: {e}")
-            return {}
-
-    def _initialize_tts_config(self):
-        """Initialize TTS configuration from language data."""
-        supported_langs = self.language_data.get('supported_languages', {})
-        
-        for lang_code, lang_info in supported_langs.items():
-            if lang_info.get('tts_supported', False):
-                self.gtts_languages[lang_code] = lang_info.get('gtts_code', lang_code)
-                self.voice_settings[lang_code] = lang_info.get('voice_settings', {
-                    'speed': 'normal',
-                    'pitch': 'medium',
-                    'accent': 'indian'
-                })
+        logger.info("✅ TTS Service initialized with %d languages", len(self.gtts_languages))
     
     async def text_to_speech(self, text: str, language: str = 'en') -> Optional[str]:
         """Generate high-quality speech from text with language-specific settings."""
         try:
             # Validate language support
             if not self._is_tts_supported(language):
-                print(f"⚠️ TTS not supported for {language}, falling back to English")
+                logger.warning("⚠️ TTS not supported for %s, falling back to English", language)
                 language = 'en'
             
             # Clean text for optimal TTS
             clean_text = self._clean_text_for_tts(text, language)
             
             if not clean_text.strip():
-                print("⚠️ Empty text after cleaning, skipping TTS")
+                logger.warning("⚠️ Empty text after cleaning, skipping TTS")
                 return None
             
             # Get language-specific settings
@@ -68,9 +45,10 @@ class TTSService:
             audio_filename = f"tts_{language}_{uuid.uuid4().hex}.mp3"
             audio_path = os.path.join(self.temp_dir, audio_filename)
             
-            print(f"🔊 Generating TTS for {gtts_lang}: {clean_text[:50]}...")
+            logger.debug("🔊 Generating TTS for %s: %.50s", gtts_lang, clean_text)
             
             # Generate speech with enhanced settings
+            gTTS = self.load_engine()
             tts = gTTS(
                 text=clean_text,
                 lang=gtts_lang,
@@ -78,40 +56,33 @@ class TTSService:
                 tld=self._get_tld_for_language(language)
             )
             
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: tts.save(audio_path)
-            )
+            with span("tts.gtts"):
+                await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: tts.save(audio_path)
+                )
             
-            print(f"✅ TTS audio saved: {audio_path}")
+            logger.debug("✅ TTS audio saved: %s", audio_path)
             return audio_path
             
         except Exception as e:
-            print(f"❌ TTS generation error: {e}")
+            logger.error("❌ TTS generation error: %s", e)
             return None
 
+    def load_engine(self):
+        """Import gTTS on first use so text-only workers never pay for it."""
+        from gtts import gTTS
+        return gTTS
+
     def _is_tts_supported(self, language: str) -> bool:
         """Check if TTS is supported for the language."""
-        lang_info = self.language_data.get('supported_languages', {}).get(language, {})
-        return lang_info.get('tts_supported', False)
+        record = self.registry.get(language)
+        return bool(record and record.tts_supported)
 
     def _get_tld_for_language(self, language: str) -> str:
         """Get appropriate TLD for better voice quality."""
-        tld_map = {
-            'en': 'com',
-            'hi': 'co.in',
-            'bn': 'co.in',
-            'ta': 'co.in',
-            'te': 'co.in',
-            'ml': 'co.in',
-            'kn': 'co.in',
-            'gu': 'co.in',
-            'mr': 'co.in',
-            'pa': 'co.in',
-            'or': 'co.in',
-            'ur': 'com.pk'
-        }
-        return tld_map.get(language, 'com')
+        record = self.registry.get(language)
+        return record.tts_tld if record else 'com'
     
     def _clean_text_for_tts(self, text: str, language: str) -> str:
         """Advanced text cleaning for natural speech by language."""
@@ -157,8 +128,8 @@ class TTSService:
         return {
             'supported': self._is_tts_supported(language),
             'gtts_code': self.gtts_languages.get(language),
-            'settings': self.voice_settings.get(language, {}),
-            'language_name': self.language_data.get('supported_languages', {}).get(language, {}).get('name', 'Unknown')
+            'settings': dict(self.voice_settings.get(language, {})),
+            'language_name': self.registry.get(language).name if language in self.registry else 'Unknown'
         }
 
     def get_supported_languages(self) -> list:
@@ -170,9 +141,9 @@ class TTSService:
         try:
             if file_path and os.path.exists(file_path):
                 os.unlink(file_path)
-                print(f"🗑️ Cleaned up audio file: {file_path}")
+                logger.debug("🗑️ Cleaned up audio file: %s", file_path)
         except Exception as e:
-            print(f"❌ Cleanup error: {e}")
+            logger.error("❌ Cleanup error: %s", e)
 
     def batch_cleanup(self, max_age_hours: int = 24):
         """Clean up old audio files in temp directory."""
@@ -192,7 +163,7 @@ class TTSService:
                         cleaned_count += 1
             
             if cleaned_count > 0:
-                print(f"🧹 Cleaned up {cleaned_count} old audio files")
+                logger.info("🧹 Cleaned up %d old audio files", cleaned_count)
                 
         except Exception as e:
-            print(f"❌ Batch cleanup error: {e}")
+            logger.error("❌ Batch cleanup error: %s", e)
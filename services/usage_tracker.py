@@ -0,0 +1,133 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import Config
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.tracing import current_trace
+
+logger = get_logger(__name__)
+
+# USD per million tokens (prompt, completion) - list prices, for planning only
+MODEL_PRICES = {
+    "llama3-8b-8192": (0.05, 0.08),
+    "llama3-70b-8192": (0.59, 0.79),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60)
+}
+
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total", "Prompt and completion tokens by provider, model, language and route"
+)
+LLM_COST = metrics.counter(
+    "llm_cost_usd_total", "Estimated LLM spend in USD at list prices"
+)
+LLM_CALLS = metrics.counter(
+    "llm_calls_total", "Provider calls by outcome and purpose (reply, stream, summary)"
+)
+LLM_CALL_LATENCY = metrics.histogram(
+    "llm_call_seconds", "Latency of individual provider calls"
+)
+
+
+class UsageTracker:
+    """Token, cost and latency accounting for every LLM provider call.
+
+    Each call goes to Prometheus counters, to in-process totals per language
+    and route (for /health), and as one JSON line to ``USAGE_LOG_FILE``.
+    The file is written from a background thread so callers never wait on disk.
+    """
+
+    def __init__(self, log_file: Optional[str] = None):
+        self.totals: Dict[str, Dict[str, Dict[str, float]]] = {"language": {}, "route": {}, "provider": {}}
+        self._lock = threading.Lock()
+        self._log = None
+        self._listener = None
+
+        log_file = log_file if log_file is not None else Config.USAGE_LOG_FILE
+        if log_file:
+            handler = logging.FileHandler(log_file, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            log_queue = queue.SimpleQueue()
+
+            self._log = logging.getLogger(f"citychai_usage.{id(self)}")
+            self._log.setLevel(logging.INFO)
+            self._log.addHandler(logging.handlers.QueueHandler(log_queue))
+            self._log.propagate = False
+
+            self._listener = logging.handlers.QueueListener(log_queue, handler)
+            self._listener.start()
+            atexit.register(self.close)
+
+    def record(self, provider: str, model: str, latency: float, ok: bool = True, purpose: str = "reply",
+               language: Optional[str] = None, prompt_tokens: int = 0, completion_tokens: int = 0,
+               estimated: bool = False, attempt: int = 1, status: Optional[int] = None):
+        """Account for one provider call; ``estimated`` marks token counts we computed ourselves."""
+        active = current_trace()
+        route = active.name if active else "-"
+        language = language or "-"
+
+        cost = 0.0
+        if model in MODEL_PRICES:
+            prompt_price, completion_price = MODEL_PRICES[model]
+            cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+        LLM_CALLS.inc(provider=provider, outcome="ok" if ok else "error", purpose=purpose)
+        LLM_CALL_LATENCY.observe(latency, provider=provider, purpose=purpose)
+        if prompt_tokens:
+            LLM_TOKENS.inc(prompt_tokens, provider=provider, model=model, type="prompt", language=language, route=route)
+        if completion_tokens:
+            LLM_TOKENS.inc(completion_tokens, provider=provider, model=model, type="completion", language=language, route=route)
+        if cost:
+            LLM_COST.inc(cost, provider=provider, model=model)
+
+        with self._lock:
+            for dimension, key in (("language", language), ("route", route), ("provider", provider)):
+                bucket = self.totals[dimension].setdefault(
+                    key, {"calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+                )
+                bucket["calls"] += 1
+                bucket["errors"] += 0 if ok else 1
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["completion_tokens"] += completion_tokens
+                bucket["cost_usd"] += cost
+
+        if self._log is not None:
+            entry = {
+                "ts": round(time.time(), 3),
+                "request_id": active.request_id if active else None,
+                "route": route,
+                "purpose": purpose,
+                "provider": provider,
+                "model": model,
+                "lang": language,
+                "ok": ok,
+                "status": status,
+                "attempt": attempt,
+                "latency_ms": round(latency * 1000, 1),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "estimated": estimated,
+                "cost_usd": round(cost, 8)
+            }
+            self._log.info(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+
+    def close(self):
+        """Flush pending lines to the file and stop the writer thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            self._log = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                dimension: {key: dict(bucket, cost_usd=round(bucket["cost_usd"], 6)) for key, bucket in values.items()}
+                for dimension, values in self.totals.items()
+            }
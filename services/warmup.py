@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WarmupManager:
+    """Runs warm-up steps in a background thread after boot and tracks readiness.
+
+    The node is ready once every step has finished. A failed step is reported
+    but does not block readiness - retrying it on the request path wouldn't
+    go any better - unless it was added with ``required=True``: then the node
+    stays unready, so the load balancer keeps traffic that needs it away.
+    """
+
+    def __init__(self):
+        self._steps: List[Tuple[str, Callable[[], Any]]] = []
+        self._required: List[str] = []
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self._thread = None
+        self._done = threading.Event()
+        self.started_at = None
+        self.finished_at = None
+
+    def add_step(self, name: str, func: Callable[[], Any], required: bool = False):
+        self._steps.append((name, func))
+        self.status[name] = {"state": "pending"}
+        if required:
+            self._required.append(name)
+
+    def start(self):
+        """Run all steps in order on a daemon thread; safe to call once."""
+        if self._thread is not None:
+            return
+
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        logger.info("🔥 Warm-up started (%d steps)", len(self._steps))
+
+        for name, func in self._steps:
+            self.status[name] = {"state": "running"}
+            step_started_at = time.perf_counter()
+            try:
+                func()
+                self.status[name] = {"state": "ready"}
+            except Exception as e:
+                logger.warning("⚠️ Warm-up step %s failed: %s", name, e)
+                self.status[name] = {"state": "failed", "error": str(e)[:200]}
+            self.status[name]["duration_ms"] = round((time.perf_counter() - step_started_at) * 1000, 1)
+
+        self.finished_at = time.perf_counter()
+        self._done.set()
+        logger.info("✅ Warm-up finished in %.0fms", (self.finished_at - self.started_at) * 1000)
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set() or not self._steps
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and all(self.succeeded(name) for name in self._required)
+
+    def succeeded(self, name: str) -> bool:
+        return self.status.get(name, {}).get("state") == "ready"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout) if self._steps else True
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round(((self.finished_at or time.perf_counter()) - self.started_at) * 1000, 1)
+
+        return {
+            "ready": self.ready,
+            "required": list(self._required),
+            "elapsed_ms": elapsed,
+            "steps": {name: dict(status) for name, status in self.status.items()}
+        }
@@ -7,6 +7,12 @@ from typing import Optional, Dict, Any
 import tempfile
 from urllib.parse import urlparse
 
+from config import Config
+from utils.tracing import span
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class WhatsAppService:
     def __init__(self):
         self.account_sid = os.getenv('TWILIO_ACCOUNT_SID')
@@ -14,21 +20,26 @@ class WhatsAppService:
         self.phone_number = os.getenv('TWILIO_PHONE_NUMBER')
         
         # Debug logging to see what credentials we're loading
-        print(f"🔧 Twilio Configuration:")
-        print(f"   Account SID: {self.account_sid[:10] if self.account_sid else 'None'}...")
-        print(f"   Auth Token: {'✅ Loaded' if self.auth_token else '❌ Missing'}")
-        print(f"   Phone Number: {self.phone_number}")
+        logger.debug(
+            "🔧 Twilio Configuration: account_sid=%s auth_token=%s phone_number=%s",
+            'loaded' if self.account_sid else 'missing',
+            'loaded' if self.auth_token else 'missing',
+            self.phone_number
+        )
         
         if not all([self.account_sid, self.auth_token, self.phone_number]):
-            print("⚠️ Twilio credentials not found. WhatsApp features will be limited.")
-            print("   Make sure your .env file has:")
-            print("   TWILIO_ACCOUNT_SID=your_account_sid")
-            print("   TWILIO_AUTH_TOKEN=your_auth_token")
-            print("   TWILIO_PHONE_NUMBER=your_sandbox_number")
+            logger.warning(
+                "⚠️ Twilio credentials not found. WhatsApp features will be limited. "
+                "Set TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN and TWILIO_PHONE_NUMBER in .env"
+            )
             self.client = None
         else:
             self.client = Client(self.account_sid, self.auth_token)
-            print("✅ WhatsApp service initialized successfully")
+            api_base_url = Config.TWILIO_API_BASE_URL
+            if api_base_url:
+                # Point the REST client at a different API host (e.g. a local stand-in for load tests)
+                self.client.api.base_url = api_base_url.rstrip('/')
+            logger.info("✅ WhatsApp service initialized successfully")
     
     def _format_whatsapp_number(self, phone_number: str) -> str:
         """Ensure phone number has proper WhatsApp format."""
@@ -52,70 +63,65 @@ class WhatsAppService:
         """Send text message via WhatsApp with enhanced error handling."""
         try:
             if not self.client:
-                print("❌ Twilio client not initialized - check your credentials")
+                logger.error("❌ Twilio client not initialized - check your credentials")
                 return False
             
             # Format numbers properly
             formatted_to = self._format_whatsapp_number(to_number)
             formatted_from = self._format_whatsapp_number(self.phone_number)
             
-            print(f"📤 Attempting to send message:")
-            print(f"   From: {formatted_from}")
-            print(f"   To: {formatted_to}")
-            print(f"   Message: {message[:50]}{'...' if len(message) > 50 else ''}")
+            logger.debug("📤 Sending message from %s to %s: %.50s", formatted_from, formatted_to, message)
             
             # Validate the from number
             if not self._is_valid_sandbox_number(formatted_from):
-                print(f"❌ Invalid sandbox number: {formatted_from}")
-                print("💡 Check your TWILIO_PHONE_NUMBER in .env file")
-                print("   It should be your Twilio WhatsApp sandbox number (e.g., +14155238886)")
+                logger.error(
+                    "❌ Invalid sandbox number: %s - check TWILIO_PHONE_NUMBER in .env, "
+                    "it should be your Twilio WhatsApp sandbox number (e.g., +14155238886)", formatted_from
+                )
                 return False
             
-            message_instance = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    body=message,
-                    from_=formatted_from,
-                    to=formatted_to
+            with span("twilio.messages_create"):
+                message_instance = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: self.client.messages.create(
+                        body=message,
+                        from_=formatted_from,
+                        to=formatted_to
+                    )
                 )
-            )
             
-            print(f"✅ Message sent successfully!")
-            print(f"   Message SID: {message_instance.sid}")
-            print(f"   Status: {message_instance.status}")
+            logger.debug("✅ Message sent: sid=%s status=%s", message_instance.sid, message_instance.status)
             return True
             
         except TwilioException as e:
-            print(f"❌ Twilio API error: {e}")
+            logger.error("❌ Twilio API error: %s", e)
             if "21212" in str(e):
-                print("💡 Error 21212: Invalid 'From' number")
-                print("   This usually means your TWILIO_PHONE_NUMBER is incorrect")
-                print("   1. Go to Twilio Console → Messaging → Try it out → WhatsApp")
-                print("   2. Copy the exact sandbox number (e.g., +14155238886)")
-                print("   3. Update your .env file with that number")
+                logger.error(
+                    "💡 Error 21212: Invalid 'From' number - TWILIO_PHONE_NUMBER is probably incorrect. "
+                    "Copy the exact sandbox number from Twilio Console → Messaging → Try it out → WhatsApp"
+                )
             elif "21211" in str(e):
-                print("💡 Error 21211: Invalid 'To' number or not in sandbox")
-                print("   Make sure the recipient has joined your WhatsApp sandbox")
+                logger.error(
+                    "💡 Error 21211: Invalid 'To' number or not in sandbox - "
+                    "make sure the recipient has joined your WhatsApp sandbox"
+                )
             return False
         except Exception as e:
-            print(f"❌ Unexpected error sending WhatsApp message: {e}")
+            logger.error("❌ Unexpected error sending WhatsApp message: %s", e)
             return False
     
     async def send_audio_message(self, to_number: str, audio_path: str) -> bool:
         """Send audio message via WhatsApp."""
         try:
             if not self.client:
-                print("❌ Twilio client not initialized")
+                logger.error("❌ Twilio client not initialized")
                 return False
             
             # Format numbers properly
             formatted_to = self._format_whatsapp_number(to_number)
             formatted_from = self._format_whatsapp_number(self.phone_number)
             
-            print(f"🎵 Attempting to send audio message:")
-            print(f"   From: {formatted_from}")
-            print(f"   To: {formatted_to}")
-            print(f"   Audio: {audio_path}")
+            logger.debug("🎵 Sending audio message from %s to %s: %s", formatted_from, formatted_to, audio_path)
             
             # For sandbox, we need to upload audio to a public URL
             # For now, we'll send a text message indicating audio was generated
@@ -125,20 +131,21 @@ class WhatsAppService:
                           f"Note: In sandbox mode, audio files aren't directly supported. " \
                           f"Your voice response was generated and saved locally."
             
-            message_instance = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    body=audio_message,
-                    from_=formatted_from,
-                    to=formatted_to
+            with span("twilio.messages_create"):
+                message_instance = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: self.client.messages.create(
+                        body=audio_message,
+                        from_=formatted_from,
+                        to=formatted_to
+                    )
                 )
-            )
             
-            print(f"✅ Audio notification sent successfully: {message_instance.sid}")
+            logger.debug("✅ Audio notification sent: %s", message_instance.sid)
             return True
             
         except Exception as e:
-            print(f"❌ Audio message error: {e}")
+            logger.error("❌ Audio message error: %s", e)
             return False
     
     async def download_media(self, media_url: str) -> Optional[bytes]:
@@ -147,22 +154,23 @@ class WhatsAppService:
             # Add Twilio credentials for authenticated download
             auth = (self.account_sid, self.auth_token)
             
-            print(f"📥 Downloading media from: {media_url}")
+            logger.debug("📥 Downloading media from: %s", media_url)
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: requests.get(media_url, auth=auth, timeout=30)
-            )
+            with span("twilio.media_get"):
+                response = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: requests.get(media_url, auth=auth, timeout=30)
+                )
             
             if response.status_code == 200:
-                print(f"✅ Media downloaded: {len(response.content)} bytes")
+                logger.debug("✅ Media downloaded: %d bytes", len(response.content))
                 return response.content
             else:
-                print(f"❌ Media download failed: HTTP {response.status_code}")
+                logger.error("❌ Media download failed: HTTP %s", response.status_code)
                 return None
                 
         except Exception as e:
-            print(f"❌ Media download error: {e}")
+            logger.error("❌ Media download error: %s", e)
             return None
     
     def _is_valid_sandbox_number(self, whatsapp_number: str) -> bool:
@@ -188,8 +196,7 @@ class WhatsAppService:
         if phone.startswith(('+1415', '+1270', '+447700')):
             return True
         
-        print(f"⚠️ Unknown sandbox number pattern: {phone}")
-        print("   If this is your correct Twilio sandbox number, it should still work")
+        logger.debug("⚠️ Unknown sandbox number pattern: %s - letting Twilio validate it", phone)
         return True  # Allow it through, let Twilio validate
     
     def get_sandbox_join_instructions(self) -> str:
@@ -216,7 +223,7 @@ Note: This is a Twilio sandbox for development/demo purposes.
             return True
             
         except Exception as e:
-            print(f"❌ Webhook validation error: {e}")
+            logger.error("❌ Webhook validation error: %s", e)
             return False
 
 # Add this helper function to test Twilio setup
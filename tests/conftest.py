@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import pytest
+
+from config import Config
+
+
+def _new_agent(monkeypatch):
+    pytest.importorskip("httpx")
+    from models.llm_agent import LocalGuideAgent
+
+    monkeypatch.setenv('GROQ_API_KEY', 'test')
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    monkeypatch.setattr(Config, 'LLM_HEDGING_ENABLED', True)
+    monkeypatch.setattr(Config, 'RATE_LIMIT_SHARED', False)
+    return LocalGuideAgent()
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """Factory for a LocalGuideAgent whose providers reply "<provider> reply" after a per-provider delay.
+
+    Returns ``(agent, cancelled)``; ``cancelled`` lists providers whose call was cancelled mid-flight.
+    """
+    def make(delays):
+        agent = _new_agent(monkeypatch)
+        cancelled = []
+
+        def fake_call(provider):
+            async def call(user_message, user_context, conversation_history, attempt=1):
+                try:
+                    await asyncio.sleep(delays[provider])
+                except asyncio.CancelledError:
+                    cancelled.append(provider)
+                    raise
+                return f"{provider} reply"
+            return call
+
+        monkeypatch.setattr(agent, '_call_groq', fake_call('groq'))
+        monkeypatch.setattr(agent, '_call_openai', fake_call('openai'))
+        return agent, cancelled
+
+    return make
+
+
+@pytest.fixture
+def http_agent(monkeypatch):
+    """Factory for a LocalGuideAgent whose provider HTTP requests go to ``handler(provider, payload)``.
+
+    The handler returns an ``httpx.Response`` (it may be async); nothing leaves the process.
+    Pass ``agent`` to reroute an existing agent instead of building a new one.
+    """
+    def make(handler, agent=None):
+        import httpx
+
+        agent = agent or _new_agent(monkeypatch)
+        clients = {}
+
+        def client(provider):
+            async def respond(request):
+                response = handler(provider, json.loads(request.content))
+                return await response if asyncio.iscoroutine(response) else response
+            return clients.setdefault(provider, httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+
+        monkeypatch.setattr(agent.http_clients, 'get', client)
+        return agent
+
+    return make
+
+
+@pytest.fixture
+def sse_response():
+    """Builder for a streamed chat completion: ``sse_response(*tokens, usage=None, error=None)``.
+
+    Sends the tokens as server-sent events (with a keep-alive comment first),
+    then ``usage`` on a final choice-less chunk and ``[DONE]`` - or raises
+    ``error`` mid-body instead of finishing, like a dropped connection.
+    """
+    httpx = pytest.importorskip("httpx")
+
+    def build(*tokens, usage=None, error=None):
+        async def body():
+            yield b": keep-alive\n\n"
+            for token in tokens:
+                await asyncio.sleep(0)
+                yield f"data: {json.dumps({'choices': [{'delta': {'content': token}}]})}\n\n".encode()
+            if error is not None:
+                raise error
+            if usage:
+                yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body())
+
+    return build
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import importlib
+import threading
+
+import pytest
+
+from config import Config
+from services.cache_service import CacheService
+
+pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """app.py without warm-up or voice, on an in-memory cache, with its worker pool running."""
+    monkeypatch.setenv('GROQ_API_KEY', 'test')
+    monkeypatch.setenv('REDIS_URL', 'redis://localhost:1/0')
+    for name, value in (('SERVING_MODE', 'asgi'), ('WARMUP_ENABLED', False), ('VOICE_RESPONSES_ENABLED', False),
+                        ('RATE_LIMIT_SHARED', False), ('USAGE_LOG_FILE', '')):
+        monkeypatch.setattr(Config, name, value)
+
+    module = importlib.import_module('app')
+    monkeypatch.setattr(module.bot, 'cache_service', CacheService())
+    module.message_queue.start()
+    return module
+
+
+def test_duplicate_test_request_replays_the_stored_response(app, monkeypatch):
+    calls = []
+
+    async def process_message(user_id, message, media_url=None, on_segment=None):
+        calls.append(message)
+        return {"input": message, "response": f"reply {len(calls)}"}
+
+    monkeypatch.setattr(app.bot, 'process_message', process_message)
+    request = {"user_id": "+911111111111", "message": "Namaste", "message_id": "SM-dup"}
+
+    first, status = asyncio.run(app.run_test_message(request))
+    assert status == 200 and first["response"] == "reply 1"
+
+    again, status = asyncio.run(app.run_test_message(request))
+    assert status == 200 and again == {**first, "duplicate": True}
+    assert calls == ["Namaste"]
+
+
+def test_webhook_is_acknowledged_before_the_reply_is_generated(app, monkeypatch):
+    release, handled = threading.Event(), []
+
+    async def slow_handler(from_number, message_body, media_url=None, message_sid=None):
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 5)
+        handled.append(message_sid)
+
+    monkeypatch.setattr(app, 'handle_incoming_message', slow_handler)
+    form = {"From": "whatsapp:+911111111111", "Body": "Namaste", "MessageSid": "SM-ack"}
+
+    assert app.accept_webhook(form) == ("OK", 200)
+    assert app.accept_webhook(form) == ("OK", 200)  # Twilio redelivery, not queued again
+    assert handled == []
+
+    release.set()
+    # Same user, so this runs after the handler - and finds it finished
+    app.message_queue.submit(asyncio.sleep, 0, key="+911111111111").result(timeout=5)
+    assert handled == ["SM-ack"]
+
+
+def test_asgi_webhook_acknowledges_through_the_shared_loop(app, monkeypatch):
+    testclient = pytest.importorskip("starlette.testclient")
+    asgi = importlib.import_module('asgi')
+    handled = []
+
+    async def handler(from_number, message_body, media_url=None, message_sid=None):
+        handled.append(message_body)
+
+    monkeypatch.setattr(app, 'handle_incoming_message', handler)
+    response = testclient.TestClient(asgi.asgi_app).post(
+        "/webhook", data={"From": "whatsapp:+912222222222", "Body": "Hi", "MessageSid": "SM-asgi"}
+    )
+
+    assert response.status_code == 200 and response.text == "OK"
+    app.message_queue.submit(asyncio.sleep, 0, key="+912222222222").result(timeout=5)
+    assert handled == ["Hi"]
+
+
+def test_streamed_segments_go_out_in_order_however_long_each_send_takes(app, http_agent, sse_response, monkeypatch):
+    monkeypatch.setattr(Config, 'STREAM_MIN_SEGMENT_CHARS', 10)
+    http_agent(lambda provider, payload: sse_response(
+        "Namaste! Welcome to Delhi.", " The Red Fort opens at 9.", " Shall I plan your day?"
+    ), agent=app.bot.llm_agent)
+    delivered = []
+
+    async def send_segment(segment, audio_path):
+        # The first send is the slowest, so later segments are ready before it's done
+        await asyncio.sleep(0.05 if not delivered else 0)
+        delivered.append(segment)
+
+    text, count = asyncio.run(app.bot._stream_reply(
+        "Plan my day in Old Delhi", [], {"detected_language": "en", "current_location": "Delhi"}, False, send_segment
+    ))
+
+    assert delivered == ["Namaste! Welcome to Delhi.", "The Red Fort opens at 9.", "Shall I plan your day?"]
+    assert (text, count) == (" ".join(delivered), 3)
+
+
+def test_readiness_stays_503_when_whisper_failed_to_load(app, monkeypatch):
+    from services.warmup import WarmupManager
+
+    warmup = WarmupManager()
+    warmup.add_step("voice", lambda: 1 / 0, required=True)
+    warmup.start()
+    warmup.wait(5)
+    monkeypatch.setattr(app, 'warmup', warmup)
+
+    body, status = app.readiness_info()
+    assert status == 503 and body["status"] == "unavailable"
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import time
+
+from services.cache_service import CacheService
+
+
+def memory_cache(monkeypatch, **settings) -> CacheService:
+    """A CacheService on the in-memory fallback (nothing listens on port 1)."""
+    monkeypatch.setenv('REDIS_URL', 'redis://localhost:1/0')
+    cache = CacheService()
+    assert cache.redis_client is None
+    for name, value in settings.items():
+        setattr(cache, name, value)
+    return cache
+
+
+def test_message_sid_is_claimed_once_until_released(monkeypatch):
+    cache = memory_cache(monkeypatch)
+
+    assert cache.claim_message("SM1")
+    assert not cache.claim_message("SM1")
+    assert cache.claim_message("SM2")
+
+    cache.release_message("SM1")
+    assert cache.claim_message("SM1")
+    assert cache.claim_message(None)  # no SID, nothing to deduplicate
+
+
+def test_stored_response_is_returned_for_a_duplicate(monkeypatch):
+    cache = memory_cache(monkeypatch)
+    cache.claim_message("SM1")
+    assert cache.get_message_response("SM1") is None  # still processing
+
+    cache.cache_message_response("SM1", {"response": "Namaste!"})
+    assert cache.get_message_response("SM1") == {"response": "Namaste!"}
+    assert not cache.claim_message("SM1")
+
+
+def test_in_memory_sids_are_pruned_and_bounded(monkeypatch):
+    cache = memory_cache(monkeypatch, message_dedup_max_entries=3)
+
+    cache.claim_message("old", ttl=1)
+    time.sleep(1.1)
+    cache.claim_message("new")
+    assert list(cache._message_sids) == ["message_sid:new"]
+
+    for sid in ("a", "b", "c", "d"):
+        cache.claim_message(sid)
+    assert len(cache._message_sids) == 3
+    assert cache.claim_message("new")  # oldest evicted first
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import time
+
+from services.content_store import ContentStore
+
+
+def variants(*texts):
+    return [{"text": text, "audio": None, "generated_at": time.time()} for text in texts]
+
+
+def test_finds_place_named_in_message_or_current_location(tmp_path):
+    store = ContentStore(str(tmp_path))
+    store.put_entry("Delhi", "en", ["delhi", "new delhi", "दिल्ली"], "v1", variants("Delhi story"), complete=True)
+    store.put_entry("Red Fort", "en", [], "v1", variants("Red Fort story"), complete=True)
+
+    # A second process (the bot) sees what the job wrote
+    live = ContentStore(str(tmp_path))
+    assert live.find("Tell me a story about the Red Fort in Delhi!", "en")["text"] == "Red Fort story"
+    assert live.find("tell me a story", "en", location="Delhi")["text"] == "Delhi story"
+    assert live.find("story about Goa", "en") is None
+    assert live.find("Tell me a story about Delhi", "hi") is None
+    assert live.stats()["hits"] == 2
+
+
+def test_current_location_only_stands_in_when_no_place_is_named(tmp_path):
+    store = ContentStore(str(tmp_path))
+    store.put_entry("Delhi", "en", ["delhi"], "v1", variants("Delhi story"), complete=True)
+
+    live = ContentStore(str(tmp_path))
+    assert live.find("Tell me a story about Goa", "en", location="Delhi") is None
+    assert live.find("कोई कहानी सुनाओ गोवा की", "en", location="Delhi") is None
+    assert live.find("Tell me a story", "en", location="Delhi")["text"] == "Delhi story"
+
+
+def test_incomplete_changed_or_old_pairs_need_refresh(tmp_path):
+    store = ContentStore(str(tmp_path))
+    assert store.needs_refresh("Jaipur", "hi", "v1", 2, max_age=3600)
+
+    store.put_entry("Jaipur", "hi", [], "v1", variants("पहली कहानी"), complete=False)
+    assert store.needs_refresh("Jaipur", "hi", "v1", 2, max_age=3600)
+
+    store.put_entry("Jaipur", "hi", [], "v1", variants("पहली कहानी", "दूसरी कहानी"), complete=True)
+    assert not store.needs_refresh("Jaipur", "hi", "v1", 2, max_age=3600)
+    assert store.needs_refresh("Jaipur", "hi", "v2", 2, max_age=3600)
+    assert store.needs_refresh("Jaipur", "hi", "v1", 2, max_age=-1)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import uuid
+
+from models.conversation_memory import ConversationMemory
+from services.cache_service import CacheService
+from utils.token_estimator import estimate_tokens, truncate_to_tokens
+
+
+class SummarizingAgent:
+    max_history_messages = 6
+
+    def __init__(self):
+        self.calls = []
+
+    async def summarize(self, previous_summary, messages, max_tokens):
+        self.calls.append(messages)
+        return " ".join(filter(None, [previous_summary] + [m['content'] for m in messages if m['role'] == 'user']))
+
+
+def make_memory():
+    cache = CacheService()
+    agent = SummarizingAgent()
+    memory = ConversationMemory(cache, agent)
+    memory.enabled = True
+    memory.recent_messages = 4
+    memory.token_budget = 600
+    return memory, cache, agent, f"+91{uuid.uuid4().int % 10**10:010d}"
+
+
+def add_turns(cache, user_id, count, text="Tell me about the Red Fort"):
+    for i in range(count):
+        cache.update_conversation(user_id, "user", f"{text} {i}")
+        cache.update_conversation(user_id, "assistant", f"Reply {i}")
+
+
+def test_indic_text_costs_more_tokens_than_english():
+    assert estimate_tokens("Tell me about the Red Fort") < estimate_tokens("लाल किले के बारे में बताइए")
+    assert estimate_tokens(truncate_to_tokens("word " * 200, 20)) <= 21
+
+
+def test_older_turns_fold_into_summary_and_recent_stay_verbatim():
+    memory, cache, agent, user_id = make_memory()
+    add_turns(cache, user_id, 4)
+
+    assert asyncio.run(memory.compact(user_id))
+    assert len(agent.calls[0]) == 4  # the two turns before the verbatim window
+
+    history = memory.prompt_history(user_id, cache.get_conversation(user_id))
+    assert history[0]["role"] == "system"
+    assert "Red Fort 0" in history[0]["content"] and "Red Fort 1" in history[0]["content"]
+    assert [m["content"] for m in history[1:]] == ["Tell me about the Red Fort 2", "Reply 2",
+                                                   "Tell me about the Red Fort 3", "Reply 3"]
+
+    # Nothing new to fold until more turns slide out of the window
+    assert not asyncio.run(memory.compact(user_id))
+
+
+def test_history_respects_token_budget():
+    memory, cache, agent, user_id = make_memory()
+    memory.token_budget = 60
+    add_turns(cache, user_id, 5, text="लाल किले के बारे में विस्तार से बताइए")
+
+    history = memory.prompt_history(user_id, cache.get_conversation(user_id))
+
+    assert 0 < len(history) < 4
+    assert sum(estimate_tokens(m["content"]) + 4 for m in history) <= 60
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from models.intent_router import Intent, IntentRouter, is_story_request
+
+router = IntentRouter({'en': {'interactive_prompts': ["Where to next? 🌟"]}})
+
+
+def test_recognizes_trivial_messages_in_any_script():
+    assert router.classify("Hiii!!") == Intent('greeting')
+    assert router.classify("thank you so much ji 🙏") == Intent('thanks')
+    assert router.classify("ok thanks, bye") == Intent('goodbye')
+    assert router.classify("धन्यवाद") == Intent('thanks', 'hi')
+    assert router.classify("வணக்கம்") == Intent('greeting', 'ta')
+    assert router.classify("ঠিক আছে") == Intent('acknowledgement', 'bn')
+    assert router.classify("👍🙏") == Intent('emoji')
+
+
+def test_real_questions_take_the_full_pipeline():
+    for message in ("Hi, what should I see in Delhi?", "ok tell me about Jaipur", "thanks! and the best time for Goa?",
+                    "नमस्ते, लाल किले के बारे में बताओ", "...", ""):
+        assert router.classify(message) is None
+
+
+def test_replies_come_from_languages_json_and_templates():
+    assert router.reply(Intent('thanks'), 'ml') == "സാരമില്ല! അടുത്തതായി എന്താണ് അറിയേണ്ടത്?"
+    assert router.reply(Intent('goodbye'), 'xx').startswith("Goodbye!")
+    assert router.reply(Intent('acknowledgement'), 'en') == "Where to next? 🌟"
+
+
+def test_story_requests_match_whole_words():
+    for message in ("Tell me a story about Hampi", "कहानी सुनाओ", "ஒரு கதை சொல்லுங்கள்", "kahani sunao!"):
+        assert is_story_request(message)
+    for message in ("What is the history of Hampi?", "Where can I watch Kathakali?", "storyline of Baahubali"):
+        assert not is_story_request(message)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import time
+
+from models.knowledge_index import KnowledgeIndex
+
+index = KnowledgeIndex(min_coverage=0.75, max_query_words=12)
+
+
+def test_answers_factual_questions_about_known_places():
+    assert "September to March" in index.answer("Best time to visit Munnar?", "en")
+    assert "November to February" in index.answer("when should I go to Goa", "en")
+    assert "2276m" in index.answer("how high is Shimla", "en")
+    assert index.answer("Where is the Red Fort?", "en") == "Red Fort is in Delhi."
+
+
+def test_vague_or_unknown_questions_go_to_the_llm():
+    for message in ("Is Munnar good in monsoon?", "Plan a 3 day trip to Goa", "best time to visit Paris",
+                    "tell me about Kerala", "hello"):
+        assert index.answer(message, "en") is None
+    assert index.answer("best time to visit Munnar", "ta") is None
+
+
+def test_lookup_is_fast():
+    started_at = time.perf_counter()
+    for _ in range(100):
+        index.answer("best time to visit Munnar", "en")
+    assert (time.perf_counter() - started_at) / 100 < 0.01
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import dataclasses
+
+import pytest
+
+from utils.language_registry import LanguageRegistry, get_language_registry
+
+
+def test_records_are_precomputed_from_languages_json():
+    registry = get_language_registry()
+
+    hindi = registry.get('hi')
+    assert hindi.voice_available
+    assert hindi.gtts_code == 'hi'
+    assert hindi.whisper_code == 'hindi'
+    assert hindi.google_stt_code == 'hi-IN'
+    assert registry.greeting('hi', 'formal') == 'भारत में आपका स्वागत है'
+
+    # Odia has TTS but no STT
+    assert registry.get('or').tts_supported and not registry.get('or').voice_available
+    assert 'or' not in registry.voice_codes
+
+
+def test_registry_is_shared_and_immutable():
+    registry = get_language_registry()
+    assert get_language_registry() is registry
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        registry.get('en').name = 'Changed'
+    with pytest.raises(TypeError):
+        registry.get('en').voice_settings['speed'] = 'slow'
+    with pytest.raises(TypeError):
+        registry.languages['en']['name'] = 'Changed'
+    with pytest.raises(TypeError):
+        registry.languages['xx'] = {}
+
+
+def test_unknown_language_falls_back_to_english_greeting():
+    registry = LanguageRegistry({
+        'supported_languages': {'en': {'name': 'English'}},
+        'cultural_greetings': {'casual': {'en': 'Hey there!'}}
+    })
+
+    assert registry.get('xx') is None
+    assert registry.greeting('xx', 'casual') == 'Hey there!'
+    assert registry.greeting('xx', 'missing_style') == 'Welcome!'
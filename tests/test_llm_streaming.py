@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from config import Config
+
+CONTEXT = {"detected_language": "en", "current_location": "Delhi"}
+TOKENS = ("The Red Fort", " was built in 1648.", " It housed", " Mughal emperors!", " Want", " more?")
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    monkeypatch.setattr(Config, 'STREAM_MIN_SEGMENT_CHARS', 10)
+
+
+def cached(agent):
+    agent.response_cache.enabled = True
+    agent.response_cache.variants = 1
+    return agent
+
+
+def collect(agent, message="Tell me about the Red Fort"):
+    async def run():
+        return [segment async for segment in agent.stream_response(message, [], CONTEXT)]
+    return asyncio.run(run())
+
+
+def test_sse_tokens_come_out_as_sentence_segments(http_agent, sse_response, streaming, monkeypatch):
+    agent = cached(http_agent(
+        lambda provider, payload: sse_response(*TOKENS, usage={"prompt_tokens": 321, "completion_tokens": 17})
+    ))
+    recorded = []
+    monkeypatch.setattr(agent.usage, 'record', lambda **call: recorded.append(call))
+
+    assert collect(agent) == ["The Red Fort was built in 1648.", "It housed Mughal emperors!", "Want more?"]
+    assert [(call['provider'], call['prompt_tokens'], call['estimated']) for call in recorded] == [("groq", 321, False)]
+    # A reply that streamed through completely is cached, and served as segments next time
+    assert collect(agent) == ["The Red Fort was built in 1648.", "It housed Mughal emperors!", "Want more?"]
+    assert len(recorded) == 1
+
+
+def test_provider_failing_before_its_first_segment_is_replaced(http_agent, sse_response, streaming):
+    httpx = pytest.importorskip("httpx")
+
+    def handler(provider, payload):
+        if provider == 'groq':
+            return httpx.Response(503, text="over capacity")
+        return sse_response("Namaste from OpenAI.", " Anything else?")
+
+    agent = http_agent(handler)
+    assert collect(agent) == ["Namaste from OpenAI.", "Anything else?"]
+    assert agent.breakers['groq'].consecutive_failures == 1
+
+
+def test_mid_stream_break_ends_the_reply_without_failover(http_agent, sse_response, streaming):
+    httpx = pytest.importorskip("httpx")
+    called = []
+
+    def handler(provider, payload):
+        called.append(provider)
+        return sse_response(*TOKENS[:2], " It hou", error=httpx.ReadError("connection reset"))
+
+    agent = cached(http_agent(handler))
+    assert collect(agent) == ["The Red Fort was built in 1648."]
+    assert called == ['groq']
+    assert agent.breakers['groq'].consecutive_failures == 1
+    assert agent.response_cache.stats()['entries'] == 0
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from utils.logger import JsonFormatter, RequestContextFilter
+from utils.tracing import trace
+
+
+def record(level: int, message: str = "hello") -> logging.LogRecord:
+    return logging.LogRecord("citychai.test", level, __file__, 1, message, None, None)
+
+
+def test_records_carry_the_request_id_and_format_as_json():
+    log_filter = RequestContextFilter()
+    with trace("test", request_id="req-42"):
+        entry = record(logging.INFO, "नमस्ते")
+        assert log_filter.filter(entry)
+
+    line = json.loads(JsonFormatter().format(entry))
+    assert line["request_id"] == "req-42" and line["message"] == "नमस्ते" and line["level"] == "INFO"
+
+    outside = record(logging.INFO)
+    log_filter.filter(outside)
+    assert outside.request_id == "-"
+
+
+def test_debug_sampling_keeps_or_drops_a_whole_request():
+    assert not RequestContextFilter(0.0).filter(record(logging.DEBUG))
+    assert RequestContextFilter(0.0).filter(record(logging.WARNING))
+
+    log_filter = RequestContextFilter(0.5)
+    for request in range(20):
+        with trace("test", request_id=f"req-{request}"):
+            kept = {log_filter.filter(record(logging.DEBUG)) for _ in range(10)}
+        assert len(kept) == 1
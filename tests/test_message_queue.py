@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+from services.message_queue import MessageQueue, QueueFullError
+
+
+def test_same_user_messages_run_in_order():
+    """Messages from one user must never overlap or reorder."""
+    queue = MessageQueue(num_workers=4)
+    events = []
+
+    async def handle(user_id, index):
+        events.append((user_id, index, "start"))
+        await asyncio.sleep(0.02)
+        events.append((user_id, index, "end"))
+        return index
+
+    futures = [queue.submit(handle, "+911111111111", i, key="+911111111111") for i in range(5)]
+    results = [f.result(timeout=5) for f in futures]
+
+    assert results == [0, 1, 2, 3, 4]
+    expected = []
+    for i in range(5):
+        expected += [("+911111111111", i, "start"), ("+911111111111", i, "end")]
+    assert events == expected
+
+
+def test_different_users_run_in_parallel():
+    """Separate users share the pool instead of waiting on each other."""
+    queue = MessageQueue(num_workers=4)
+
+    async def handle(user_id):
+        await asyncio.sleep(0.2)
+        return user_id
+
+    start_time = time.time()
+    futures = [queue.submit(handle, f"user_{i}", key=f"user_{i}") for i in range(4)]
+    results = [f.result(timeout=5) for f in futures]
+    elapsed = time.time() - start_time
+
+    assert results == ["user_0", "user_1", "user_2", "user_3"]
+    assert elapsed < 0.6
+    assert queue.stats()["completed"] == 4
+
+
+def test_queue_rejects_when_full():
+    queue = MessageQueue(num_workers=1, max_size=1)
+
+    async def slow():
+        await asyncio.sleep(0.2)
+
+    queue.submit(slow)
+    time.sleep(0.05)  # Let the only worker pick up the first job
+    queue.submit(slow)
+
+    try:
+        queue.submit(slow)
+        assert False, "Expected QueueFullError"
+    except QueueFullError:
+        assert queue.stats()["rejected"] == 1
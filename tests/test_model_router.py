@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from config import Config
+from models.model_router import ModelRouter
+
+router = ModelRouter(default_max_tokens=300)
+
+
+def test_demanding_messages_get_the_large_model():
+    story = router.route("Tell me a story about Hampi", {'detected_language': 'en'})
+    assert (story.tier, story.max_tokens, story.reason) == ('large', Config.STORY_MAX_TOKENS, 'story')
+    assert router.route("Hampi " * 50, {'detected_language': 'en'}).reason == 'long_message'
+    assert router.route("what else is there nearby for us to see",
+                        {'detected_language': 'en', 'conversation_turns': 12}).reason == 'deep_conversation'
+    assert router.model('groq', 'large') == Config.GROQ_LARGE_MODEL
+
+
+def test_simple_messages_get_the_small_model_and_a_budget_per_script():
+    short = router.route("best food in Delhi?", {'detected_language': 'en'})
+    assert (short.tier, short.max_tokens, short.reason) == ('small', Config.SHORT_REPLY_MAX_TOKENS, 'short_message')
+    hindi = router.route("दिल्ली में सबसे अच्छा खाना?", {'detected_language': 'hi'})
+    assert hindi.tier == 'small' and hindi.max_tokens == int(Config.SHORT_REPLY_MAX_TOKENS * 1.5)
+    assert router.route("I am planning a trip with my parents next month, where should we go",
+                        {'detected_language': 'en'}).max_tokens == 300
+
+
+def test_history_and_kathakali_questions_are_not_stories():
+    for message in ("history of Hampi?", "Where can I watch Kathakali?"):
+        route = router.route(message, {'detected_language': 'en'})
+        assert route.tier == 'small' and route.reason != 'story'
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from models.prompt_templates import MIN_USER_MESSAGE_TOKENS, PromptTemplates
+from utils.token_estimator import estimate_message_tokens, estimate_tokens
+
+templates = PromptTemplates(token_budget=600)
+context = {'detected_language': 'hi', 'current_location': 'Delhi', 'mood': 'excited', 'conversation_turns': 3}
+
+
+def test_system_prompt_is_static_and_message_is_sent_once():
+    messages = templates.build("लाल किले के बारे में बताओ", context, [])
+    other = templates.build("Tell me about Goa", dict(context, current_location='Goa'), [])
+    assert messages[0] is other[0] and "Hindi" in messages[0]['content']
+    assert "Delhi" not in messages[0]['content'] and "Delhi" in messages[-2]['content']
+    assert sum("लाल किले" in msg['content'] for msg in messages) == 1
+    assert templates.system_message('xx') is templates.system_message('en')
+
+
+def test_prompt_is_trimmed_to_the_budget_oldest_history_first():
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "बहुत अच्छा " * 20}
+               for i in range(6)]
+    messages = templates.build("और बताओ", context, history)
+    assert estimate_message_tokens(messages) <= 600
+    assert messages[-3]['content'] == history[-1]['content'] and history[0]['content'] not in [m['content'] for m in messages]
+    assert templates.estimate("और बताओ", context, history) == 600
+
+    huge = templates.build("word " * 2000, context, history)
+    assert [msg['role'] for msg in huge] == ['system', 'user']
+    assert MIN_USER_MESSAGE_TOKENS <= estimate_tokens(huge[-1]['content']) < 600
+
+
+def test_token_estimates_follow_the_script():
+    assert estimate_tokens("hello world!") == 3
+    assert estimate_tokens("வணக்கம்") > estimate_tokens("नमस्ते") > estimate_tokens("hello")
+    assert estimate_tokens("🙏🙏") == 4
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+from config import Config
+from models.provider_health import CircuitBreaker, ProviderLatencyTracker
+
+
+def test_tracker_ranks_by_recent_latency():
+    tracker = ProviderLatencyTracker(window=10, min_samples=3, prior=2.0)
+
+    # No data yet: configured order wins
+    assert tracker.rank(['groq', 'openai']) == ['groq', 'openai']
+
+    for _ in range(5):
+        tracker.record('groq', 4.0)
+        tracker.record('openai', 0.5)
+    assert tracker.rank(['groq', 'openai']) == ['openai', 'groq']
+    assert tracker.hedge_delay('openai') == 0.5
+    assert tracker.hedge_delay('groq') == 4.0
+
+    # Failures count as the full timeout
+    for _ in range(10):
+        tracker.record('openai', 0.1, ok=False)
+    assert tracker.rank(['groq', 'openai']) == ['groq', 'openai']
+    assert tracker.stats()['openai']['failures'] == 10
+
+
+def test_hedge_uses_backup_when_primary_is_slow_and_cancels_primary(fake_agent, monkeypatch):
+    agent, cancelled = fake_agent({'groq': 1.0, 'openai': 0.01})
+    agent.latency.prior = 0.05  # hedge delay while there's no data
+
+    reply = asyncio.run(agent._get_provider_response("Red Fort", [], {}))
+
+    assert reply == "openai reply"
+    assert cancelled == ['groq']
+
+
+def test_no_hedge_when_primary_answers_in_time(fake_agent, monkeypatch):
+    agent, cancelled = fake_agent({'groq': 0.01, 'openai': 0.01})
+
+    reply = asyncio.run(agent._get_provider_response("Red Fort", [], {}))
+
+    assert reply == "groq reply"
+    assert cancelled == []
+    assert 'openai' not in agent.latency.stats()
+
+
+def test_breaker_opens_skips_and_recovers_through_a_probe():
+    breaker = CircuitBreaker("groq", failure_threshold=2, slow_call_seconds=5, cooldown=0.05)
+
+    breaker.record_failure("timeout")
+    breaker.record_success(6.0)  # a latency spike counts too
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.available and not breaker.try_acquire()
+
+    time.sleep(0.06)
+    assert breaker.try_acquire()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.try_acquire()  # one probe at a time
+
+    breaker.record_success(0.4)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("groq", failure_threshold=1, slow_call_seconds=5, cooldown=0.05)
+    breaker.record_failure("500")
+    time.sleep(0.06)
+
+    assert breaker.try_acquire()
+    breaker.record_failure("500")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+
+
+def test_open_circuit_skips_provider_without_waiting(fake_agent, monkeypatch):
+    agent, cancelled = fake_agent({'groq': 5.0, 'openai': 0.01})
+    monkeypatch.setattr(Config, 'LLM_HEDGING_ENABLED', False)
+    for _ in range(agent.breakers['groq'].failure_threshold):
+        agent.breakers['groq'].record_failure("timeout")
+
+    started_at = time.perf_counter()
+    reply = asyncio.run(agent._get_provider_response("Red Fort", [], {}))
+
+    assert reply == "openai reply"
+    assert time.perf_counter() - started_at < 1
+    assert agent.provider_status()['groq']['circuit']['state'] == 'open'
+    assert agent.working_provider == 'openai'
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+from config import Config
+from services.rate_limiter import RateLimiter
+
+
+def make_limiter(monkeypatch, limits):
+    monkeypatch.setattr(Config, 'RATE_LIMIT_SHARED', False)
+    return RateLimiter(limits=limits)
+
+
+def test_burst_up_to_capacity_then_denied_without_waiting(monkeypatch):
+    limiter = make_limiter(monkeypatch, {'groq': {'requests': 3}})
+
+    async def burst():
+        return [await limiter.acquire('groq', max_wait=0) for _ in range(4)]
+
+    assert asyncio.run(burst()) == [True, True, True, False]
+    assert limiter.stats()['denied'] == 1
+
+
+def test_caller_queues_until_refill(monkeypatch):
+    # 600/min refills one request every 0.1s
+    limiter = make_limiter(monkeypatch, {'groq': {'requests': 600}})
+    limiter._local._state['llm_rate:groq:requests'] = (0.0, time.monotonic())
+
+    started_at = time.perf_counter()
+    assert asyncio.run(limiter.acquire('groq', max_wait=1))
+    assert 0.05 < time.perf_counter() - started_at < 0.5
+
+
+def test_token_budget_applies_alongside_requests(monkeypatch):
+    limiter = make_limiter(monkeypatch, {'openai': {'requests': 100, 'tokens': 1000}})
+
+    async def calls():
+        return [await limiter.acquire('openai', tokens=400, max_wait=0) for _ in range(3)]
+
+    assert asyncio.run(calls()) == [True, True, False]
+    # Unlimited providers are never held back
+    assert asyncio.run(limiter.acquire('other', max_wait=0))
+
+
+def test_spills_over_to_backup_when_primary_is_out_of_budget(fake_agent, monkeypatch):
+    agent, cancelled = fake_agent({'groq': 0.01, 'openai': 0.01})
+    monkeypatch.setattr(Config, 'LLM_HEDGING_ENABLED', False)
+    agent.rate_limiter.limits = {'groq': {'requests': 1}, 'openai': {'requests': 100}}
+
+    async def two_calls():
+        return [await agent._get_provider_response("Red Fort", [], {}) for _ in range(2)]
+
+    assert asyncio.run(two_calls()) == ["groq reply", "openai reply"]
+    # Being rate limited is not a provider failure
+    assert agent.breakers['groq'].consecutive_failures == 0
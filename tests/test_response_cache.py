@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+from config import Config
+from services.response_cache import ResponseCache, normalize_message
+
+
+def test_normalization_ignores_case_punctuation_and_filler():
+    assert normalize_message("Tell me about the Red Fort!!") == normalize_message("tell about red fort please 🙏")
+    assert normalize_message("लाल किले के बारे में बताइए?") == "लाल किले के बारे में बताइए"
+
+
+def test_key_includes_language_and_location():
+    cache = ResponseCache(max_entries=10, ttl=60, variants=1)
+    hindi_delhi = cache.key_for("Red Fort?", {"detected_language": "hi", "current_location": "Delhi"})
+
+    assert hindi_delhi == cache.key_for("red fort", {"detected_language": "hi", "current_location": "delhi"})
+    assert hindi_delhi != cache.key_for("red fort", {"detected_language": "en", "current_location": "Delhi"})
+    assert cache.key_for("x" * 500, {}) is None
+
+
+def test_serves_one_of_n_variants_once_collected():
+    cache = ResponseCache(max_entries=10, ttl=60, variants=2)
+    key = cache.key_for("Red Fort", {"detected_language": "en"})
+
+    assert cache.get(key) is None
+    cache.put(key, "first")
+    assert cache.get(key) is None  # still collecting variants
+    cache.put(key, "second")
+
+    assert {cache.get(key) for _ in range(50)} == {"first", "second"}
+    assert cache.stats()["hits"] == 50
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache(max_entries=2, ttl=60, variants=1)
+    keys = [cache.key_for(q, {}) for q in ("red fort", "taj mahal", "gateway of india")]
+
+    cache.put(keys[0], "a")
+    cache.put(keys[1], "b")
+    cache.get(keys[0])  # refresh - "taj mahal" is now least recently used
+    cache.put(keys[2], "c")
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a" and cache.get(keys[2]) == "c"
+    assert cache.stats()["evictions"] == 1
+
+    expired = ResponseCache(max_entries=2, ttl=-1, variants=1)
+    expired.put(keys[0], "a")
+    assert expired.get(keys[0]) is None
+
+
+def test_follow_ups_are_never_cached():
+    cache = ResponseCache(max_entries=10, ttl=60, variants=1)
+    context = {"detected_language": "en", "current_location": "Delhi"}
+    history = [{"role": "user", "content": "Red Fort?"}, {"role": "assistant", "content": "Built in 1648..."}]
+
+    cache.put(cache.key_for("tell me more", context), "first-turn reply")
+    assert cache.key_for("tell me more", context, history) is None
+    assert cache.get(cache.key_for("tell me more", context, history)) is None
+
+
+def test_follow_up_with_history_misses_the_response_cache(fake_agent, monkeypatch):
+    agent, cancelled = fake_agent({'groq': 0.01, 'openai': 0.01})
+    monkeypatch.setattr(Config, 'LLM_HEDGING_ENABLED', False)
+    agent.response_cache.enabled = True
+    agent.response_cache.variants = 1
+    context = {"detected_language": "en", "current_location": "Delhi"}
+    history = [{"role": "user", "content": "Red Fort?"}, {"role": "assistant", "content": "Built in 1648..."}]
+
+    asyncio.run(agent.get_response("yes", [], context))
+    assert agent.response_cache.get(agent.response_cache.key_for("yes", context)) == "groq reply"
+
+    asyncio.run(agent.get_response("yes", history, context))
+    assert agent.latency.stats()['groq']['samples'] == 2
+    assert agent.response_cache.stats()['entries'] == 1
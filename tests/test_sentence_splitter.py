@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from utils.sentence_splitter import SentenceChunker
+
+
+def feed_tokens(chunker, text):
+    segments = []
+    for word in text.split(' '):
+        segments.extend(chunker.feed(word + ' '))
+    return segments
+
+
+def test_splits_at_sentence_boundaries_and_merges_short_ones():
+    chunker = SentenceChunker(min_chars=40)
+    segments = feed_tokens(chunker, "The Red Fort is magnificent! Built by Shah Jahan in 1648, it housed Mughal emperors. Want more?")
+
+    # "magnificent!" alone is too short, so it rides along with the next sentence
+    assert segments == ["The Red Fort is magnificent! Built by Shah Jahan in 1648, it housed Mughal emperors."]
+    assert chunker.flush() == "Want more?"
+    assert chunker.flush() == ""
+
+
+def test_decimals_do_not_split_and_indic_danda_does():
+    chunker = SentenceChunker(min_chars=10)
+    assert chunker.feed("It is 3.5 km away") == []
+
+    segments = feed_tokens(SentenceChunker(min_chars=10), "लाल किला शानदार है। शाहजहाँ ने 1648 में बनवाया था। क्या")
+    assert segments == ["लाल किला शानदार है।", "शाहजहाँ ने 1648 में बनवाया था।"]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from config import Config
+from utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_with_same_key_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return f"reply for {key}"
+
+    async def burst():
+        return await asyncio.gather(
+            *[flight.do("red fort", lambda: work("red fort")) for _ in range(10)],
+            flight.do("taj mahal", lambda: work("taj mahal"))
+        )
+
+    results = asyncio.run(burst())
+
+    assert results == ["reply for red fort"] * 10 + ["reply for taj mahal"]
+    assert calls == ["red fort", "taj mahal"]
+    assert flight.in_flight() == 0
+
+
+def test_errors_reach_every_waiter_and_cancelled_waiter_does_not_cancel_others():
+    flight = SingleFlight("test")
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("provider down")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        results = await asyncio.gather(flight.do("k", failing), flight.do("k", failing), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+        impatient = asyncio.ensure_future(flight.do("s", slow))
+        patient = asyncio.ensure_future(flight.do("s", slow))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_identical_first_turn_questions_share_one_call(fake_agent, monkeypatch):
+    agent, cancelled = fake_agent({'groq': 0.05, 'openai': 0.05})
+    monkeypatch.setattr(Config, 'LLM_HEDGING_ENABLED', False)
+    agent.response_cache.enabled = False
+
+    async def burst():
+        return await asyncio.gather(*[
+            agent.get_response(text, [], {"detected_language": "en", "current_location": "Delhi"})
+            for text in ["Tell me about the Red Fort", "tell me about red fort!"] * 5
+        ])
+
+    assert asyncio.run(burst()) == ["groq reply"] * 10
+    assert agent.latency.stats()['groq']['samples'] == 1
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.metrics import MetricsRegistry
+from utils.tracing import current_trace, run_blocking, span, trace
+
+
+def test_spans_are_recorded_on_the_active_trace():
+    with trace("test", request_id="req-1") as request_trace:
+        with span("detect_language"):
+            time.sleep(0.01)
+        with trace("nested") as joined:
+            assert joined is request_trace  # inner code joins the request's trace
+            with span("llm"):
+                pass
+        with pytest.raises(ValueError):
+            with span("tts"):
+                raise ValueError("boom")
+
+    assert current_trace() is None
+    timings = request_trace.timings()
+    assert timings["request_id"] == "req-1"
+    assert list(timings["stages"]) == ["detect_language", "llm", "tts"]
+    assert timings["stages"]["detect_language"] >= 10
+    assert [s["ok"] for s in timings["spans"]] == [True, True, False]
+
+
+def test_metrics_render_prometheus_buckets_and_labels():
+    registry = MetricsRegistry(prefix="test")
+    registry.counter("replies_total", "Replies").inc(stage="llm")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value, stage="llm")
+    registry.gauge("depth", "Queue depth", lambda: 3)
+
+    text = registry.render_prometheus()
+    assert 'test_replies_total{stage="llm"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="llm",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="llm",le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="llm",le="+Inf"} 3' in text
+    assert "test_depth 3" in text
+    assert registry.snapshot()['test_latency_seconds']['{stage="llm"}']['p50'] == 1.0
+
+
+def test_run_blocking_leaves_the_loop_and_keeps_the_trace():
+    def blocking():
+        with span("redis"):
+            time.sleep(0.01)
+        return threading.current_thread(), current_trace()
+
+    async def handle():
+        with trace("test", request_id="req-2") as request_trace:
+            thread, seen = await run_blocking(blocking)
+            return request_trace, thread, seen
+
+    request_trace, thread, seen = asyncio.run(handle())
+    assert thread is not threading.current_thread()
+    assert seen is request_trace
+    assert list(request_trace.timings()["stages"]) == ["redis"]
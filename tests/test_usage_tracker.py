@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import pytest
+
+from config import Config
+from services.usage_tracker import UsageTracker
+from utils.tracing import trace
+
+
+def test_totals_and_cost_by_language_and_provider():
+    usage = UsageTracker(log_file="")
+    usage.record("groq", "llama3-8b-8192", 0.4, language="hi", prompt_tokens=1_000_000, completion_tokens=0)
+    usage.record("openai", "gpt-3.5-turbo", 1.2, language="hi", prompt_tokens=0, completion_tokens=1_000_000)
+    usage.record("openai", "gpt-3.5-turbo", 0.1, ok=False, language="en", status=429)
+
+    stats = usage.stats()
+    assert stats["language"]["hi"]["calls"] == 2
+    assert stats["language"]["hi"]["cost_usd"] == 0.05 + 1.50
+    assert stats["language"]["en"]["errors"] == 1
+    assert stats["provider"]["openai"]["completion_tokens"] == 1_000_000
+
+
+def test_writes_one_json_line_per_call(tmp_path):
+    log_file = tmp_path / "usage.log"
+    usage = UsageTracker(log_file=str(log_file))
+
+    with trace("webhook") as active:
+        usage.record("groq", "llama3-8b-8192", 0.25, language="ta", prompt_tokens=120, completion_tokens=40,
+                     estimated=True, attempt=2, status=200)
+    usage.close()
+
+    entry = json.loads(log_file.read_text(encoding="utf-8").strip())
+    assert entry["route"] == "webhook"
+    assert entry["request_id"] == active.request_id
+    assert entry["lang"] == "ta"
+    assert entry["attempt"] == 2
+    assert entry["estimated"] is True
+    assert entry["latency_ms"] == 250.0
+
+
+def test_attempt_is_per_call_and_openai_streams_ask_for_usage(http_agent, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    payloads = {}
+
+    def handler(provider, payload):
+        payloads[provider] = payload
+        if provider == 'groq':
+            return httpx.Response(500, text="down")
+        if payload.get('stream'):
+            return httpx.Response(200, text='data: {"choices": [{"delta": {"content": "Namaste!"}}]}\n\ndata: [DONE]\n\n')
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    agent = http_agent(handler)
+    monkeypatch.setattr(Config, 'LLM_HEDGING_ENABLED', False)
+    recorded = []
+    monkeypatch.setattr(agent.usage, 'record', lambda **call: recorded.append((call['provider'], call['purpose'], call['attempt'])))
+    context = {"detected_language": "en", "current_location": "Delhi"}
+
+    async def run():
+        await agent._get_provider_response("Red Fort", [], context)
+        await agent.summarize("", [{"role": "user", "content": "hi"}], 50)
+        return [segment async for segment in agent.stream_response("Qutub Minar", [], context)]
+
+    assert asyncio.run(run()) == ["Namaste!"]
+    assert recorded == [
+        ("groq", "reply", 1), ("openai", "reply", 2),
+        ("groq", "summary", 1), ("openai", "summary", 1),
+        ("groq", "stream", 1), ("openai", "stream", 2)
+    ]
+    assert payloads['openai']['stream_options'] == {"include_usage": True}
+    assert 'stream_options' not in payloads['groq']
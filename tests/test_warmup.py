@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import threading
+
+from services.warmup import WarmupManager
+
+
+def test_ready_only_after_all_steps_finish():
+    """Readiness flips once every step has run, even if one failed."""
+    release = threading.Event()
+    warmup = WarmupManager()
+    warmup.add_step("slow", lambda: release.wait(5))
+    warmup.add_step("broken", lambda: 1 / 0)
+    warmup.start()
+
+    assert not warmup.ready
+    assert warmup.stats()["steps"]["broken"]["state"] == "pending"
+
+    release.set()
+    assert warmup.wait(5)
+
+    steps = warmup.stats()["steps"]
+    assert warmup.ready
+    assert steps["slow"]["state"] == "ready"
+    assert steps["broken"]["state"] == "failed"
+    assert "division by zero" in steps["broken"]["error"]
+
+
+def test_no_steps_is_ready():
+    assert WarmupManager().ready
+
+
+def test_failed_required_step_keeps_node_unready():
+    warmup = WarmupManager()
+    warmup.add_step("nlp", lambda: None)
+    warmup.add_step("voice", lambda: 1 / 0, required=True)
+    warmup.start()
+
+    assert warmup.wait(5) and warmup.finished
+    assert not warmup.ready
+    assert not warmup.succeeded("voice") and warmup.succeeded("nlp")
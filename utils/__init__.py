@@ -1,3 +1,4 @@
 from .location_extractor import LocationExtractor
+from .language_registry import LanguageRegistry, LanguageRecord, get_language_registry
 
-__all__ = ['LocationExtractor']
+__all__ = ['LocationExtractor', 'LanguageRegistry', 'LanguageRecord', 'get_language_registry']
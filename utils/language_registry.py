@@ -0,0 +1,138 @@
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+LANGUAGES_FILE = os.path.join('data', 'languages.json')
+
+FALLBACK_LANGUAGE_DATA = {
+    'supported_languages': {
+        'en': {'name': 'English', 'tts_supported': True, 'stt_supported': True},
+        'hi': {'name': 'Hindi', 'tts_supported': True, 'stt_supported': True},
+        'bn': {'name': 'Bengali', 'tts_supported': True, 'stt_supported': True}
+    }
+}
+
+# gTTS voices sound more natural from the regional Google domain
+TTS_TLDS = {'en': 'com', 'ur': 'com.pk'}
+DEFAULT_INDIAN_TLD = 'co.in'
+
+# Google Speech locales that don't follow the "<code>-IN" pattern
+GOOGLE_STT_OVERRIDES = {'pa': 'pa-Guru-IN'}
+
+
+def _frozen(mapping: Optional[Mapping]) -> Mapping:
+    return MappingProxyType(dict(mapping or {}))
+
+
+@dataclass(frozen=True)
+class LanguageRecord:
+    """Everything the pipeline needs about one language, computed once at load."""
+    code: str
+    name: str
+    native_name: str
+    script: str
+    region: str
+    tts_supported: bool
+    stt_supported: bool
+    voice_available: bool
+    gtts_code: Optional[str]
+    whisper_code: str
+    google_stt_code: str
+    tts_tld: str
+    voice_settings: Mapping[str, str] = field(default_factory=dict)
+    cultural_usage: Mapping[str, str] = field(default_factory=dict)
+    sample_phrases: Mapping[str, str] = field(default_factory=dict)
+    greetings: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, code: str, info: Dict[str, Any], cultural_greetings: Dict[str, Dict[str, str]]) -> "LanguageRecord":
+        tts_supported = info.get('tts_supported', False)
+        stt_supported = info.get('stt_supported', False)
+
+        return cls(
+            code=code,
+            name=info.get('name', 'Unknown'),
+            native_name=info.get('native_name', 'Unknown'),
+            script=info.get('script', 'Unknown'),
+            region=info.get('region', 'International'),
+            tts_supported=tts_supported,
+            stt_supported=stt_supported,
+            voice_available=tts_supported and stt_supported,
+            gtts_code=info.get('gtts_code', code) if tts_supported else None,
+            whisper_code=info.get('whisper_code', 'english') if stt_supported else 'english',
+            google_stt_code=GOOGLE_STT_OVERRIDES.get(code, f"{code}-IN") if stt_supported else 'en-IN',
+            tts_tld=TTS_TLDS.get(code, DEFAULT_INDIAN_TLD),
+            voice_settings=_frozen(info.get('voice_settings') or {'speed': 'normal', 'pitch': 'medium', 'accent': 'indian'}),
+            cultural_usage=_frozen(info.get('cultural_context')),
+            sample_phrases=_frozen({k: v for k, v in info.get('sample_phrases', {}).items() if isinstance(v, str)}),
+            greetings=_frozen({style: greetings[code] for style, greetings in cultural_greetings.items() if code in greetings})
+        )
+
+
+class LanguageRegistry:
+    """Immutable view of data/languages.json shared by every service."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        cultural_greetings = data.get('cultural_greetings', {})
+
+        self._records: Dict[str, LanguageRecord] = {
+            code: LanguageRecord.from_config(code, info, cultural_greetings)
+            for code, info in data.get('supported_languages', {}).items()
+        }
+        self._languages: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+            code: _frozen(info) for code, info in data.get('supported_languages', {}).items()
+        })
+        self.codes: Tuple[str, ...] = tuple(self._records)
+        self.tts_codes: Tuple[str, ...] = tuple(code for code, r in self._records.items() if r.tts_supported)
+        self.voice_codes: Tuple[str, ...] = tuple(code for code, r in self._records.items() if r.voice_available)
+        self._default_greetings = {style: greetings.get('en', 'Welcome!') for style, greetings in cultural_greetings.items()}
+
+    @classmethod
+    def load(cls, path: str = LANGUAGES_FILE) -> "LanguageRegistry":
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error("❌ Failed to load languages.json: %s", e)
+            data = FALLBACK_LANGUAGE_DATA
+
+        registry = cls(data)
+        logger.info("✅ Language registry loaded with %d languages", len(registry.codes))
+        return registry
+
+    def get(self, code: str) -> Optional[LanguageRecord]:
+        return self._records.get(code)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._records
+
+    def __iter__(self) -> Iterator[LanguageRecord]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def languages(self) -> Mapping[str, Mapping[str, Any]]:
+        """Raw per-language config, as in languages.json (read-only)."""
+        return self._languages
+
+    def greeting(self, code: str, style: str = 'formal') -> str:
+        record = self._records.get(code)
+        if record and style in record.greetings:
+            return record.greetings[style]
+        return self._default_greetings.get(style, 'Welcome!')
+
+
+@lru_cache(maxsize=None)
+def get_language_registry() -> LanguageRegistry:
+    """Process-wide registry; languages.json is read once."""
+    return LanguageRegistry.load()
@@ -1,6 +1,10 @@
 import re
 from typing import Optional, List
 
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
 class LocationExtractor:
     def __init__(self):
         # Comprehensive Indian locations with multilingual support
@@ -309,12 +313,10 @@ class LocationExtractor:
     def extract_location(self, text: str) -> Optional[str]:
         """Extract location from user message with comprehensive coverage."""
         
-        print(f"🔍 Extracting location from: '{text}'")
-        
         # Method 1: Direct city/state matching (most reliable)
         direct_match = self._match_known_cities(text)
         if direct_match:
-            print(f"✅ Direct match found: {direct_match}")
+            logger.debug("✅ Direct match found: %s", direct_match)
             return direct_match
         
         # Method 2: Pattern-based extraction
@@ -322,16 +324,16 @@ class LocationExtractor:
         for match in pattern_matches:
             validated = self._match_known_cities(match)
             if validated:
-                print(f"✅ Pattern match found: {validated}")
+                logger.debug("✅ Pattern match found: %s", validated)
                 return validated
         
         # Method 3: Fuzzy matching for misspellings
         fuzzy_match = self._fuzzy_match(text)
         if fuzzy_match:
-            print(f"✅ Fuzzy match found: {fuzzy_match}")
+            logger.debug("✅ Fuzzy match found: %s", fuzzy_match)
             return fuzzy_match
         
-        print(f"❌ No location found in text")
+        logger.debug("❌ No location found in text")
         return None
     
     def _match_known_cities(self, text: str) -> Optional[str]:
@@ -0,0 +1,102 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+from typing import Optional
+
+from config import Config
+from .tracing import current_trace
+
+ROOT_LOGGER_NAME = "citychai"
+
+_setup_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Tag records with the active request ID and sample DEBUG output per request."""
+
+    def __init__(self, debug_sample_rate: float = 1.0):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        active = current_trace()
+        record.request_id = active.request_id if active else "-"
+
+        if record.levelno > logging.DEBUG or self.debug_sample_rate >= 1.0:
+            return True
+
+        # Keep or drop a request's debug lines together so sampled requests stay readable
+        if active is not None:
+            if active.debug_sampled is None:
+                active.debug_sampled = random.random() < self.debug_sample_rate
+            return active.debug_sampled
+
+        return random.random() < self.debug_sample_rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(level: Optional[str] = None, log_file: Optional[str] = None,
+                  log_format: Optional[str] = None, debug_sample_rate: Optional[float] = None):
+    """Route all ``citychai.*`` loggers through a queue so callers never block on I/O."""
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        level = (level or Config.LOG_LEVEL).upper()
+        log_file = log_file if log_file is not None else Config.LOG_FILE
+        log_format = log_format or Config.LOG_FORMAT
+        if debug_sample_rate is None:
+            debug_sample_rate = Config.LOG_DEBUG_SAMPLE_RATE
+
+        if log_format == 'json':
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+        handlers = [logging.StreamHandler()]
+        if log_file:
+            handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # Request ID and sampling are resolved on the caller's side, where the trace is visible
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RequestContextFilter(debug_sample_rate))
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(getattr(logging, level, logging.INFO))
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a module logger under the shared, queue-backed ``citychai`` hierarchy."""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
@@ -0,0 +1,155 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds - covers regex work (ms) up to slow LLM calls (30s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(label_key: Tuple[Tuple[str, str], ...], extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(label_key) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {_format_labels(key) or "total": value for key, value in self._values.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) with optional labels."""
+
+    def __init__(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "count": 0, "sum": 0.0}
+                self._series[key] = series
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["count"] += 1
+            series["sum"] += value
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-series count, mean and bucket-estimated p50/p95 (same unit as observations)."""
+        result = {}
+        with self._lock:
+            for key, series in self._series.items():
+                count = series["count"]
+                result[_format_labels(key) or "total"] = {
+                    "count": count,
+                    "mean": round(series["sum"] / count, 4) if count else 0.0,
+                    "p50": self._estimate_quantile(series, 0.50),
+                    "p95": self._estimate_quantile(series, 0.95)
+                }
+        return result
+
+    def _estimate_quantile(self, series: Dict, quantile: float) -> float:
+        target = series["count"] * quantile
+        for bound, cumulative in zip(self.buckets, series["counts"]):
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, cumulative in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, {'le': str(bound)})} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': '+Inf'})} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {round(series['sum'], 6)}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide registry of counters, histograms and callback gauges."""
+
+    def __init__(self, prefix: str = "citychai"):
+        self.prefix = prefix
+        self._metrics: Dict[str, object] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(name, lambda full_name: Counter(full_name, description))
+
+    def histogram(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, lambda full_name: Histogram(full_name, description, buckets))
+
+    def gauge(self, name: str, description: str, callback: Callable[[], float]):
+        """Register a gauge whose value is read from ``callback`` at export time."""
+        with self._lock:
+            self._gauges[f"{self.prefix}_{name}"] = (description, callback)
+
+    def _get_or_create(self, name: str, factory):
+        full_name = f"{self.prefix}_{name}"
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = factory(full_name)
+                self._metrics[full_name] = metric
+            return metric
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """JSON-friendly view of every metric."""
+        result = {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+        for name, (_, callback) in list(self._gauges.items()):
+            try:
+                result[name] = callback()
+            except Exception:
+                result[name] = None
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for name, (description, callback) in list(self._gauges.items()):
+            try:
+                value = callback()
+            except Exception:
+                continue
+            lines.extend([f"# HELP {name} {description}", f"# TYPE {name} gauge", f"{name} {value}"])
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,41 @@
+import re
+from typing import List
+
+# Sentence ends: Latin . ! ? and ellipsis, Devanagari danda/double danda (। ॥),
+# Urdu full stop and question mark (۔ ؟). Only a boundary once whitespace
+# follows, so "1648." mid-stream or "3.5" never split early.
+SENTENCE_BOUNDARY = re.compile(r'[.!?…।॥۔؟]+["\'”’)\]]*\s+|\n+')
+
+
+class SentenceChunker:
+    """Accumulates streamed tokens and releases text at sentence boundaries.
+
+    Segments shorter than ``min_chars`` are held back and merged with the next
+    sentence so a reply doesn't arrive as a string of one-word messages.
+    """
+
+    def __init__(self, min_chars: int = 40):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return any segments that are now complete."""
+        self.buffer += text
+        segments = []
+        start = 0
+
+        for match in SENTENCE_BOUNDARY.finditer(self.buffer):
+            if match.end() - start < self.min_chars:
+                continue
+            segment = self.buffer[start:match.end()].strip()
+            if segment:
+                segments.append(segment)
+            start = match.end()
+
+        self.buffer = self.buffer[start:]
+        return segments
+
+    def flush(self) -> str:
+        """Return whatever is left once the stream ends."""
+        remainder, self.buffer = self.buffer.strip(), ""
+        return remainder
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .metrics import metrics
+
+COALESCED = metrics.counter(
+    "singleflight_coalesced_total", "Calls that joined an identical call already in flight instead of running"
+)
+
+
+class SingleFlight:
+    """Coalesce concurrent async calls that share a key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and get the same result (or
+    exception). A caller that gets cancelled stops waiting without
+    cancelling the shared work, so the others still get their answer.
+
+    Tasks belong to an event loop, so in-flight calls are tracked per loop.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._calls.setdefault(loop, {})
+            task = calls.get(key)
+            if task is None:
+                task = loop.create_task(func())
+                calls[key] = task
+                task.add_done_callback(lambda _, calls=calls: calls.pop(key, None))
+            else:
+                COALESCED.inc(name=self.name)
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return sum(len(calls) for calls in self._calls.values())
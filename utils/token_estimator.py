@@ -0,0 +1,71 @@
+import math
+from functools import lru_cache
+from typing import Dict, List
+
+# Llama 3 / GPT-3.5 tokenizers fit about 4 characters of English into a token,
+# but Indic scripts break into far smaller pieces - often a token per one or two
+# characters. Erring high keeps prompts inside their budget.
+ASCII_CHARS_PER_TOKEN = 4.0
+OTHER_CHARS_PER_TOKEN = 1.5
+
+# Characters per token by Unicode block, for scripts that differ from the default
+SCRIPT_CHARS_PER_TOKEN = (
+    (0x0600, 0x06FF, 2.0),    # Arabic (Urdu)
+    (0x0900, 0x097F, 1.5),    # Devanagari (Hindi, Marathi)
+    (0x0980, 0x0AFF, 1.3),    # Bengali, Assamese, Gurmukhi, Gujarati
+    (0x0B00, 0x0DFF, 1.0),    # Odia, Tamil, Telugu, Kannada, Malayalam
+    (0x1F000, 0x1FAFF, 0.5),  # Emoji - two or three byte-level tokens each
+)
+
+# Role and separator tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+# str.translate marks each script's characters with one private-use character,
+# so counting them runs in C rather than a Python loop per character
+_SCRIPT_MARKS = [chr(0xE000 + i) for i in range(len(SCRIPT_CHARS_PER_TOKEN))]
+_SCRIPT_TABLE = {
+    code: mark
+    for (start, end, _), mark in zip(SCRIPT_CHARS_PER_TOKEN, _SCRIPT_MARKS)
+    for code in range(start, end + 1)
+}
+
+
+@lru_cache(maxsize=4096)
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text`` without loading a tokenizer, by script."""
+    if not text:
+        return 0
+    if text.isascii():
+        return math.ceil(len(text) / ASCII_CHARS_PER_TOKEN)
+
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    other_chars = len(text) - ascii_chars
+    tokens = ascii_chars / ASCII_CHARS_PER_TOKEN
+    marked = text.translate(_SCRIPT_TABLE)
+    for (_, _, chars_per_token), mark in zip(SCRIPT_CHARS_PER_TOKEN, _SCRIPT_MARKS):
+        count = marked.count(mark)
+        tokens += count / chars_per_token
+        other_chars -= count
+    return math.ceil(tokens + other_chars / OTHER_CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: List[Dict]) -> int:
+    """Approximate prompt tokens of a chat message list."""
+    return sum(estimate_tokens(msg.get('content') or '') + MESSAGE_OVERHEAD_TOKENS for msg in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` at a word boundary so it fits in roughly ``max_tokens``."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    for word in text.split():
+        cost = estimate_tokens(word + ' ')
+        if used + cost > max_tokens:
+            break
+        kept.append(word)
+        used += cost
+    return (' '.join(kept) + ' …').strip()
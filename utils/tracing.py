@@ -0,0 +1,105 @@
+import asyncio
+import functools
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from .metrics import metrics
+
+STAGE_LATENCY = metrics.histogram(
+    "stage_duration_seconds", "Time spent in each stage of the message pipeline"
+)
+REQUEST_LATENCY = metrics.histogram(
+    "request_duration_seconds", "End-to-end time to produce a reply"
+)
+
+T = TypeVar("T")
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """Per-request collection of stage timings."""
+
+    def __init__(self, name: str, request_id: Optional[str] = None):
+        self.name = name
+        self.request_id = request_id or uuid.uuid4().hex[:16]
+        self.started_at = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.debug_sampled: Optional[bool] = None  # decided lazily by the log filter
+
+    def add_span(self, stage: str, duration: float, ok: bool = True):
+        self.spans.append({
+            "stage": stage,
+            "start_ms": round((time.perf_counter() - duration - self.started_at) * 1000, 1),
+            "duration_ms": round(duration * 1000, 1),
+            "ok": ok
+        })
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def timings(self) -> Dict[str, Any]:
+        """Serializable summary attached to response data."""
+        stages: Dict[str, float] = {}
+        for span_data in self.spans:
+            stages[span_data["stage"]] = round(stages.get(span_data["stage"], 0.0) + span_data["duration_ms"], 1)
+
+        return {
+            "request_id": self.request_id,
+            "total_ms": round(self.elapsed() * 1000, 1),
+            "stages": stages,
+            "spans": list(self.spans)
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace(name: str, request_id: Optional[str] = None):
+    """Open a request trace, or join the one already active in this context."""
+    active = _current_trace.get()
+    if active is not None:
+        yield active
+        return
+
+    new_trace = Trace(name, request_id)
+    token = _current_trace.set(new_trace)
+    try:
+        yield new_trace
+    finally:
+        _current_trace.reset(token)
+        REQUEST_LATENCY.observe(new_trace.elapsed(), route=name)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a pipeline stage; recorded on the active trace and in the stage histogram."""
+    started_at = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        duration = time.perf_counter() - started_at
+        STAGE_LATENCY.observe(duration, stage=stage)
+        active = _current_trace.get()
+        if active is not None:
+            active.add_span(stage, duration, ok)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run blocking ``func`` in the loop's default executor, still inside the active trace.
+
+    For Redis round-trips and CPU-bound NLP on the request path: the event
+    loop keeps serving other requests, and spans and log lines from the
+    worker thread still land on this request.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(copy_context().run, func, *args))